@@ -0,0 +1,91 @@
+from typing import Iterable, Optional
+
+# Zeichenvorrat der Material-IDs (ohne "O", Verwechslung mit "0")
+ITEM_ID_DIGITS = "0123456789ABCDEFGHIJKLMNPQRSTUVWXYZ"
+MEMBER_ID_DIGITS = "0123456789"
+
+
+class IdAllocator:
+    """
+    Vergibt freie IDs aus einem festen Zeichenvorrat, z.B. "001".."ZZZ" (Material)
+    oder "NR01".."NR99" (Einsatzkräfte).
+
+    Die belegten IDs werden einmalig in eine Bitmap (bytearray, ein Byte pro ID)
+    übernommen. Längere IDs zählen wie bisher über ihre ersten Zeichen
+    ("0A1-2" belegt "0A1"). Vergeben wird aufsteigend ab `start`, die Suche nach
+    der nächsten Lücke läuft über `bytearray.find` und setzt beim letzten Treffer fort.
+    """
+
+    def __init__(self, used_ids: Iterable[str], *, digits: str, width: int, prefix: str = "", start: int = 1):
+        self.digits = digits
+        self.width = width
+        self.prefix = prefix
+        self._digit_value = {d: i for i, d in enumerate(digits)}
+        self._capacity = len(digits) ** width
+        self._used = bytearray(self._capacity)
+        self._cursor = start
+        for id_val in used_ids:
+            self.mark_used(id_val)
+
+    @classmethod
+    def for_items(cls, used_ids: Iterable[str]) -> "IdAllocator":
+        return cls(used_ids, digits=ITEM_ID_DIGITS, width=3)
+
+    @classmethod
+    def for_members(cls, used_ids: Iterable[str]) -> "IdAllocator":
+        return cls(used_ids, digits=MEMBER_ID_DIGITS, width=2, prefix="NR")
+
+    def index_of(self, id_val: str) -> Optional[int]:
+        """Position einer ID in der Bitmap oder None, wenn sie nicht in den Zeichenvorrat passt."""
+        if id_val is None:
+            return None
+        s = str(id_val)[: len(self.prefix) + self.width]
+        if len(s) != len(self.prefix) + self.width or not s.startswith(self.prefix):
+            return None
+        idx = 0
+        for ch in s[len(self.prefix):]:
+            value = self._digit_value.get(ch)
+            if value is None:
+                return None
+            idx = idx * len(self.digits) + value
+        return idx
+
+    def encode(self, idx: int) -> str:
+        chars = []
+        for _ in range(self.width):
+            idx, rem = divmod(idx, len(self.digits))
+            chars.append(self.digits[rem])
+        return self.prefix + "".join(reversed(chars))
+
+    def mark_used(self, id_val: str):
+        idx = self.index_of(id_val)
+        if idx is not None:
+            self._used[idx] = 1
+
+    def is_used(self, id_val: str) -> bool:
+        idx = self.index_of(id_val)
+        return idx is not None and bool(self._used[idx])
+
+    def free_count(self) -> int:
+        return self._capacity - self._cursor - self._used.count(1, self._cursor)
+
+    def allocate(self, count: int = 1) -> list[str]:
+        """Reserviert `count` freie IDs in aufsteigender Reihenfolge (alles oder nichts)."""
+        if count > self.free_count():
+            raise ValueError("Nicht genügend freie IDs verfügbar")
+        result: list[str] = []
+        pos = self._cursor
+        for _ in range(count):
+            pos = self._used.find(0, pos)
+            self._used[pos] = 1
+            result.append(self.encode(pos))
+            pos += 1
+        self._cursor = pos
+        return result
+
+    def next_id(self) -> Optional[str]:
+        """Nächste freie ID oder None, wenn der Zeichenvorrat erschöpft ist."""
+        try:
+            return self.allocate(1)[0]
+        except ValueError:
+            return None
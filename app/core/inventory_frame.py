@@ -0,0 +1,348 @@
+from datetime import date
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from settings.constants import INVENTORY_COLUMNS
+from app.core.utils import parse_date
+
+# numpy erst beim ersten Laden importieren (nicht beim Programmstart, siehe --profile-startup)
+if TYPE_CHECKING:
+    import numpy as np
+
+# Spalten mit wenigen verschiedenen Werten -> Dictionary-Encoding (Codes + Kategorien)
+CATEGORICAL_COLUMNS = ("product_type", "producer", "location")
+
+# Tag-Codes von `row_tag_codes`
+TAG_EXPIRY = -2
+TAG_DEPOT = -1
+
+
+# Datumswerte wiederholen sich stark (gleiche Prüftermine) -> Parse-Ergebnis cachen
+@lru_cache(maxsize=8192)
+def _ordinal(value) -> int:
+    d = parse_date(str(value)) if value not in (None, "") else None
+    return d.toordinal() if d else -1
+
+
+@lru_cache(maxsize=8192)
+def _month_index(value) -> int:
+    d = parse_date(str(value)) if value not in (None, "") else None
+    return d.year * 12 + d.month - 1 if d else -1
+
+
+_FRAME_COLUMNS = [c for c, _ in INVENTORY_COLUMNS]
+
+
+def encode_inventory_row(row) -> dict:
+    """Eine inventory-Zeile in die Form, die `InventoryFrame` übernimmt."""
+    return {
+        "raw": [row[c] for c in _FRAME_COLUMNS],
+        "check_ordinal": _ordinal(row["check_date"]),
+        "check_month": _month_index(row["check_date"]),
+        "mfg_ordinal": _ordinal(row["manufactury_date"]),
+        # vom Database-Layer gepflegt (manufactury_date + life_time)
+        "expiry_ordinal": _ordinal(row["expiry_date"]),
+        "psa_check": str(row["psa_check"]) == "1",
+    }
+
+
+def load_inventory_rows(conn, where: str = "", params=()) -> list[dict]:
+    """
+    Zeilen lesen und kodieren. Nutzt nur `conn` und kein InventoryFrame,
+    darf daher im Worker-Thread laufen.
+    """
+    cur = conn.cursor()
+    cur.execute(f"SELECT {', '.join(_FRAME_COLUMNS)}, expiry_date FROM inventory {where}", params)
+    return [encode_inventory_row(row) for row in cur.fetchall()]
+
+
+class InventoryFrame:
+    """
+    Spaltenorientierter In-Memory-Cache der Tabelle `inventory`.
+
+    - `raw[col]`: Originalwerte je Spalte (Python-Listen, für die Anzeige)
+    - Datumsspalten als Ordinal-/Monatsindex-Arrays (-1 = leer/ungültig)
+    - product_type/producer/location als Codes + Kategorienliste
+    - psa_check als Bool-Array
+
+    Filter und Farbregeln werden als Masken über diese Arrays gerechnet.
+    `Database` meldet geänderte IDs über `invalidate`, beim nächsten Zugriff
+    werden nur diese Zeilen nachgeladen.
+
+    Das komplette Laden kann im DbWorker laufen: `begin_background_load`,
+    `load_inventory_rows` im Worker-Thread, `finish_background_load` im Tk-Thread.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.columns = list(_FRAME_COLUMNS)
+        self._load_token = 0
+        self.reset()
+
+    # ---------- Invalidierung ----------
+    def reset(self):
+        """Alles verwerfen, beim nächsten Zugriff komplett neu laden."""
+        self._needs_full_load = True
+        self._dirty_ids: set[str] = set()
+        # laufendes Hintergrund-Laden ungültig machen
+        self._load_token += 1
+        self._dirty_during_load: set[str] | None = None
+        self.ids: list[str] = []
+        self._pos_by_id: dict[str, int] = {}
+        self.raw: dict[str, list] = {c: [] for c in self.columns}
+        self.categories: dict[str, list] = {c: [] for c in CATEGORICAL_COLUMNS}
+        self._category_code: dict[str, dict] = {c: {} for c in CATEGORICAL_COLUMNS}
+        # Arrays legt erst `_install` an (jeder Zugriff geht über sync())
+        self.codes: dict[str, "np.ndarray"] = {}
+        self.check_ordinal: "np.ndarray | None" = None
+        self.check_month: "np.ndarray | None" = None
+        self.mfg_ordinal: "np.ndarray | None" = None
+        self.expiry_ordinal: "np.ndarray | None" = None
+        self.psa_check: "np.ndarray | None" = None
+        self._lower_cache: dict[str, list[str]] = {}
+        self._display_cache: dict[str, list] = {}
+
+    def clear_display_cache(self):
+        """Gecachte Anzeigewerte verwerfen (z.B. nach Namensänderung einer Einsatzkraft)."""
+        self._lower_cache.clear()
+        self._display_cache.clear()
+
+    def invalidate(self, ids: Iterable[str]):
+        """Einzelne Zeilen als geändert markieren (insert/update/delete)."""
+        if not self._needs_full_load:
+            self._dirty_ids.update(str(i) for i in ids if i is not None)
+        elif self._dirty_during_load is not None:
+            # evtl. nicht mehr im Hintergrund-Snapshot enthalten -> danach nachladen
+            self._dirty_during_load.update(str(i) for i in ids if i is not None)
+
+    # ---------- Laden ----------
+    def _code_for(self, col: str, value) -> int:
+        lookup = self._category_code[col]
+        code = lookup.get(value)
+        if code is None:
+            code = len(self.categories[col])
+            lookup[value] = code
+            self.categories[col].append(value)
+        return code
+
+    @property
+    def needs_full_load(self) -> bool:
+        return self._needs_full_load
+
+    def begin_background_load(self) -> int:
+        """Ab jetzt geänderte IDs merken; Rückgabe = Token für `finish_background_load`."""
+        self._dirty_during_load = set()
+        return self._load_token
+
+    def finish_background_load(self, token: int, encoded: list[dict]) -> bool:
+        """Ergebnis von `load_inventory_rows` übernehmen. False = inzwischen verworfen (reset), neu laden."""
+        if token != self._load_token or not self._needs_full_load:
+            return False
+        dirty = self._dirty_during_load or set()
+        self._install(encoded)
+        self._dirty_ids = dirty
+        return True
+
+    def _load_all(self):
+        assert self.db.conn is not None
+        self._install(load_inventory_rows(self.db.conn))
+
+    def _install(self, encoded: list[dict]):
+        import numpy as np
+        self.reset()
+        self._needs_full_load = False
+
+        self.ids = [e["raw"][0] for e in encoded]
+        self._pos_by_id = {str(id_val): pos for pos, id_val in enumerate(self.ids)}
+        for j, col in enumerate(self.columns):
+            self.raw[col] = [e["raw"][j] for e in encoded]
+        for col in CATEGORICAL_COLUMNS:
+            self.codes[col] = np.fromiter((self._code_for(col, v) for v in self.raw[col]), dtype=np.int32, count=len(encoded))
+        for name in ("check_ordinal", "check_month", "mfg_ordinal", "expiry_ordinal"):
+            setattr(self, name, np.fromiter((e[name] for e in encoded), dtype=np.int32, count=len(encoded)))
+        self.psa_check = np.fromiter((e["psa_check"] for e in encoded), dtype=bool, count=len(encoded))
+
+    def _apply_dirty(self):
+        import numpy as np
+        dirty = list(self._dirty_ids)
+        self._dirty_ids.clear()
+        assert self.db.conn is not None
+        fetched = {}
+        for start in range(0, len(dirty), 500):
+            chunk = dirty[start:start + 500]
+            for encoded in load_inventory_rows(self.db.conn, f"WHERE ID IN ({','.join('?' * len(chunk))})", chunk):
+                fetched[str(encoded["raw"][0])] = encoded
+
+        # gelöschte Zeilen entfernen
+        removed = [self._pos_by_id[i] for i in dirty if i not in fetched and i in self._pos_by_id]
+        if removed:
+            keep = np.ones(len(self.ids), dtype=bool)
+            keep[removed] = False
+            keep_pos = np.flatnonzero(keep)
+            self.ids = [self.ids[p] for p in keep_pos]
+            for col in self.columns:
+                self.raw[col] = [self.raw[col][p] for p in keep_pos]
+            for col in CATEGORICAL_COLUMNS:
+                self.codes[col] = self.codes[col][keep]
+            for name in ("check_ordinal", "check_month", "mfg_ordinal", "expiry_ordinal", "psa_check"):
+                setattr(self, name, getattr(self, name)[keep])
+            self._pos_by_id = {str(id_val): pos for pos, id_val in enumerate(self.ids)}
+
+        # geänderte Zeilen an Ort und Stelle, neue hinten anhängen
+        appended = []
+        for id_val, enc in fetched.items():
+            pos = self._pos_by_id.get(id_val)
+            if pos is None:
+                appended.append(enc)
+                continue
+            for j, col in enumerate(self.columns):
+                self.raw[col][pos] = enc["raw"][j]
+            for col in CATEGORICAL_COLUMNS:
+                self.codes[col][pos] = self._code_for(col, self.raw[col][pos])
+            for name in ("check_ordinal", "check_month", "mfg_ordinal", "expiry_ordinal", "psa_check"):
+                getattr(self, name)[pos] = enc[name]
+
+        if appended:
+            for enc in appended:
+                self._pos_by_id[str(enc["raw"][0])] = len(self.ids)
+                self.ids.append(enc["raw"][0])
+                for j, col in enumerate(self.columns):
+                    self.raw[col].append(enc["raw"][j])
+            for col in CATEGORICAL_COLUMNS:
+                new_codes = [self._code_for(col, enc["raw"][self.columns.index(col)]) for enc in appended]
+                self.codes[col] = np.concatenate([self.codes[col], np.asarray(new_codes, dtype=np.int32)])
+            for name in ("check_ordinal", "check_month", "mfg_ordinal", "expiry_ordinal", "psa_check"):
+                arr = getattr(self, name)
+                setattr(self, name, np.concatenate([arr, np.asarray([enc[name] for enc in appended], dtype=arr.dtype)]))
+        self._lower_cache.clear()
+        self._display_cache.clear()
+
+    def sync(self):
+        """Stellt sicher, dass der Cache dem DB-Stand entspricht."""
+        if self._needs_full_load:
+            self._load_all()
+        elif self._dirty_ids:
+            self._apply_dirty()
+
+    def __len__(self) -> int:
+        self.sync()
+        return len(self.ids)
+
+    def position_of(self, id_val: str) -> int | None:
+        self.sync()
+        return self._pos_by_id.get(str(id_val))
+
+    def row(self, pos: int) -> dict:
+        return {col: self.raw[col][pos] for col in self.columns}
+
+    # ---------- Filter ----------
+    def filter_mask(self, filters: dict, format_value: Callable[[str, object], object]) -> "np.ndarray":
+        """
+        Maske der Zeilen, deren Anzeigewert (format_value) jeden Filter-Text
+        case-insensitiv enthält – gleiche Semantik wie die `Database.query_*`-Filter.
+        """
+        import numpy as np
+        self.sync()
+        mask = np.ones(len(self.ids), dtype=bool)
+        for col, needle in filters.items():
+            if not needle:
+                continue
+            needle = needle.lower()
+            if col in CATEGORICAL_COLUMNS:
+                matching = [
+                    code for code, value in enumerate(self.categories[col])
+                    if needle in str(format_value(col, value)).lower()
+                ]
+                mask &= np.isin(self.codes[col], np.asarray(matching, dtype=np.int32))
+            elif col == "psa_check":
+                yes = needle in str(format_value(col, 1)).lower()
+                no = needle in str(format_value(col, 0)).lower()
+                if yes and not no:
+                    mask &= self.psa_check
+                elif no and not yes:
+                    mask &= ~self.psa_check
+                elif not yes and not no:
+                    mask[:] = False
+            else:
+                lowered = self._lowered(col, format_value)
+                mask &= np.fromiter((needle in v for v in lowered), dtype=bool, count=len(lowered))
+        return mask
+
+    def _lowered(self, col: str, format_value) -> list[str]:
+        cached = self._lower_cache.get(col)
+        if cached is None:
+            cached = [str(v).lower() for v in self.display_values(col, format_value)]
+            self._lower_cache[col] = cached
+        return cached
+
+    def display_values(self, col: str, format_value: Callable[[str, object], object]) -> list:
+        """
+        Anzeigewerte (format_value) einer Spalte für alle Zeilen, gecacht bis zur
+        nächsten Änderung. Kategoriespalten werden nur je Kategorie formatiert.
+        """
+        self.sync()
+        cached = self._display_cache.get(col)
+        if cached is None:
+            if col in CATEGORICAL_COLUMNS:
+                formatted = [format_value(col, value) for value in self.categories[col]]
+                cached = [formatted[code] for code in self.codes[col].tolist()]
+            else:
+                by_value: dict = {}
+                cached = []
+                for value in self.raw[col]:
+                    # gleiche Werte (Datum, Typ, leer) nur einmal formatieren
+                    try:
+                        shown = by_value[value]
+                    except KeyError:
+                        shown = by_value[value] = format_value(col, value)
+                    except TypeError:
+                        shown = format_value(col, value)
+                    cached.append(shown)
+            self._display_cache[col] = cached
+        return cached
+
+    # ---------- Farbregeln ----------
+    def row_tag_codes(
+        self,
+        color_rules: list[dict],
+        today: date | None = None,
+        positions: Iterable[int] | None = None,
+    ) -> "np.ndarray":
+        """
+        Tag je Zeile als Code: TAG_EXPIRY (Lebensdauer überschritten), TAG_DEPOT,
+        0..n-1 = Index der Farbregel (wie `rule_{idx}`), n = kein Tag.
+        positions: nur diese Zeilen berechnen (Reihenfolge wie übergeben).
+        """
+        import numpy as np
+        self.sync()
+        today = today or date.today()
+        rows = slice(None) if positions is None else np.asarray(list(positions), dtype=np.intp)
+        check_month = self.check_month[rows]
+        location_codes = self.codes["location"][rows]
+        expiry_ordinal = self.expiry_ordinal[rows]
+        sorted_rules = sorted(color_rules, key=lambda r: int(r.get("months", 0)))
+        thresholds = []
+        for rule in sorted_rules:
+            try:
+                thresholds.append(int(rule.get("months", 0)))
+            except Exception:
+                thresholds.append(0)
+
+        no_tag = len(thresholds)
+        months_to_check = 12 - (today.year * 12 + today.month - 1 - check_month)
+        if thresholds:
+            # erste Regel mit months_to_check <= Schwelle (Schwellen sind aufsteigend)
+            codes = np.searchsorted(np.asarray(thresholds), months_to_check, side="left").astype(np.int32)
+        else:
+            codes = np.full(len(check_month), no_tag, dtype=np.int32)
+        codes[check_month < 0] = no_tag
+
+        depot_codes = [
+            code for code, value in enumerate(self.categories["location"])
+            if "depot" in str(value or "").lower()
+        ]
+        codes[np.isin(location_codes, np.asarray(depot_codes, dtype=np.int32))] = TAG_DEPOT
+
+        violated = (expiry_ordinal >= 0) & (expiry_ordinal <= today.toordinal())
+        codes[violated] = TAG_EXPIRY
+        return codes
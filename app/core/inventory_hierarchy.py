@@ -0,0 +1,85 @@
+HIERARCHY_LEVELS = ("location", "product_type", "property_1", "property_2")
+
+
+class InventoryHierarchy:
+    """
+    Baum location -> product_type -> property_1 -> property_2 -> Anzahl aus einer
+    GROUP-BY-Abfrage. Dient den Kaskaden-Comboboxen (PSA-Check, Soll-Listen).
+
+    Neu geladen wird nur, wenn sich `db.table_version("inventory")` geändert hat.
+    Leere/NULL-Werte bleiben im Baum (zählen bei "alle" mit), erscheinen aber
+    nicht in `values`.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.reset()
+
+    def reset(self):
+        self._version: int | None = None
+        self._tree: dict = {}
+
+    def tree(self) -> dict:
+        version = self.db.table_version("inventory")
+        if self._version != version:
+            self._tree = self._load()
+            self._version = version
+        return self._tree
+
+    def _load(self) -> dict:
+        assert self.db.conn is not None
+        cur = self.db.conn.cursor()
+        cur.execute(
+            f"SELECT {', '.join(HIERARCHY_LEVELS)}, COUNT(*) FROM inventory "
+            f"GROUP BY {', '.join(HIERARCHY_LEVELS)}"
+        )
+        tree: dict = {}
+        for location, product_type, property_1, property_2, count in cur.fetchall():
+            leaf = tree.setdefault(location, {}).setdefault(product_type, {}).setdefault(property_1, {})
+            leaf[property_2] = count
+        return tree
+
+    def _walk(self, filters: list):
+        """(Pfad, Anzahl) aller Blätter unterhalb der Filter (None/"" = alle)."""
+        def walk(node, path, level):
+            if level == len(HIERARCHY_LEVELS):
+                yield path, node
+                return
+            wanted = filters[level] if level < len(filters) else None
+            if wanted:
+                child = node.get(wanted)
+                if child is not None:
+                    yield from walk(child, path + (wanted,), level + 1)
+                return
+            for key, child in node.items():
+                yield from walk(child, path + (key,), level + 1)
+
+        return walk(self.tree(), (), 0)
+
+    def values(
+        self,
+        column: str,
+        location: str | None = None,
+        product_type: str | None = None,
+        property_1: str | None = None,
+    ) -> list[str]:
+        """Sortierte, nicht-leere Werte von `column` unter den gesetzten Filtern."""
+        if column not in HIERARCHY_LEVELS:
+            raise ValueError("Ungültige Spalte")
+        level = HIERARCHY_LEVELS.index(column)
+        found = set()
+        for path, _count in self._walk([location, product_type, property_1]):
+            value = path[level]
+            if value is not None and str(value).strip(" ") != "":
+                found.add(value)
+        return sorted(found)
+
+    def count(
+        self,
+        location: str | None = None,
+        product_type: str | None = None,
+        property_1: str | None = None,
+        property_2: str | None = None,
+    ) -> int:
+        """Anzahl Inventar-Zeilen unter den gesetzten Filtern."""
+        return sum(count for _path, count in self._walk([location, product_type, property_1, property_2]))
@@ -0,0 +1,200 @@
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+
+# Abstand der Heartbeats im Tk-Thread
+HEARTBEAT_MS = 100
+# längere Pausen sind Standby/Ruhezustand des Laptops, kein Hänger
+SUSPEND_S = 300
+# Stack-Abtastung des Tk-Threads während eines Hängers
+STACK_SAMPLE_S = 0.05
+STACK_DEPTH = 12
+# zuletzt gelaufene Aktionen für die Zuordnung
+RECENT_ACTIONS = 50
+LOG_MAX_BYTES = 1_000_000
+LOG_BACKUPS = 3
+
+_active: "LagMonitor | None" = None
+
+
+@contextmanager
+def track(action: str):
+    """Markiert eine UI-Aktion, damit Hänger ihr zugeordnet werden. Ohne laufenden Monitor wirkungslos."""
+    monitor = _active
+    if monitor is None:
+        yield
+        return
+    entry = monitor._begin(action)
+    try:
+        yield
+    finally:
+        monitor._end(entry)
+
+
+def tracked(action: str | None = None):
+    """Methoden-Decorator für `track`; ohne Namen "Klasse.methode" (z.B. EditInventoryDialog.save)."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            with track(action or f"{type(self).__name__}.{fn.__name__}"):
+                return fn(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class LagMonitor:
+    """
+    Misst die Verzögerung der Tk-Ereignisschleife über einen `after()`-Heartbeat.
+
+    Kommt ein Heartbeat mehr als `threshold_ms` zu spät, wird ein Hänger
+    festgehalten: Dauer, die Aktion (`track`), die in dem Zeitraum lief, und
+    optional der häufigste Stack des Tk-Threads, den ein Hilfsthread während
+    des Hängers abtastet. Hänger gehen an `on_stall` (Statusleiste) und in
+    eine rotierende Logdatei.
+    """
+
+    def __init__(self, widget, threshold_ms: int = 250, sample_stacks: bool = False,
+                 log_path: str | None = None, on_stall=None):
+        self.widget = widget
+        self.threshold_ms = threshold_ms
+        self.sample_stacks = sample_stacks
+        self.log_path = log_path
+        self.on_stall = on_stall
+        self.stalls: deque[dict] = deque(maxlen=100)
+        self.stall_count = 0
+        self.worst_ms = 0.0
+        # [Name, Start, Ende | None]; _open = gerade laufende (verschachtelt)
+        self._actions: deque[list] = deque(maxlen=RECENT_ACTIONS)
+        self._open: list[list] = []
+        self._last_beat = 0.0
+        self._expected = 0.0
+        self._after_id = None
+        self._samples: list[tuple] = []
+        self._stop = threading.Event()
+        self._logger: logging.Logger | None = None
+
+    # ---------- an/aus ----------
+    def start(self):
+        global _active
+        _active = self
+        if self.log_path:
+            self._logger = self._make_logger(self.log_path)
+        self._last_beat = time.perf_counter()
+        self._schedule(self._last_beat)
+        if self.sample_stacks:
+            self._stop.clear()
+            threading.Thread(
+                target=self._sample_loop, args=(threading.get_ident(),), name="lag-sampler", daemon=True
+            ).start()
+
+    def stop(self):
+        global _active
+        if _active is self:
+            _active = None
+        self._stop.set()
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass  # Fenster schon zerstört
+            self._after_id = None
+
+    @staticmethod
+    def _make_logger(path: str) -> logging.Logger:
+        logger = logging.getLogger("ui_lag")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        target = os.path.abspath(path)
+        if not any(getattr(h, "baseFilename", None) == target for h in logger.handlers):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            handler = RotatingFileHandler(target, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            logger.addHandler(handler)
+        return logger
+
+    # ---------- Aktionen ----------
+    def _begin(self, action: str) -> list:
+        name = " > ".join([entry[0] for entry in self._open] + [action])
+        entry = [name, time.perf_counter(), None]
+        self._actions.append(entry)
+        self._open.append(entry)
+        return entry
+
+    def _end(self, entry: list):
+        entry[2] = time.perf_counter()
+        if entry in self._open:
+            self._open.remove(entry)
+
+    def _action_between(self, start: float, end: float) -> str:
+        """Aktion mit der größten Überschneidung mit [start, end] (bei Gleichstand die spätere)."""
+        best, best_overlap = None, 0.0
+        for name, a_start, a_end in self._actions:
+            overlap = min(end, a_end if a_end is not None else end) - max(start, a_start)
+            if overlap > 0 and overlap >= best_overlap:
+                best, best_overlap = name, overlap
+        return best or "unbekannt (Zeichnen/Callback ohne Markierung)"
+
+    # ---------- Heartbeat ----------
+    def _schedule(self, now: float):
+        self._expected = now + HEARTBEAT_MS / 1000
+        self._after_id = self.widget.after(HEARTBEAT_MS, self._beat)
+
+    def _beat(self):
+        now = time.perf_counter()
+        lag_s = now - self._expected
+        samples, self._samples = self._samples, []
+        if self.threshold_ms / 1000 <= lag_s < SUSPEND_S:
+            self._record(lag_s, self._last_beat, now, samples)
+        self._last_beat = now
+        self._schedule(now)
+
+    def _sample_loop(self, main_ident: int):
+        # läuft im Hilfsthread; tastet nur ab, solange der Heartbeat deutlich überfällig ist
+        while not self._stop.wait(STACK_SAMPLE_S):
+            if (time.perf_counter() - self._expected) * 1000 < self.threshold_ms / 2:
+                continue
+            frame = sys._current_frames().get(main_ident)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)[-STACK_DEPTH:]
+            self._samples.append(tuple(f"{os.path.basename(fs.filename)}:{fs.lineno} {fs.name}" for fs in stack))
+
+    def _record(self, lag_s: float, start: float, end: float, samples: list[tuple]):
+        stack, hits = Counter(samples).most_common(1)[0] if samples else ((), 0)
+        stall = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "lag_ms": round(lag_s * 1000),
+            "action": self._action_between(start, end),
+            "stack": list(stack),
+            "samples": len(samples),
+            "stack_hits": hits,
+        }
+        self.stalls.append(stall)
+        self.stall_count += 1
+        self.worst_ms = max(self.worst_ms, stall["lag_ms"])
+        if self._logger is not None:
+            lines = [f"Hänger {stall['lag_ms']} ms bei {stall['action']}"]
+            if stack:
+                lines.append(f"  Stack ({hits}/{len(samples)} Proben):")
+                lines.extend(f"    {frame}" for frame in stack)
+            self._logger.warning("\n".join(lines))
+        if self.on_stall is not None:
+            self.on_stall(stall)
+
+    def summary(self) -> str:
+        """Kurzfassung für die Statusleiste."""
+        if not self.stalls:
+            return ""
+        last = self.stalls[-1]
+        return (
+            f"UI-Hänger: {self.stall_count} (max {self.worst_ms / 1000:.1f} s) | "
+            f"zuletzt {last['lag_ms'] / 1000:.1f} s bei {last['action']}"
+        )
@@ -0,0 +1,55 @@
+class MemberNameLookup:
+    """
+    Gemeinsamer Cache "NR.."/"/NR.." -> "Vorname Nachname" für Tabs und Dialoge.
+
+    Wird beim ersten Zugriff aus `db.get_members_basic()` aufgebaut und von
+    `Database` nur bei insert/update/delete_member (und connect) verworfen.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.invalidate()
+
+    def invalidate(self):
+        self._members: list[dict] | None = None
+        self._name_by_id: dict[str, str] | None = None
+
+    def members(self) -> list[dict]:
+        """Mitglieder wie `get_members_basic` (ID, first_name, last_name), sortiert nach Name."""
+        if self._members is None:
+            self._members = self.db.get_members_basic()
+        return self._members
+
+    def name_by_id(self) -> dict[str, str]:
+        if self._name_by_id is None:
+            name_by_id: dict[str, str] = {}
+            for member in self.members():
+                first_name = (member.get("first_name") or "").strip()
+                last_name = (member.get("last_name") or "").strip()
+                full_name = f"{first_name} {last_name}".strip()
+                if not full_name:
+                    continue
+                member_id = str(member.get("ID") or "").strip()
+                if not member_id:
+                    continue
+                name_by_id[member_id] = full_name
+                if member_id.startswith("/"):
+                    name_by_id[member_id[1:]] = full_name
+                else:
+                    name_by_id[f"/{member_id}"] = full_name
+            self._name_by_id = name_by_id
+        return self._name_by_id
+
+    def name_for_location(self, location) -> str | None:
+        """Name zum Lagerort "/NR.." oder None (kein Mitglied, kein Name hinterlegt)."""
+        location_str = str(location).strip()
+        if not location_str.startswith("/NR"):
+            return None
+        name_by_id = self.name_by_id()
+        return name_by_id.get(location_str) or name_by_id.get(location_str[1:])
+
+    def format_location(self, location) -> str:
+        """"/NR01" -> "/NR01 (Vorname Nachname)", andere Lagerorte unverändert (getrimmt)."""
+        location_str = str(location).strip()
+        member_name = self.name_for_location(location_str)
+        return f"{location_str} ({member_name})" if member_name else location_str
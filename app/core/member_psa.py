@@ -0,0 +1,34 @@
+from app.core.soll_ist import group_soll_ist_lines, soll_ist_columns, soll_ist_rows
+from app.db.database import role_names
+
+MEMBER_PSA_COLUMNS = soll_ist_columns("Einsatzkraft")
+
+
+def compute_member_psa(db) -> list[dict]:
+    """
+    PSA-Bedarf aller Einsatzkräfte (siehe `Database.fetch_member_psa_lines`).
+
+    Rückgabe je Mitglied mit mindestens einer Position (sortiert nach Name):
+        {"ID", "name", "roles",
+         "lines": [{"product_type", "property_1", "property_2", "soll", "ist", "missing", "surplus"}],
+         "soll_total", "ist_total", "missing_total", "surplus_total"}
+    """
+    return group_soll_ist_lines(
+        db.fetch_member_psa_lines(),
+        lambda row: row["member_id"],
+        lambda row: {
+            "ID": row["member_id"],
+            "name": f"{(row['first_name'] or '').strip()} {(row['last_name'] or '').strip()}".strip(),
+            "roles": role_names(row["role_mask"]),
+        },
+    )
+
+
+def member_label(member: dict) -> str:
+    """"NR01 Vorname Nachname" für Baum und PDF."""
+    return f"{member['ID']} {member['name']}".strip()
+
+
+def member_psa_report_rows(members: list[dict], only_deviations: bool = False) -> list[dict]:
+    """Flache Zeilen mit den Keys aus MEMBER_PSA_COLUMNS (für export_table_to_pdf)."""
+    return soll_ist_rows(members, "Einsatzkraft", member_label, only_deviations)
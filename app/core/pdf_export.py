@@ -2,7 +2,6 @@
 # -*- coding: utf-8 -*-
 import os
 from typing import List, Dict, Iterable, Sequence, Tuple, Optional
-import xml.etree.ElementTree as ET
 from fpdf import FPDF
 from settings.constants import MEMBER_COLUMNS
 from settings.constants import INVENTORY_COLUMNS
@@ -72,6 +71,8 @@ def _prepare_logo_path(path: str) -> str:
     if not path.lower().endswith(".svg"):
         return path
 
+    import xml.etree.ElementTree as ET  # nur für SVG-Logos gebraucht
+
     try:
         tree = ET.parse(path)
         root = tree.getroot()
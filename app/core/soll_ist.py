@@ -0,0 +1,73 @@
+def soll_ist_columns(label: str) -> list[tuple[str, str]]:
+    """Spalten für Tabellen-/PDF-Ausgabe (Format wie INVENTORY_COLUMNS, nur die Namen zählen)."""
+    return [
+        (label, "TEXT"),
+        ("product_type", "TEXT"),
+        ("property_1", "TEXT"),
+        ("property_2", "TEXT"),
+        ("Soll", "INTEGER"),
+        ("Ist", "INTEGER"),
+        ("Fehlt", "INTEGER"),
+        ("Zuviel", "INTEGER"),
+    ]
+
+
+def group_soll_ist_lines(rows, group_key, new_group) -> list[dict]:
+    """
+    Fasst Soll/Ist-Zeilen (product_type, property_1, property_2, soll, ist) zu Gruppen zusammen.
+
+    group_key(row) bestimmt die Gruppe, new_group(row) liefert deren Kopfdaten beim
+    ersten Auftreten. Jede Gruppe bekommt dazu
+        "lines": [{"product_type", "property_1", "property_2", "soll", "ist", "missing", "surplus"}],
+        "soll_total", "ist_total", "missing_total", "surplus_total"
+    Reihenfolge wie in `rows`.
+    """
+    groups: dict = {}
+    for row in rows:
+        key = group_key(row)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {
+                **new_group(row),
+                "lines": [],
+                "soll_total": 0,
+                "ist_total": 0,
+                "missing_total": 0,
+                "surplus_total": 0,
+            }
+        soll, ist = int(row["soll"] or 0), int(row["ist"] or 0)
+        line = {
+            "product_type": row["product_type"],
+            "property_1": row["property_1"],
+            "property_2": row["property_2"],
+            "soll": soll,
+            "ist": ist,
+            "missing": max(soll - ist, 0),
+            "surplus": max(ist - soll, 0),
+        }
+        group["lines"].append(line)
+        group["soll_total"] += soll
+        group["ist_total"] += ist
+        group["missing_total"] += line["missing"]
+        group["surplus_total"] += line["surplus"]
+    return list(groups.values())
+
+
+def soll_ist_rows(groups: list[dict], label: str, group_label, only_deviations: bool = False) -> list[dict]:
+    """Flache Zeilen mit den Keys aus `soll_ist_columns(label)` (für export_table_to_pdf)."""
+    rows = []
+    for group in groups:
+        for line in group["lines"]:
+            if only_deviations and not (line["missing"] or line["surplus"]):
+                continue
+            rows.append({
+                label: group_label(group),
+                "product_type": line["product_type"],
+                "property_1": line["property_1"],
+                "property_2": line["property_2"],
+                "Soll": str(line["soll"]),
+                "Ist": str(line["ist"]),
+                "Fehlt": str(line["missing"]) if line["missing"] else "",
+                "Zuviel": str(line["surplus"]) if line["surplus"] else "",
+            })
+    return rows
@@ -0,0 +1,29 @@
+import time
+
+
+class StartupProfile:
+    """
+    Phasen-Zeiten beim Programmstart (python main.py --profile-startup).
+    `mark(name)` schließt die laufende Phase ab, `report()` liefert die Tabelle.
+    """
+
+    def __init__(self, start: float | None = None):
+        self.start = time.perf_counter() if start is None else start
+        self._last = self.start
+        self.phases: list[tuple[str, float]] = []
+
+    def mark(self, name: str):
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return self._last - self.start
+
+    def report(self) -> str:
+        width = max([len(name) for name, _ in self.phases] + [len("Gesamt")])
+        lines = [f"{name:<{width}}  {seconds * 1000:8.1f} ms" for name, seconds in self.phases]
+        lines.append("-" * (width + 13))
+        lines.append(f"{'Gesamt':<{width}}  {self.total * 1000:8.1f} ms")
+        return "\n".join(lines)
@@ -1,10 +1,13 @@
 import os
+import re
 import random
 from pathlib import Path
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from tkinter import messagebox
 from typing import Optional
 
+from app.core.id_allocator import IdAllocator
+
 def today_str() -> str:
     return date.today().strftime("%Y-%m-%d")
 
@@ -21,6 +24,136 @@ def months_until_expiry(check_date: date) -> int:
     months = (today.year - check_date.year) * 12 + (today.month - check_date.month)
     return 12 - months
 
+# ---------- Herstell-Datum & Lebensdauer ----------
+
+def safe_get(row, key, default=None):
+    """Sicherer Zugriff für sqlite3.Row oder dict."""
+    try:
+        return row[key]
+    except Exception:
+        return default
+
+def get_mfg_date_str(row):
+    """
+    Versucht, ein Herstell-Datum in verschiedenen (auch vertippten) Feldern zu finden.
+    Wichtig: 'manufactury_date' (mit y) ist dabei.
+    """
+    candidates = (
+        "manufactury_date",       # <== dein Feldname
+        "manufacture_date",
+        "manufactur_date",
+        "manufacturing_date",
+        "mfg_date",
+        "mfg",
+        "mfd",
+        "herstellungsdatum",
+    )
+    for k in candidates:
+        v = safe_get(row, k)
+        if v not in (None, ""):
+            return v
+    # Fallback: fuzzy über Keys
+    try:
+        keys = row.keys()
+    except Exception:
+        keys = []
+    for k in keys:
+        lk = str(k).lower()
+        if "manufact" in lk or "herstell" in lk:
+            v = safe_get(row, k)
+            if v not in (None, ""):
+                return v
+    return None
+
+def add_months(d: date, months: int) -> date:
+    """Monate addieren (Monatsende korrekt behandeln)."""
+    y = d.year + (d.month - 1 + months) // 12
+    m = (d.month - 1 + months) % 12 + 1
+    last_day = [31, 29 if (y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)) else 28,
+                31, 30, 31, 30, 31, 31, 30, 31, 30, 31][m-1]
+    day = min(d.day, last_day)
+    return date(y, m, day)
+
+def parse_lifetime(row) -> Optional[tuple[int, str]]:
+    """
+    Lebensdauer aus row auslesen.
+    Rückgabe: (wert, einheit) mit einheit in {"days","weeks","months","years"}.
+    Regeln:
+      - life_time / lifetime als INTEGER → **years**
+      - lifetime_years → years
+      - lifetime_months / _weeks / _days wie benannt
+      - life_time / lifetime als String mit Einheit ("10 Jahre", "10y", "120m", "365d")
+      - reine Zahl als String → **years**
+      - toleriert Tippfehler: "lifte_time"
+    """
+    # explizite Felder
+    for key, unit in (("lifetime_days", "days"),
+                      ("lifetime_weeks", "weeks"),
+                      ("lifetime_months", "months"),
+                      ("lifetime_years", "years")):
+        v = safe_get(row, key)
+        if v not in (None, ""):
+            try:
+                return int(str(v).strip()), unit
+            except Exception:
+                pass
+
+    # life_time / lifetime (inkl. lifte_time) als INT → Jahre
+    for key in ("life_time", "lifetime", "lifte_time"):
+        v = safe_get(row, key)
+        if isinstance(v, (int, float)):
+            return int(v), "years"
+        if isinstance(v, str) and v.strip().isdigit():
+            return int(v.strip()), "years"
+
+    # life_time / lifetime als String mit Einheit
+    for key in ("life_time", "lifetime", "lifte_time"):
+        raw = safe_get(row, key)
+        if raw in (None, ""):
+            continue
+        s = str(raw).strip().lower()
+        m = re.match(r"^\s*(\d+)\s*([a-zäöü]+)\s*$", s)
+        if not m:
+            continue
+        val = int(m.group(1))
+        unit = m.group(2)
+        if unit in ("y", "yr", "yrs", "year", "years", "jahr", "jahre", "j", "a"):
+            return val, "years"
+        if unit.startswith("m"):
+            return val, "months"
+        if unit.startswith("d"):
+            return val, "days"
+        if unit.startswith("w"):
+            return val, "weeks"
+
+    return None
+
+def expiry_from_mfg(row) -> Optional[date]:
+    """Berechnet Herstell-Datum + Lebensdauer als Datum, falls möglich."""
+    mfg_str = get_mfg_date_str(row)
+    if not mfg_str:
+        return None
+    mfg = parse_date(mfg_str)
+    if not mfg:
+        return None
+
+    lt = parse_lifetime(row)
+    if not lt:
+        return None
+
+    val, unit = lt
+    base = mfg if isinstance(mfg, date) else mfg.date()
+
+    if unit == "days":
+        return base + timedelta(days=val)
+    if unit == "weeks":
+        return base + timedelta(weeks=val)
+    if unit == "months":
+        return add_months(base, val)
+    if unit == "years":
+        return add_months(base, val * 12)
+    return None
+
 def random_hex_color():
     r = random.randint(96, 224)
     g = random.randint(96, 224)
@@ -37,6 +170,11 @@ def append_line(filepath: str, text: str):
     with open(filepath, "a", encoding="utf-8") as f:
         f.write(text + "\n")
 
+def append_lines(filepath: str, lines):
+    """Wie append_line, aber alle Zeilen mit einem einzigen Öffnen/Schreiben."""
+    with open(filepath, "a", encoding="utf-8") as f:
+        f.write("".join(f"{text}\n" for text in lines))
+
 def delete_file(filepath: str):
     try:
         os.remove(filepath)
@@ -50,84 +188,9 @@ def delete_file(filepath: str):
 # ---------- ID-Generatoren ----------
 
 def generate_next_valid_id_item(old_list_id):
-    list_digit_item = ['0','1','2','3','4','5','6','7','8','9',
-                       'A','B','C','D','E','F','G','H','I','J',
-                       'K','L','M','N','P','Q','R','S','T','U',
-                       'V','W','X','Y','Z']
-    generate = 1
-    digit_0 = 1
-    digit_1 = 0
-    digit_2 = 0
-
-    list_id = []
-    old_id = ""
-    for idv in old_list_id:
-        if len(idv) > 3:
-            idv = idv[:3]
-            if idv != old_id:
-                list_id.append(idv)
-                old_id = idv
-        else:
-            list_id.append(idv)
-
-    while generate:
-        bool_id_founded = 0
-        new_id = list_digit_item[digit_2] + list_digit_item[digit_1] + list_digit_item[digit_0]
-        for idv in list_id:
-            if idv == new_id:
-                bool_id_founded = 1
-                break
-        if bool_id_founded == 1:
-            digit_0 += 1
-            if digit_0 > len(list_digit_item)-1:
-                digit_0 = 0
-                digit_1 += 1
-                if digit_1 > len(list_digit_item)-1:
-                    digit_1 = 0
-                    digit_2 += 1
-                    if digit_2 > len(list_digit_item)-1:
-                        digit_0 = digit_1 = digit_2 = 0
-                        generate = 0
-                        return -1
-        else:
-            generate = 0
-            break
-    return new_id
+    new_id = IdAllocator.for_items(old_list_id).next_id()
+    return new_id if new_id is not None else -1
 
 def generate_next_valid_id_member(old_list_id):
-    list_digit_member = ['0','1','2','3','4','5','6','7','8','9']
-    generate = 1
-    digit_0 = 1
-    digit_1 = 0
-
-    list_id = []
-    old_id = ""
-    for idv in old_list_id:
-        if len(idv) > 4:
-            idv = idv[:4]
-            if idv != old_id:
-                list_id.append(idv)
-                old_id = idv
-        else:
-            list_id.append(idv)
-
-    while generate:
-        bool_id_founded = 0
-        new_id = "NR" + list_digit_member[digit_1] + list_digit_member[digit_0]
-        for idv in list_id:
-            if idv == new_id:
-                bool_id_founded = 1
-                break
-        if bool_id_founded == 1:
-            digit_0 += 1
-            if digit_0 > len(list_digit_member)-1:
-                digit_0 = 0
-                digit_1 += 1
-                if digit_1 > len(list_digit_member)-1:
-                    digit_0 = digit_1 = 0
-                    generate = 0
-                    return -1
-        else:
-            generate = 0
-            break
-    return new_id
+    new_id = IdAllocator.for_members(old_list_id).next_id()
+    return new_id if new_id is not None else -1
@@ -0,0 +1,28 @@
+from app.core.soll_ist import group_soll_ist_lines, soll_ist_columns, soll_ist_rows
+
+SOLL_IST_COLUMNS = soll_ist_columns("Fahrzeug")
+
+
+def compute_vehicle_soll_ist(db) -> list[dict]:
+    """
+    Soll/Ist-Abgleich aller Fahrzeuge (siehe `Database.fetch_vehicle_soll_ist_lines`).
+
+    Rückgabe je Fahrzeug (sortiert nach location):
+        {"location", "inventory_location", "set_table",
+         "lines": [{"product_type", "property_1", "property_2", "soll", "ist", "missing", "surplus"}],
+         "soll_total", "ist_total", "missing_total", "surplus_total"}
+    """
+    return group_soll_ist_lines(
+        db.fetch_vehicle_soll_ist_lines(),
+        lambda row: (row["location"], row["inventory_location"]),
+        lambda row: {
+            "location": row["location"],
+            "inventory_location": row["inventory_location"],
+            "set_table": row["set_table"],
+        },
+    )
+
+
+def soll_ist_report_rows(vehicles: list[dict], only_deviations: bool = False) -> list[dict]:
+    """Flache Zeilen mit den Keys aus SOLL_IST_COLUMNS (für export_table_to_pdf)."""
+    return soll_ist_rows(vehicles, "Fahrzeug", lambda vehicle: vehicle["inventory_location"], only_deviations)
@@ -1,21 +1,187 @@
 import os
 import re
 import sqlite3
+import string
 from datetime import date
-from settings.constants import INVENTORY_COLUMNS, MEMBER_COLUMNS, KLEIDUNG_COLUMNS
+from settings.constants import INVENTORY_COLUMNS, INVENTORY_DERIVED_COLUMNS, MEMBER_COLUMNS, KLEIDUNG_COLUMNS
+from app.core.utils import parse_date, add_months, expiry_from_mfg
+from app.core.inventory_frame import InventoryFrame
+from app.core.member_names import MemberNameLookup
+from app.core.inventory_hierarchy import InventoryHierarchy
+from app.db.pragmas import apply_pragmas
+from app.db.search import SearchIndex
+from app.db.worker import DbWorker
+from app.db.instrumentation import QueryStats
+
+MEMBER_BOOL_COLUMNS = ("ET_SO", "ET_WI", "PR_SO", "PR_WI", "NFM", "LR", "EL")
+
+# Fahrzeug-Sets: früher je Set eine Tabelle "set_vehicle_<name>", jetzt Zeilen in
+# vehicle_set_item. Der Tabellenname bleibt als Schlüssel (location.database_soll,
+# Dialoge) erhalten und wird auf den Setnamen abgebildet.
+VEHICLE_SET_PREFIX = "set_vehicle_"
+
+# Sekundärindizes. Bei Änderungen INDEX_SET_VERSION erhöhen, dann werden beim
+# nächsten `connect` nicht mehr gelistete `idx_*`-Indizes entfernt.
+INDEX_SET_VERSION = 6
+INDEXES = [
+    ("idx_inventory_location_type_props", "inventory", "location, product_type, property_1, property_2"),
+    ("idx_inventory_type_props", "inventory", "product_type, property_1, property_2"),
+    ("idx_inventory_check_date", "inventory", "check_date"),
+    ("idx_inventory_psa_check_date", "inventory", "psa_check, check_date"),
+    ("idx_inventory_expiry_date", "inventory", "expiry_date"),
+    ("idx_inventory_next_check_due", "inventory", "next_check_due"),
+    ("idx_inventory_id_nocase", "inventory", "ID COLLATE NOCASE"),
+    ("idx_inventory_serial_number_nocase", "inventory", "serial_number COLLATE NOCASE"),
+    ("idx_member_name", "member", "last_name, first_name"),
+    ("idx_kleidung_type_gender_size", "kleidung", "type, gender, size, location"),
+    ("idx_location_set_name", "location", "set_name"),
+    ("idx_vehicle_set_item_set_type_props", "vehicle_set_item", "set_name, product_type, property_1, property_2"),
+]
+
+# Anzeigename eines Mitglieds zu einem Lagerort "/NR.." (wie `MemberNameLookup`)
+_MEMBER_NAME_FOR_LOCATION_SQL = """(
+    SELECT TRIM(TRIM(COALESCE(m.first_name, '')) || ' ' || TRIM(COALESCE(m.last_name, '')))
+    FROM member m
+    WHERE (TRIM(m.ID) = TRIM({loc}) OR '/' || TRIM(m.ID) = TRIM({loc}))
+      AND TRIM(TRIM(COALESCE(m.first_name, '')) || ' ' || TRIM(COALESCE(m.last_name, ''))) <> ''
+    ORDER BY m.last_name DESC, m.first_name DESC
+    LIMIT 1
+)"""
+
+
+def _text_expr(col: str) -> str:
+    return f"COALESCE(CAST({col} AS TEXT), '')"
+
+
+def _bool_display_expr(col: str) -> str:
+    return f"CASE WHEN CAST({col} AS TEXT) = '1' THEN 'Ja' ELSE 'Nein' END"
+
+
+def _location_display_expr(col: str) -> str:
+    member_name = _MEMBER_NAME_FOR_LOCATION_SQL.format(loc=col)
+    return (
+        f"CASE WHEN substr(TRIM({col}), 1, 3) = '/NR' "
+        f"THEN COALESCE(TRIM({col}) || ' (' || {member_name} || ')', CAST({col} AS TEXT)) "
+        f"ELSE {_text_expr(col)} END"
+    )
+
+
+def _like_pattern(needle: str) -> str:
+    escaped = needle.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _py_lower(value):
+    return value.lower() if isinstance(value, str) else value
+
+
+_NOCASE_FOLD = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def code_key(code) -> str:
+    """Vergleichsschlüssel für gescannte IDs/Seriennummern, faltet wie SQLite COLLATE NOCASE (nur A-Z)."""
+    return str(code or "").strip().translate(_NOCASE_FOLD)
+
+
+# Stand der Berechnung von INVENTORY_DERIVED_COLUMNS; erhöhen => Neuberechnung beim connect
+INVENTORY_DERIVED_VERSION = 1
+
+
+# Zeilen ohne abgeleitete Werte, obwohl die Ausgangsdaten da sind ({p} = "" bzw. "NEW.")
+_DERIVED_MISSING_SQL = (
+    "({p}expiry_date IS NULL AND TRIM(COALESCE({p}manufactury_date, '')) <> '' AND {p}life_time IS NOT NULL)"
+    " OR ({p}next_check_due IS NULL AND TRIM(COALESCE({p}check_date, '')) <> '')"
+)
+
+# Trigger, die bei solchen Zeilen den app_meta-Merker "inventory_derived_checked" löschen,
+# auch wenn an Database vorbei geschrieben wird (migrate_db.py, sqlite-CLI)
+_DERIVED_PENDING_TRIGGERS = ("inventory_derived_pending_insert", "inventory_derived_pending_update")
+
+
+def inventory_derived_values(record) -> list[str | None]:
+    """expiry_date und next_check_due zu einem Inventar-Datensatz (dict oder sqlite3.Row)."""
+    expiry = expiry_from_mfg(record)
+    try:
+        check = parse_date(record["check_date"])
+    except (KeyError, IndexError, TypeError):
+        check = None
+    return [
+        expiry.isoformat() if expiry else None,
+        add_months(check, 12).isoformat() if check else None,
+    ]
+
+# Rollen-Bitmaske member.role_mask / psa.role_mask: Bit i = MEMBER_BOOL_COLUMNS[i].
+# Wird beim Schreiben berechnet; erhöhen => Neuberechnung beim connect
+ROLE_MASK_VERSION = 1
+ROLE_BITS = {col: 1 << i for i, col in enumerate(MEMBER_BOOL_COLUMNS)}
+# gleiche Wahrheitsregel wie _bool_display_expr ("1" = Ja)
+_ROLE_MASK_SQL = " | ".join(
+    f"(CASE WHEN CAST({col} AS TEXT) = '1' THEN {bit} ELSE 0 END)" for col, bit in ROLE_BITS.items()
+)
+
+
+def role_mask(record) -> int:
+    """Rollen-Flags eines member-/psa-Datensatzes (dict oder sqlite3.Row) als Bitmaske."""
+    mask = 0
+    for col, bit in ROLE_BITS.items():
+        try:
+            value = record[col]
+        except (KeyError, IndexError):
+            continue
+        if value is not None and str(value).strip() in ("1", "True"):
+            mask |= bit
+    return mask
+
+
+def role_names(mask: int) -> list[str]:
+    return [col for col, bit in ROLE_BITS.items() if mask & bit]
+
 
 class Database:
     def __init__(self):
         self.conn: sqlite3.Connection | None = None
         self.path: str | None = None
+        # Spalten-Cache für die Material-Tabelle, wird von den Schreibmethoden invalidiert
+        self.inventory_frame = InventoryFrame(self)
+        # "/NR.." -> Name für Tabs und Dialoge, wird von den member-Schreibmethoden invalidiert
+        self.member_names = MemberNameLookup(self)
+        # location -> product_type -> property_1 -> property_2 (Kaskaden-Filter)
+        self.inventory_hierarchy = InventoryHierarchy(self)
+        # globale Suche (FTS5/trigram, per Trigger aktuell gehalten)
+        self.search_index = SearchIndex(self)
+        # Schreibzähler je Tabelle; Caches wie get_distinct_values vergleichen dagegen
+        self._table_versions: dict[str, int] = {}
+        self._distinct_cache: dict[tuple[str, str], tuple[int, list[str]]] = {}
+        # tatsächlich aktive PRAGMA-Werte der Verbindung (siehe app.db.pragmas)
+        self.pragmas: dict = {}
+        # Hintergrund-Thread mit eigener Verbindung für lange Lesezugriffe
+        self.worker = DbWorker(self)
+        # Laufzeiten/SQL je Methode, nur nach query_stats.enable() aktiv
+        self.query_stats = QueryStats(self)
 
-    def connect(self, path: str):
+    def connect(self, path: str, pragmas: dict | None = None, profile=None):
+        """profile: optional StartupProfile, bekommt die Phasen verbinden/Schema/Reset."""
+        mark = profile.mark if profile is not None else (lambda _name: None)
         need_create = not os.path.exists(path)
         self.conn = sqlite3.connect(path)
         self.conn.row_factory = sqlite3.Row
+        self.pragmas = apply_pragmas(self.conn, pragmas)
+        self.conn.create_function("py_lower", 1, _py_lower, deterministic=True)
         self.path = path
+        self.inventory_frame.reset()
+        self.member_names.invalidate()
+        self._table_versions.clear()
+        self._distinct_cache.clear()
+        self.inventory_hierarchy.reset()
+        mark("DB verbinden")
         self.ensure_schema()
+        self.ensure_indexes()
+        self.search_index.ensure()
+        mark("DB Schema/Indizes")
         self.reset_expired_psa_checks()
+        self.conn.commit()
+        self.worker.start(path, self.pragmas)
+        mark("DB Reset PSA-Checks")
 
     def ensure_schema(self):
         assert self.conn is not None
@@ -33,8 +199,14 @@ class Database:
             manufactury_date TEXT,
             check_date TEXT,
             life_time INTEGER,
-            psa_check INTEGER
+            psa_check INTEGER,
+            expiry_date TEXT,
+            next_check_due TEXT
         );""")
+        existing = {row[1] for row in cur.execute("PRAGMA table_info(inventory)").fetchall()}
+        for col, col_type in INVENTORY_DERIVED_COLUMNS:
+            if col not in existing:
+                cur.execute(f"ALTER TABLE inventory ADD COLUMN {col} {col_type}")
         # member
         cur.execute("""CREATE TABLE IF NOT EXISTS member (
             ID TEXT PRIMARY KEY,
@@ -46,7 +218,8 @@ class Database:
             PR_WI INTEGER,
             NFM INTEGER,
             LR INTEGER,
-            EL INTEGER
+            EL INTEGER,
+            role_mask INTEGER
         );""")
         # ➕ psa
         cur.execute("""CREATE TABLE IF NOT EXISTS psa (
@@ -61,10 +234,16 @@ class Database:
             PR_WI INTEGER,
             NFM INTEGER,
             LR INTEGER,
-            EL INTEGER
+            EL INTEGER,
+            role_mask INTEGER
         );""")
+        for table in ("member", "psa"):
+            existing = {row[1] for row in cur.execute(f"PRAGMA table_info({table})").fetchall()}
+            if "role_mask" not in existing:
+                cur.execute(f"ALTER TABLE {table} ADD COLUMN role_mask INTEGER")
         # ➕ kleidung
         cur.execute("""CREATE TABLE IF NOT EXISTS kleidung (
+            id INTEGER PRIMARY KEY,
             type TEXT,
             gender TEXT,
             size TEXT,
@@ -78,6 +257,184 @@ class Database:
             database_soll TEXT
         );""")
 
+        # ➕ Fahrzeug-Sets (PSA Soll-Liste)
+        cur.execute("""CREATE TABLE IF NOT EXISTS vehicle_set (
+            set_name TEXT PRIMARY KEY
+        );""")
+        cur.execute("""CREATE TABLE IF NOT EXISTS vehicle_set_item (
+            id INTEGER PRIMARY KEY,
+            set_name TEXT NOT NULL,
+            product_type TEXT,
+            property_1 TEXT,
+            property_2 TEXT,
+            count INTEGER
+        );""")
+
+        # ➕ app_meta (Schema-/Wartungsstände)
+        cur.execute("""CREATE TABLE IF NOT EXISTS app_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );""")
+
+        if self.get_meta("inventory_derived_version") != str(INVENTORY_DERIVED_VERSION):
+            self.backfill_inventory_derived()
+            self._create_derived_pending_triggers()
+            self.set_meta("inventory_derived_version", str(INVENTORY_DERIVED_VERSION))
+            self.set_meta("inventory_derived_checked", "1")
+            self.conn.commit()
+        elif self.get_meta("inventory_derived_checked") != "1" or not self._derived_pending_triggers_exist():
+            # Zeilen, die an Database vorbei geschrieben wurden; nicht berechenbare Daten
+            # bleiben NULL und werden erst nach dem nächsten solchen Schreibzugriff wieder gelesen
+            self.backfill_inventory_derived(_DERIVED_MISSING_SQL.format(p=""))
+            self._create_derived_pending_triggers()
+            self.set_meta("inventory_derived_checked", "1")
+            self.conn.commit()
+
+        if self.get_meta("role_mask_version") != str(ROLE_MASK_VERSION):
+            self.backfill_role_masks()
+            self.set_meta("role_mask_version", str(ROLE_MASK_VERSION))
+            self.conn.commit()
+
+        self.migrate_vehicle_set_tables()
+        self.migrate_kleidung_id()
+
+    def backfill_role_masks(self):
+        """Berechnet role_mask für alle member-/psa-Zeilen (Schema-Upgrade)."""
+        assert self.conn is not None
+        for table in ("member", "psa"):
+            self.conn.execute(f"UPDATE {table} SET role_mask = {_ROLE_MASK_SQL}")
+            self._touch(table)
+
+    def migrate_vehicle_set_tables(self):
+        """Einmalig: alte set_vehicle_*-Tabellen nach vehicle_set/vehicle_set_item übernehmen und löschen."""
+        assert self.conn is not None
+        legacy = [
+            name for name in self.list_tables_with_prefix(VEHICLE_SET_PREFIX)
+            if name.startswith(VEHICLE_SET_PREFIX) and len(name) > len(VEHICLE_SET_PREFIX)
+        ]
+        if not legacy:
+            return
+        with self.conn:
+            for table_name in legacy:
+                self._validate_table_name(table_name)
+                set_name = table_name[len(VEHICLE_SET_PREFIX):]
+                self.conn.execute("INSERT OR IGNORE INTO vehicle_set (set_name) VALUES (?)", (set_name,))
+                self.conn.execute(
+                    f"INSERT INTO vehicle_set_item (set_name, product_type, property_1, property_2, count) "
+                    f"SELECT ?, product_type, property_1, property_2, count FROM {table_name} ORDER BY rowid",
+                    (set_name,),
+                )
+                self.conn.execute(f"DROP TABLE {table_name}")
+        self._touch("vehicle_set_item")
+
+    def migrate_kleidung_id(self):
+        """
+        Einmalig: kleidung bekommt eine feste id (INTEGER PRIMARY KEY, übernimmt die bisherige rowid).
+        Die implizite rowid kann sich bei VACUUM ändern, Suchindex und UI brauchen einen stabilen Schlüssel.
+        """
+        assert self.conn is not None
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(kleidung)").fetchall()}
+        if "id" in existing:
+            return
+        self.conn.execute("DROP TABLE IF EXISTS kleidung_neu")
+        self.conn.execute("""CREATE TABLE kleidung_neu (
+            id INTEGER PRIMARY KEY,
+            type TEXT,
+            gender TEXT,
+            size TEXT,
+            location TEXT
+        );""")
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO kleidung_neu (id, type, gender, size, location) "
+                "SELECT rowid, type, gender, size, location FROM kleidung"
+            )
+            self.conn.execute("DROP TABLE kleidung")
+            self.conn.execute("ALTER TABLE kleidung_neu RENAME TO kleidung")
+        self._touch("kleidung")
+
+    def backfill_inventory_derived(self, where: str | None = None):
+        """
+        Berechnet expiry_date/next_check_due für alle Zeilen (Schema-Upgrade) bzw. nur
+        für die Zeilen, die `where` erfüllen.
+        """
+        assert self.conn is not None
+        cur = self.conn.cursor()
+        cur.execute("SELECT * FROM inventory" + (f" WHERE {where}" if where else ""))
+        updates = [inventory_derived_values(row) + [row["ID"]] for row in cur.fetchall()]
+        if where:
+            # nicht berechenbare Werte (Tippfehler im Datum) bleiben NULL, kein Schreibzugriff nötig
+            updates = [u for u in updates if u[0] is not None or u[1] is not None]
+        if not updates:
+            return
+        derived = [c for c, _ in INVENTORY_DERIVED_COLUMNS]
+        self.conn.executemany(
+            f"UPDATE inventory SET {', '.join(f'{c} = ?' for c in derived)} WHERE ID = ?",
+            updates,
+        )
+        self._touch("inventory")
+        self.inventory_frame.reset()
+
+    def _derived_pending_triggers_exist(self) -> bool:
+        assert self.conn is not None
+        cur = self.conn.execute(
+            f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name IN "
+            f"({', '.join('?' * len(_DERIVED_PENDING_TRIGGERS))})",
+            _DERIVED_PENDING_TRIGGERS,
+        )
+        return cur.fetchone()[0] == len(_DERIVED_PENDING_TRIGGERS)
+
+    def _create_derived_pending_triggers(self):
+        # migrate_db.py --replace legt inventory neu an, die Trigger fehlen dann -> neu anlegen
+        assert self.conn is not None
+        when = _DERIVED_MISSING_SQL.format(p="NEW.")
+        clear = "DELETE FROM app_meta WHERE key = 'inventory_derived_checked';"
+        for name, event in zip(_DERIVED_PENDING_TRIGGERS, ("INSERT", "UPDATE")):
+            self.conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON inventory WHEN {when} BEGIN {clear} END"
+            )
+
+    def ensure_indexes(self):
+        """Legt den Indexsatz idempotent an und räumt veraltete `idx_*`-Indizes auf."""
+        assert self.conn is not None
+        for name, table, cols in INDEXES:
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({cols})")
+
+        if self.get_meta("index_set_version") != str(INDEX_SET_VERSION):
+            wanted = {name for name, _, _ in INDEXES}
+            cur = self.conn.cursor()
+            cur.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx\\_%' ESCAPE '\\'")
+            for (name,) in cur.fetchall():
+                if name not in wanted:
+                    self.conn.execute(f"DROP INDEX IF EXISTS {name}")
+            self.set_meta("index_set_version", str(INDEX_SET_VERSION))
+        self.conn.commit()
+
+    def get_meta(self, key: str, default: str | None = None) -> str | None:
+        assert self.conn is not None
+        cur = self.conn.cursor()
+        cur.execute("SELECT value FROM app_meta WHERE key = ?", (key,))
+        row = cur.fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str | None):
+        assert self.conn is not None
+        self.conn.execute(
+            "INSERT INTO app_meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def explain_query_plan(self, sql: str, params: tuple | list = ()) -> list[str]:
+        """Gibt die `detail`-Zeilen von EXPLAIN QUERY PLAN zurück (z.B. 'SEARCH inventory USING INDEX ...')."""
+        assert self.conn is not None
+        cur = self.conn.cursor()
+        cur.execute(f"EXPLAIN QUERY PLAN {sql}", tuple(params))
+        return [row[3] for row in cur.fetchall()]
+
+    def search(self, text: str, limit: int = 50) -> list[dict]:
+        """Globale Suche über Material, Einsatzkräfte, Kleidung und Lagerorte (siehe SearchIndex)."""
+        return self.search_index.search(text, limit)
 
     def fetch_all(self, table: str) -> list[sqlite3.Row]:
         assert self.conn is not None
@@ -85,18 +442,111 @@ class Database:
         cur.execute(f"SELECT * FROM {table}")
         return cur.fetchall()
 
+    # ---- Gefilterte Abfragen (Filterzeile der Tabellen) ----
+    def _query_filtered(
+        self,
+        table: str,
+        select_sql: str,
+        display_exprs: dict[str, str],
+        filters: dict | None,
+        order_by: list[str] | str | None,
+        limit: int | None,
+        offset: int | None,
+    ) -> list[sqlite3.Row]:
+        """
+        Übersetzt `FilterTable.get_filters()` in `WHERE ... LIKE ?`.
+        Gesucht wird (wie bisher) case-insensitiv im *Anzeigewert* der Spalte,
+        z.B. "Ja"/"Nein" für Bool-Spalten oder "/NR01 (Vorname Nachname)" für Lagerorte.
+        """
+        assert self.conn is not None
+        where: list[str] = []
+        params: list = []
+        for col, needle in (filters or {}).items():
+            if col not in display_exprs:
+                raise ValueError(f"Ungültige Filterspalte: {col}")
+            if not needle:
+                continue
+            where.append(f"py_lower({display_exprs[col]}) LIKE ? ESCAPE '\\'")
+            params.append(_like_pattern(needle))
+
+        query = [f"SELECT {select_sql} FROM {table}"]
+        if where:
+            query.append("WHERE " + " AND ".join(where))
+        if order_by:
+            order_cols = [order_by] if isinstance(order_by, str) else list(order_by)
+            for col in order_cols:
+                if col not in display_exprs and col != "rowid":
+                    raise ValueError(f"Ungültige Sortierspalte: {col}")
+            query.append("ORDER BY " + ", ".join(order_cols))
+        if limit is not None:
+            query.append("LIMIT ? OFFSET ?")
+            params.extend([int(limit), int(offset or 0)])
+
+        cur = self.conn.cursor()
+        cur.execute(" ".join(query), tuple(params))
+        return cur.fetchall()
+
+    def query_members(
+        self,
+        filters: dict | None = None,
+        order_by: list[str] | str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[sqlite3.Row]:
+        display_exprs = {c: _text_expr(c) for c, _ in MEMBER_COLUMNS}
+        for col in MEMBER_BOOL_COLUMNS:
+            display_exprs[col] = _bool_display_expr(col)
+        return self._query_filtered("member", "*", display_exprs, filters, order_by, limit, offset)
+
+    def query_kleidung(
+        self,
+        filters: dict | None = None,
+        order_by: list[str] | str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[sqlite3.Row]:
+        display_exprs = {c: _text_expr(c) for c, _ in KLEIDUNG_COLUMNS}
+        display_exprs["location"] = _location_display_expr("location")
+        return self._query_filtered(
+            "kleidung",
+            "id AS rowid, type, gender, size, location",
+            display_exprs,
+            filters,
+            order_by or ["type", "gender", "size", "location"],
+            limit,
+            offset,
+        )
+
     def fetch_by_id(self, table: str, id_val: str):
         assert self.conn is not None
         cur = self.conn.cursor()
         cur.execute(f"SELECT * FROM {table} WHERE ID = ?", (id_val,))
         return cur.fetchone()
 
+    def table_version(self, table: str) -> int:
+        """Zählt Schreibzugriffe der Database-Methoden auf `table` seit connect."""
+        return self._table_versions.get(table, 0)
+
+    def _touch(self, table: str):
+        self._table_versions[table] = self._table_versions.get(table, 0) + 1
+
     def get_distinct_values(self, table: str, column: str) -> list[str]:
+        """
+        Sortierte, nicht-leere Werte einer Spalte (Dropdowns in den Dialogen).
+        Gecacht je (table, column), bis eine Schreibmethode die Tabelle ändert.
+        Die zurückgegebene Liste ist der Cache selbst und darf nicht verändert werden.
+        """
         assert self.conn is not None
+        version = self.table_version(table)
+        cached = self._distinct_cache.get((table, column))
+        if cached is not None and cached[0] == version:
+            return cached[1]
         cur = self.conn.cursor()
         cur.execute(f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL AND {column} <> ''")
         vals = [row[0] for row in cur.fetchall() if row[0] is not None]
-        return sorted({str(v) for v in vals})
+        values = sorted({str(v) for v in vals})
+        self._distinct_cache[(table, column)] = (version, values)
+        return values
 
     def id_exists(self, table: str, id_val: str) -> bool:
         assert self.conn is not None
@@ -106,23 +556,43 @@ class Database:
 
     def insert_inventory(self, record: dict):
         assert self.conn is not None
-        cols = [c for c, _ in INVENTORY_COLUMNS]
+        cols = [c for c, _ in INVENTORY_COLUMNS + INVENTORY_DERIVED_COLUMNS]
         placeholders = ",".join(["?"] * len(cols))
-        values = [record.get(c) for c in cols]
+        values = [record.get(c) for c, _ in INVENTORY_COLUMNS] + inventory_derived_values(record)
         self.conn.execute(f"INSERT INTO inventory ({','.join(cols)}) VALUES ({placeholders})", values)
+        self._touch("inventory")
+        self.inventory_frame.invalidate([record.get("ID")])
+
+    def insert_inventory_many(self, records: list[dict]):
+        """Fügt mehrere Datensätze per executemany in einer Transaktion ein (alles oder nichts)."""
+        assert self.conn is not None
+        if not records:
+            return
+        cols = [c for c, _ in INVENTORY_COLUMNS + INVENTORY_DERIVED_COLUMNS]
+        placeholders = ",".join(["?"] * len(cols))
+        rows = [[record.get(c) for c, _ in INVENTORY_COLUMNS] + inventory_derived_values(record) for record in records]
+        with self.conn:
+            self.conn.executemany(f"INSERT INTO inventory ({','.join(cols)}) VALUES ({placeholders})", rows)
+        self._touch("inventory")
+        self.inventory_frame.invalidate(record.get("ID") for record in records)
 
     def update_inventory(self, id_val: str, record: dict):
         assert self.conn is not None
         cols = [c for c, _ in INVENTORY_COLUMNS if c != "ID"]
-        set_clause = ",".join([f"{c}=?" for c in cols])
-        values = [record.get(c) for c in cols] + [id_val]
+        derived = [c for c, _ in INVENTORY_DERIVED_COLUMNS]
+        set_clause = ",".join([f"{c}=?" for c in cols + derived])
+        values = [record.get(c) for c in cols] + inventory_derived_values(record) + [id_val]
         self.conn.execute(f"UPDATE inventory SET {set_clause} WHERE ID = ?", values)
+        self._touch("inventory")
+        self.inventory_frame.invalidate([id_val])
 
     def delete_inventory(self, id_val: str):
         assert self.conn is not None
         cur = self.conn.cursor()
         cur.execute("DELETE FROM inventory WHERE ID = ?", (id_val,))
         self.conn.commit()
+        self._touch("inventory")
+        self.inventory_frame.invalidate([id_val])
 
     def get_inventory_ids(self):
         assert self.conn is not None
@@ -133,23 +603,34 @@ class Database:
 
     def insert_member(self, record: dict):
         assert self.conn is not None
-        cols = [c for c, _ in MEMBER_COLUMNS]
+        cols = [c for c, _ in MEMBER_COLUMNS] + ["role_mask"]
         placeholders = ",".join(["?"] * len(cols))
-        values = [record.get(c) for c in cols]
+        values = [record.get(c) for c, _ in MEMBER_COLUMNS] + [role_mask(record)]
         self.conn.execute(f"INSERT INTO member ({','.join(cols)}) VALUES ({placeholders})", values)
+        self._touch("member")
+        self._invalidate_member_names()
 
     def update_member(self, id_val: str, record: dict):
         assert self.conn is not None
         cols = [c for c, _ in MEMBER_COLUMNS if c != "ID"]
-        set_clause = ",".join([f"{c}=?" for c in cols])
-        values = [record.get(c) for c in cols] + [id_val]
+        set_clause = ",".join([f"{c}=?" for c in cols + ["role_mask"]])
+        values = [record.get(c) for c in cols] + [role_mask(record), id_val]
         self.conn.execute(f"UPDATE member SET {set_clause} WHERE ID = ?", values)
+        self._touch("member")
+        self._invalidate_member_names()
 
     def delete_member(self, id_val: str):
         assert self.conn is not None
         cur = self.conn.cursor()
         cur.execute("DELETE FROM member WHERE ID = ?", (id_val,))
         self.conn.commit()
+        self._touch("member")
+        self._invalidate_member_names()
+
+    def _invalidate_member_names(self):
+        self.member_names.invalidate()
+        # Anzeige der Lagerorte "/NR.. (Name)" im Material-Cache hängt an den Namen
+        self.inventory_frame.clear_display_cache()
 
     def get_member_ids(self):
         assert self.conn is not None
@@ -167,12 +648,14 @@ class Database:
         return [row[0] for row in rows]
 
     def list_vehicle_sets(self) -> list[str]:
-        prefix = "set_vehicle_"
-        table_names = self.list_tables_with_prefix(prefix)
-        return [name[len(prefix):] for name in table_names]
+        assert self.conn is not None
+        cur = self.conn.cursor()
+        cur.execute("SELECT set_name FROM vehicle_set ORDER BY set_name")
+        return [row[0] for row in cur.fetchall()]
 
     def list_location_set_tables(self) -> list[str]:
-        return self.list_tables_with_prefix("set_vehicle_")
+        """Soll-Listen als "set_vehicle_<name>" (Format von location.database_soll)."""
+        return [f"{VEHICLE_SET_PREFIX}{name}" for name in self.list_vehicle_sets()]
 
     def fetch_location_rows(self) -> list[sqlite3.Row]:
         assert self.conn is not None
@@ -215,86 +698,129 @@ class Database:
             (location, set_name or None, database_soll or None),
         )
         self.conn.commit()
+        self._touch("location")
 
     def delete_location(self, location: str):
         assert self.conn is not None
         self.conn.execute("DELETE FROM location WHERE location = ?", (location,))
+        self._touch("location")
         self.conn.commit()
 
     def create_vehicle_set_table(self, table_name: str):
+        """Legt das Set zu "set_vehicle_<name>" an (Kompatibilität: früher eigene Tabelle)."""
         assert self.conn is not None
-        if not re.fullmatch(r"\w+", table_name):
-            raise ValueError("Ungültiger Tabellenname")
-        self.conn.execute(f"""CREATE TABLE IF NOT EXISTS {table_name} (
-            product_type TEXT,
-            property_1 TEXT,
-            property_2 TEXT,
-            count INTEGER
-        );""")
+        set_name = self._vehicle_set_name(table_name)
+        self.conn.execute("INSERT OR IGNORE INTO vehicle_set (set_name) VALUES (?)", (set_name,))
         self.conn.commit()
 
     def _validate_table_name(self, table_name: str):
         if not re.fullmatch(r"\w+", table_name):
             raise ValueError("Ungültiger Tabellenname")
 
+    def _vehicle_set_name(self, table_name: str) -> str:
+        self._validate_table_name(table_name)
+        if not table_name.startswith(VEHICLE_SET_PREFIX) or len(table_name) == len(VEHICLE_SET_PREFIX):
+            raise ValueError("Ungültiger Tabellenname")
+        return table_name[len(VEHICLE_SET_PREFIX):]
+
     def fetch_vehicle_set_rows(self, table_name: str) -> list[sqlite3.Row]:
         assert self.conn is not None
-        self._validate_table_name(table_name)
+        set_name = self._vehicle_set_name(table_name)
         cur = self.conn.cursor()
         cur.execute(
-            f"SELECT rowid, product_type, property_1, property_2, count FROM {table_name} "
-            "ORDER BY product_type, property_1, property_2"
+            "SELECT id AS rowid, product_type, property_1, property_2, count FROM vehicle_set_item "
+            "WHERE set_name = ? ORDER BY product_type, property_1, property_2",
+            (set_name,),
         )
         return cur.fetchall()
 
     def insert_vehicle_set_row(self, table_name: str, product_type: str, property_1: str, property_2: str, count: int):
         assert self.conn is not None
-        self._validate_table_name(table_name)
+        set_name = self._vehicle_set_name(table_name)
+        self.conn.execute("INSERT OR IGNORE INTO vehicle_set (set_name) VALUES (?)", (set_name,))
         self.conn.execute(
-            f"INSERT INTO {table_name} (product_type, property_1, property_2, count) VALUES (?, ?, ?, ?)",
-            (product_type, property_1, property_2, count),
+            "INSERT INTO vehicle_set_item (set_name, product_type, property_1, property_2, count) VALUES (?, ?, ?, ?, ?)",
+            (set_name, product_type, property_1, property_2, count),
         )
         self.conn.commit()
+        self._touch("vehicle_set_item")
 
     def update_vehicle_set_row_count(self, table_name: str, row_id: int, count: int):
         assert self.conn is not None
-        self._validate_table_name(table_name)
-        self.conn.execute(f"UPDATE {table_name} SET count = ? WHERE rowid = ?", (count, row_id))
+        set_name = self._vehicle_set_name(table_name)
+        self.conn.execute(
+            "UPDATE vehicle_set_item SET count = ? WHERE id = ? AND set_name = ?", (count, row_id, set_name)
+        )
         self.conn.commit()
+        self._touch("vehicle_set_item")
+
+    def fetch_vehicle_soll_ist_lines(self) -> list[sqlite3.Row]:
+        """
+        Soll/Ist aller Fahrzeuge in einer Abfrage.
+
+        Fahrzeug = Zeile in `location`, deren `database_soll` auf ein Set in vehicle_set zeigt.
+        Das Material liegt im Inventar unter "location/set_name" bzw. "location".
+        Je Fahrzeug und (product_type, property_1, property_2): soll, ist. Positionen
+        ohne Soll (nur Ist) sind enthalten; NULL und '' gelten als gleich.
+        """
+        assert self.conn is not None
+        sql = """
+            WITH vehicle AS (
+                SELECT l.location, l.database_soll AS set_table, vs.set_name AS vehicle_set,
+                       CASE WHEN TRIM(COALESCE(l.set_name, '')) <> ''
+                            THEN TRIM(l.location) || '/' || TRIM(l.set_name)
+                            ELSE TRIM(l.location) END AS inventory_location
+                FROM location l
+                JOIN vehicle_set vs ON ? || vs.set_name = l.database_soll
+            ),
+            soll AS (
+                SELECT v.location, v.inventory_location, v.set_table,
+                       COALESCE(s.product_type, '') AS product_type,
+                       COALESCE(s.property_1, '') AS property_1,
+                       COALESCE(s.property_2, '') AS property_2,
+                       SUM(COALESCE(s.count, 0)) AS soll
+                FROM vehicle v JOIN vehicle_set_item s ON s.set_name = v.vehicle_set
+                GROUP BY 1, 2, 3, 4, 5, 6
+            ),
+            ist AS (
+                SELECT location AS inventory_location,
+                       COALESCE(product_type, '') AS product_type,
+                       COALESCE(property_1, '') AS property_1,
+                       COALESCE(property_2, '') AS property_2,
+                       COUNT(*) AS ist
+                FROM inventory
+                WHERE location IN (SELECT inventory_location FROM vehicle)
+                GROUP BY 1, 2, 3, 4
+            )
+            SELECT s.location, s.inventory_location, s.set_table,
+                   s.product_type, s.property_1, s.property_2, s.soll, COALESCE(i.ist, 0) AS ist
+            FROM soll s
+            LEFT JOIN ist i
+              ON i.inventory_location = s.inventory_location AND i.product_type = s.product_type
+             AND i.property_1 = s.property_1 AND i.property_2 = s.property_2
+            UNION ALL
+            SELECT v.location, v.inventory_location, v.set_table,
+                   i.product_type, i.property_1, i.property_2, 0 AS soll, i.ist
+            FROM ist i JOIN vehicle v ON v.inventory_location = i.inventory_location
+            WHERE NOT EXISTS (
+                SELECT 1 FROM soll s
+                WHERE s.inventory_location = i.inventory_location AND s.product_type = i.product_type
+                  AND s.property_1 = i.property_1 AND s.property_2 = i.property_2
+            )
+            ORDER BY 1, 2, 4, 5, 6
+        """
+        cur = self.conn.cursor()
+        cur.execute(sql, (VEHICLE_SET_PREFIX,))
+        return cur.fetchall()
 
     def get_inventory_product_types(self) -> list[str]:
         return self.get_distinct_values("inventory", "product_type")
 
     def get_inventory_property1_for_type(self, product_type: str) -> list[str]:
-        assert self.conn is not None
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            SELECT DISTINCT property_1
-            FROM inventory
-            WHERE product_type = ? AND property_1 IS NOT NULL AND property_1 <> ''
-            ORDER BY property_1
-            """,
-            (product_type,),
-        )
-        return [row[0] for row in cur.fetchall()]
+        return self.inventory_hierarchy.values("property_1", product_type=product_type)
 
     def get_inventory_property2_for_type_and_property1(self, product_type: str, property_1: str) -> list[str]:
-        assert self.conn is not None
-        cur = self.conn.cursor()
-        cur.execute(
-            """
-            SELECT DISTINCT property_2
-            FROM inventory
-            WHERE product_type = ?
-              AND property_1 = ?
-              AND property_2 IS NOT NULL
-              AND property_2 <> ''
-            ORDER BY property_2
-            """,
-            (product_type, property_1),
-        )
-        return [row[0] for row in cur.fetchall()]
+        return self.inventory_hierarchy.values("property_2", product_type=product_type, property_1=property_1)
 
     def get_inventory_distinct_by_filters(
         self,
@@ -303,31 +829,8 @@ class Database:
         product_type: str | None = None,
         property_1: str | None = None,
     ) -> list[str]:
-        assert self.conn is not None
-        allowed_columns = {"location", "product_type", "property_1", "property_2"}
-        if column not in allowed_columns:
-            raise ValueError("Ungültige Spalte")
-
-        query = [
-            f"SELECT DISTINCT {column} FROM inventory",
-            f"WHERE {column} IS NOT NULL AND TRIM({column}) <> ''",
-        ]
-        params: list[str] = []
-
-        if location:
-            query.append("AND location = ?")
-            params.append(location)
-        if product_type:
-            query.append("AND product_type = ?")
-            params.append(product_type)
-        if property_1:
-            query.append("AND property_1 = ?")
-            params.append(property_1)
-
-        query.append(f"ORDER BY {column}")
-        cur = self.conn.cursor()
-        cur.execute(" ".join(query), tuple(params))
-        return [row[0] for row in cur.fetchall()]
+        """Werte für die Kaskaden-Filter, aus dem gecachten Baum (InventoryHierarchy)."""
+        return self.inventory_hierarchy.values(column, location, product_type, property_1)
 
     def fetch_inventory_for_psa_check(
         self,
@@ -362,35 +865,87 @@ class Database:
         cur.execute(" ".join(query), tuple(params))
         return cur.fetchall()
 
+    def find_inventory_by_code(self, code: str) -> list[sqlite3.Row]:
+        """
+        Inventar zu einem gescannten Code: ID oder Seriennummer ohne Groß-/Kleinschreibung
+        (idx_inventory_id_nocase bzw. idx_inventory_serial_number_nocase, Schlüssel wie `code_key`).
+        """
+        assert self.conn is not None
+        code = (code or "").strip()
+        if not code:
+            return []
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT ID, product_type, property_1, property_2, serial_number, check_date, psa_check, location
+            FROM inventory
+            WHERE ID = ? COLLATE NOCASE OR serial_number = ? COLLATE NOCASE
+            ORDER BY ID
+            """,
+            (code, code),
+        )
+        return cur.fetchall()
+
+    def fetch_inventory_expiring_before(self, before: str) -> list[sqlite3.Row]:
+        """
+        Alle Einträge mit expiry_date < before (Bereichsabfrage über idx_inventory_expiry_date).
+        before darf auch verkürzt sein, z.B. "2027-06" = alles, was vor Juni 2027 abläuft.
+        """
+        assert self.conn is not None
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT * FROM inventory WHERE expiry_date < ? ORDER BY expiry_date, ID",
+            (before,),
+        )
+        return cur.fetchall()
+
+    def count_lifetime_violations(self, today: str | None = None) -> int:
+        """Anzahl der Einträge mit expiry_date <= heute."""
+        assert self.conn is not None
+        cur = self.conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM inventory WHERE expiry_date <= ?", (today or date.today().isoformat(),))
+        return cur.fetchone()[0]
+
     def update_inventory_psa_check_dates(self, ids: list[str], check_date: str):
         assert self.conn is not None
         if not ids:
             return
+        _expiry, next_check_due = inventory_derived_values({"check_date": check_date})
         self.conn.executemany(
-            "UPDATE inventory SET check_date = ?, psa_check = 1 WHERE ID = ?",
-            [(check_date, item_id) for item_id in ids],
+            "UPDATE inventory SET check_date = ?, next_check_due = ?, psa_check = 1 WHERE ID = ?",
+            [(check_date, next_check_due, item_id) for item_id in ids],
         )
         self.conn.commit()
+        self._touch("inventory")
+        self.inventory_frame.invalidate(ids)
 
     def reset_expired_psa_checks(self):
         """
         Setzt `psa_check` auf 0, wenn das `check_date`-Jahr in der Vergangenheit liegt.
         Tag und Monat werden dabei absichtlich ignoriert.
+
+        Läuft bei jedem connect und entscheidet allein anhand von check_date der Zeile,
+        damit auch nachträglich importierte Zeilen erfasst werden. Gelesen werden nur
+        Zeilen mit psa_check = 1 und check_date vor dem 1.1. (idx_inventory_psa_check_date).
+        Ein reines SELECT prüft vorher, ob es solche Zeilen gibt; nur dann wird
+        geschrieben (sonst nähme jeder Programmstart die Schreibsperre).
         """
         assert self.conn is not None
         current_year = date.today().year
-        self.conn.execute(
-            """
-            UPDATE inventory
-            SET psa_check = 0
-            WHERE COALESCE(psa_check, 0) = 1
-              AND check_date IS NOT NULL
+        expired = """
+            psa_check = 1
+              AND check_date < ?
               AND TRIM(check_date) <> ''
               AND CAST(strftime('%Y', check_date) AS INTEGER) < ?
-            """,
-            (current_year,),
-        )
+        """
+        params = (f"{current_year:04d}-01-01", current_year)
+        if not self.conn.execute(f"SELECT EXISTS (SELECT 1 FROM inventory WHERE {expired})", params).fetchone()[0]:
+            return
+        cur = self.conn.execute(f"UPDATE inventory SET psa_check = 0 WHERE {expired}", params)
         self.conn.commit()
+        if cur.rowcount:
+            self._touch("inventory")
+            self.inventory_frame.reset()
 
     def commit(self):
         assert self.conn is not None
@@ -431,42 +986,150 @@ class Database:
         cur.execute("SELECT * FROM psa")
         return cur.fetchall()
 
+    def fetch_member_psa_lines(self) -> list[sqlite3.Row]:
+        """
+        PSA Soll/Ist aller Einsatzkräfte in einer Abfrage.
+
+        Soll: psa-Zeilen, deren role_mask eine Rolle des Mitglieds enthält; gleiche
+        (type, property_1, property_2) aus mehreren Rollen zählen einmal (MAX(count)).
+        Leeres property_1/property_2 in psa = beliebiger Wert.
+        Ist: Inventar unter "/<ID>". Material ohne passende Soll-Zeile kommt mit soll = 0.
+        Spalten: member_id, first_name, last_name, role_mask, product_type, property_1, property_2, soll, ist
+        """
+        assert self.conn is not None
+        sql = """
+            WITH m AS (
+                SELECT ID AS member_id, first_name, last_name, COALESCE(role_mask, 0) AS role_mask,
+                       CASE WHEN substr(ID, 1, 1) = '/' THEN ID ELSE '/' || ID END AS inventory_location
+                FROM member
+            ),
+            soll AS (
+                SELECT m.member_id,
+                       COALESCE(p.type, '') AS product_type,
+                       COALESCE(p.property_1, '') AS property_1,
+                       COALESCE(p.property_2, '') AS property_2,
+                       MAX(COALESCE(p.count, 0)) AS soll
+                FROM m JOIN psa p ON (p.role_mask & m.role_mask) <> 0
+                GROUP BY 1, 2, 3, 4
+            ),
+            inv AS (
+                SELECT m.member_id,
+                       COALESCE(i.product_type, '') AS product_type,
+                       COALESCE(i.property_1, '') AS property_1,
+                       COALESCE(i.property_2, '') AS property_2,
+                       COUNT(*) AS n
+                FROM m JOIN inventory i ON i.location = m.inventory_location
+                GROUP BY 1, 2, 3, 4
+            ),
+            lines AS (
+                SELECT s.member_id, s.product_type, s.property_1, s.property_2, s.soll,
+                       COALESCE(SUM(v.n), 0) AS ist
+                FROM soll s
+                LEFT JOIN inv v
+                  ON v.member_id = s.member_id AND v.product_type = s.product_type
+                 AND (s.property_1 = '' OR v.property_1 = s.property_1)
+                 AND (s.property_2 = '' OR v.property_2 = s.property_2)
+                GROUP BY 1, 2, 3, 4, 5
+                UNION ALL
+                SELECT v.member_id, v.product_type, v.property_1, v.property_2, 0, v.n
+                FROM inv v
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM soll s
+                    WHERE s.member_id = v.member_id AND s.product_type = v.product_type
+                      AND (s.property_1 = '' OR v.property_1 = s.property_1)
+                      AND (s.property_2 = '' OR v.property_2 = s.property_2)
+                )
+            )
+            SELECT m.member_id, m.first_name, m.last_name, m.role_mask,
+                   l.product_type, l.property_1, l.property_2, l.soll, l.ist
+            FROM lines l JOIN m ON m.member_id = l.member_id
+            ORDER BY m.last_name, m.first_name, m.member_id, l.product_type, l.property_1, l.property_2
+        """
+        cur = self.conn.cursor()
+        cur.execute(sql)
+        return cur.fetchall()
+
     def insert_psa(self, record: dict):
         assert self.conn is not None
         cols = ["count","type","property_1","property_2","state",
                 "ET_SO","ET_WI","PR_SO","PR_WI","NFM","LR","EL"]
+        values = [record.get(c) for c in cols] + [role_mask(record)]
+        cols = cols + ["role_mask"]
         placeholders = ",".join(["?"] * len(cols))
-        values = [record.get(c) for c in cols]
         self.conn.execute(f"INSERT INTO psa ({','.join(cols)}) VALUES ({placeholders})", values)
+        self._touch("psa")
 
     def delete_psa(self, type_val: str):
         """Beispiel: löscht alle Zeilen eines bestimmten Typs"""
         assert self.conn is not None
         self.conn.execute("DELETE FROM psa WHERE type = ?", (type_val,))
+        self._touch("psa")
         self.conn.commit()
 
     # ---- Kleidung ----
     def fetch_all_kleidung(self) -> list[sqlite3.Row]:
         assert self.conn is not None
         cur = self.conn.cursor()
-        cur.execute("SELECT rowid, type, gender, size, location FROM kleidung ORDER BY type, gender, size, location")
+        cur.execute("SELECT id AS rowid, type, gender, size, location FROM kleidung ORDER BY type, gender, size, location")
         return cur.fetchall()
 
+    def fetch_kleidung_by_rowid(self, row_id: int):
+        assert self.conn is not None
+        cur = self.conn.cursor()
+        cur.execute("SELECT id AS rowid, type, gender, size, location FROM kleidung WHERE id = ?", (row_id,))
+        return cur.fetchone()
+
     def insert_kleidung(self, record: dict):
         assert self.conn is not None
         cols = [c for c, _ in KLEIDUNG_COLUMNS]
         placeholders = ",".join(["?"] * len(cols))
         values = [record.get(c) for c in cols]
         self.conn.execute(f"INSERT INTO kleidung ({','.join(cols)}) VALUES ({placeholders})", values)
+        self._touch("kleidung")
 
     def update_kleidung(self, row_id: int, record: dict):
         assert self.conn is not None
         cols = [c for c, _ in KLEIDUNG_COLUMNS]
         set_clause = ",".join([f"{c}=?" for c in cols])
         values = [record.get(c) for c in cols] + [row_id]
-        self.conn.execute(f"UPDATE kleidung SET {set_clause} WHERE rowid = ?", values)
+        self.conn.execute(f"UPDATE kleidung SET {set_clause} WHERE id = ?", values)
+        self._touch("kleidung")
 
     def delete_kleidung(self, row_id: int):
         assert self.conn is not None
-        self.conn.execute("DELETE FROM kleidung WHERE rowid = ?", (row_id,))
+        self.conn.execute("DELETE FROM kleidung WHERE id = ?", (row_id,))
+        self._touch("kleidung")
         self.conn.commit()
+
+
+class DbReader:
+    """
+    Lese-Verbindung für den DbWorker-Thread. Bietet nur die Abfragen, die allein über
+    `conn` laufen (keine Caches, Suchindex oder Schreibmethoden); das SQL kommt aus `Database`.
+    `table_versions` setzt der Worker je Job auf eine Momentaufnahme der Haupt-Database.
+    """
+
+    fetch_inventory_for_psa_check = Database.fetch_inventory_for_psa_check
+    get_inventory_for_member = Database.get_inventory_for_member
+    fetch_vehicle_soll_ist_lines = Database.fetch_vehicle_soll_ist_lines
+    fetch_member_psa_lines = Database.fetch_member_psa_lines
+
+    def __init__(self, path: str, pragmas: dict | None = None):
+        self.path = path
+        self.table_versions: dict[str, int] = {}
+        conn = sqlite3.connect(path)
+        try:
+            conn.row_factory = sqlite3.Row
+            self.pragmas = apply_pragmas(conn, pragmas)
+            conn.execute("PRAGMA query_only = ON")
+            conn.create_function("py_lower", 1, _py_lower, deterministic=True)
+        except Exception:
+            conn.close()
+            raise
+        self.conn = conn
+
+    def table_version(self, table: str) -> int:
+        return self.table_versions.get(table, 0)
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,210 @@
+import inspect
+import json
+import sqlite3
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from functools import wraps
+
+# obere Grenzen der Histogramm-Klassen in ms (letzte Klasse: alles darüber)
+HISTOGRAM_BOUNDS_MS = (1, 5, 10, 50, 100, 500, 1000)
+# Dauer der letzten N Aufrufe je Methode für p50/p95
+ROLLING_WINDOW = 500
+SLOW_LOG_SIZE = 200
+# höchstens so viele SQL-Anweisungen je Aufruf merken (executemany, Schleifen)
+MAX_STATEMENTS_PER_CALL = 50
+
+# nicht messen: Hilfsmethoden, die selbst ständig aufgerufen werden bzw. von hier benutzt werden
+_SKIP_METHODS = {"table_version", "explain_query_plan"}
+
+
+class MethodStats:
+    """Laufende Kennzahlen einer Database-Methode."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.statements = 0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.recent: deque[float] = deque(maxlen=ROLLING_WINDOW)
+
+    def add(self, ms: float, rows: int | None, statements: int):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.rows += rows or 0
+        self.statements += statements
+        self.histogram[bisect_left(HISTOGRAM_BOUNDS_MS, ms)] += 1
+        self.recent.append(ms)
+
+    def percentile(self, q: float) -> float:
+        if not self.recent:
+            return 0.0
+        values = sorted(self.recent)
+        return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "p50_ms": round(self.percentile(0.50), 3),
+            "p95_ms": round(self.percentile(0.95), 3),
+            "max_ms": round(self.max_ms, 3),
+            "rows": self.rows,
+            "statements": self.statements,
+            "histogram": {
+                label: n for label, n in zip(
+                    [f"<={b}ms" for b in HISTOGRAM_BOUNDS_MS] + [f">{HISTOGRAM_BOUNDS_MS[-1]}ms"], self.histogram
+                )
+            },
+        }
+
+
+def _row_count(result) -> int | None:
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    if isinstance(result, (sqlite3.Row, dict)):
+        return 1
+    return None
+
+
+class QueryStats:
+    """
+    Opt-in Messung der öffentlichen `Database`-Methoden (Einstellung → Abfrage-Statistik).
+
+    `enable()` legt auf der Instanz Wrapper über alle öffentlichen Methoden
+    (Laufzeit inkl. verschachtelter Aufrufe, zurückgegebene Zeilen) und hängt
+    einen `set_trace_callback` an die Verbindung, der jede SQL-Anweisung der
+    gerade laufenden (innersten) Methode zuordnet. Aufrufe über `slow_ms`
+    landen mit ihren Anweisungen und EXPLAIN QUERY PLAN im Slow-Log.
+
+    Gemessen wird nur die Haupt-Database (Tk-Thread); Jobs des DbWorkers laufen
+    auf einem eigenen `DbReader`.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.enabled = False
+        self.slow_ms = 100.0
+        self._traced_conn: sqlite3.Connection | None = None
+        # je laufendem Aufruf die bisher gesehenen SQL-Anweisungen (innerster zuletzt)
+        self._stack: list[list[str]] = []
+        self._explaining = False
+        self.reset()
+
+    def reset(self):
+        self.methods: dict[str, MethodStats] = {}
+        self.slow_log: deque[dict] = deque(maxlen=SLOW_LOG_SIZE)
+        self.since = datetime.now()
+
+    # ---------- an/aus ----------
+    def enable(self, slow_ms: float | None = None):
+        if slow_ms is not None:
+            self.slow_ms = float(slow_ms)
+        if self.enabled:
+            return
+        for name, fn in inspect.getmembers(type(self.db), inspect.isfunction):
+            if name.startswith("_") or name in _SKIP_METHODS:
+                continue
+            setattr(self.db, name, self._wrap(name, fn.__get__(self.db)))
+        self.enabled = True
+        self._attach_trace()
+
+    def disable(self):
+        if not self.enabled:
+            return
+        for name in [n for n, v in vars(self.db).items() if getattr(v, "__query_stats__", False)]:
+            delattr(self.db, name)
+        if self._traced_conn is not None:
+            try:
+                self._traced_conn.set_trace_callback(None)
+            except sqlite3.ProgrammingError:
+                pass  # Verbindung schon geschlossen
+        self._traced_conn = None
+        self._stack.clear()
+        self.enabled = False
+
+    def _attach_trace(self):
+        # connect() ersetzt die Verbindung -> Callback neu setzen
+        conn = self.db.conn
+        if conn is not None and conn is not self._traced_conn:
+            conn.set_trace_callback(self._on_statement)
+            self._traced_conn = conn
+
+    def _on_statement(self, sql: str):
+        # Trigger-Unteranweisungen kommen als "-- ..." und gehören zur auslösenden Anweisung
+        if self._explaining or not self._stack or sql.startswith("--"):
+            return
+        statements = self._stack[-1]
+        if len(statements) < MAX_STATEMENTS_PER_CALL:
+            statements.append(sql)
+
+    def _wrap(self, name: str, method):
+        @wraps(method)
+        def timed(*args, **kwargs):
+            self._attach_trace()
+            statements: list[str] = []
+            self._stack.append(statements)
+            t0 = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                ms = (time.perf_counter() - t0) * 1000
+                self._stack.pop()
+            self._attach_trace()
+            rows = _row_count(result)
+            stats = self.methods.get(name)
+            if stats is None:
+                stats = self.methods[name] = MethodStats()
+            stats.add(ms, rows, len(statements))
+            if ms >= self.slow_ms:
+                self._log_slow(name, ms, rows, statements)
+            return result
+
+        timed.__query_stats__ = True
+        return timed
+
+    def _log_slow(self, name: str, ms: float, rows: int | None, statements: list[str]):
+        entries = []
+        for sql in dict.fromkeys(statements):  # Reihenfolge behalten, Wiederholungen (executemany) nur einmal
+            entries.append({"sql": sql, "plan": self._explain(sql)})
+        self.slow_log.append({
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "method": name,
+            "ms": round(ms, 3),
+            "rows": rows,
+            "statements": entries,
+        })
+
+    def _explain(self, sql: str) -> list[str]:
+        head = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+        if head not in ("SELECT", "WITH") or self.db.conn is None:
+            return []
+        self._explaining = True
+        try:
+            return [row[3] for row in self.db.conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()]
+        except sqlite3.Error as ex:
+            return [f"(EXPLAIN nicht möglich: {ex})"]
+        finally:
+            self._explaining = False
+
+    # ---------- Auswertung ----------
+    def summary(self) -> list[tuple[str, MethodStats]]:
+        """(Methode, Kennzahlen), teuerste Gesamtzeit zuerst."""
+        return sorted(self.methods.items(), key=lambda item: item[1].total_ms, reverse=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "since": self.since.isoformat(timespec="seconds"),
+            "exported": datetime.now().isoformat(timespec="seconds"),
+            "slow_ms": self.slow_ms,
+            "methods": {name: stats.to_dict() for name, stats in self.summary()},
+            "slow_queries": list(self.slow_log),
+        }
+
+    def export_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
@@ -0,0 +1,37 @@
+import re
+import sqlite3
+
+from settings.constants import DB_PRAGMAS_DEFAULT
+
+# Reihenfolge beim Setzen: busy_timeout zuerst, damit journal_mode auf eine
+# kurz gesperrte Datei warten kann
+PRAGMA_ORDER = ("busy_timeout", "journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store")
+
+_VALUE_RE = re.compile(r"^-?[A-Za-z0-9_]+$")
+
+
+def apply_pragmas(conn: sqlite3.Connection, pragmas: dict | None) -> dict:
+    """
+    Setzt die PRAGMAs aus `pragmas` (Name -> Wert) auf der Verbindung und gibt die
+    tatsächlich aktiven Werte zurück (z.B. bleibt journal_mode bei :memory: "memory").
+    Nur Namen aus PRAGMA_ORDER sind erlaubt. None = DB_PRAGMAS_DEFAULT, {} = nichts setzen.
+    """
+    if pragmas is None:
+        pragmas = DB_PRAGMAS_DEFAULT
+    if not pragmas:
+        return {}
+    unknown = set(pragmas) - set(PRAGMA_ORDER)
+    if unknown:
+        raise ValueError(f"Ungültige PRAGMAs: {', '.join(sorted(unknown))}")
+    active = {}
+    for name in PRAGMA_ORDER:
+        value = pragmas.get(name)
+        if value in (None, ""):
+            continue
+        value = str(value).strip()
+        if not _VALUE_RE.match(value):
+            raise ValueError(f"Ungültiger PRAGMA-Wert für {name}: {value!r}")
+        conn.execute(f"PRAGMA {name} = {value}")
+        row = conn.execute(f"PRAGMA {name}").fetchone()
+        active[name] = row[0] if row is not None else None
+    return active
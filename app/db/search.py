@@ -0,0 +1,257 @@
+import sqlite3
+
+# Stand von Schema/Triggern des Suchindex; erhöhen => Neuaufbau beim connect
+SEARCH_INDEX_VERSION = 3
+
+# Bereich -> (Tabelle, Referenzspalte, Schlüsselspalte, Textspalten)
+# Referenz = womit der Datensatz wieder geöffnet wird (ID, id, location);
+# nur stabile Schlüssel, keine implizite rowid (kann sich bei VACUUM ändern)
+SEARCH_SOURCES = {
+    "inventory": ("inventory", "ID", "ID",
+                  ("product_type", "serial_number", "producer", "product_name", "location")),
+    "member": ("member", "ID", "ID", ("first_name", "last_name")),
+    "kleidung": ("kleidung", "id", "type", ("gender", "size", "location")),
+    "location": ("location", "location", "location", ("set_name", "database_soll")),
+}
+
+SEARCH_KIND_LABELS = {
+    "inventory": "Material",
+    "member": "Einsatzkräfte",
+    "kleidung": "Kleidung",
+    "location": "Lagerort",
+}
+
+# Gewichtung für bm25 (als rank von search_fts hinterlegt):
+# Treffer im Schlüssel (ID/Name) zählen mehr als im Text
+_BM25_WEIGHTS = "10.0, 1.0"
+
+# kürzere Wörter kann der trigram-Index nicht suchen
+MIN_WORD_LENGTH = 3
+
+# breite Suchen (mehr Treffer als das) ranken nur die ersten SEARCH_RANK_LIMIT Treffer;
+# bm25 über alle ~100k Zeilen kostet sonst mehrere 100 ms je Tastendruck
+SEARCH_RANK_LIMIT = 5000
+
+
+def _ref_expr(ref_col: str, prefix: str) -> str:
+    return f"CAST({prefix}{ref_col} AS TEXT)"
+
+
+def _key_expr(key_col: str, prefix: str) -> str:
+    return f"COALESCE(CAST({prefix}{key_col} AS TEXT), '')"
+
+
+def _text_expr(text_cols, prefix: str) -> str:
+    return " || ' ' || ".join(f"COALESCE(CAST({prefix}{c} AS TEXT), '')" for c in text_cols)
+
+
+def _like_pattern(needle: str) -> str:
+    escaped = needle.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def fts5_trigram_available(conn: sqlite3.Connection) -> bool:
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.search_probe USING fts5(x, tokenize='trigram')")
+        conn.execute("DROP TABLE temp.search_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+class SearchIndex:
+    """
+    Globale Volltextsuche über Material, Einsatzkräfte, Kleidung und Lagerorte.
+
+    - `search_ref`: (kind, ref) -> id, die id ist zugleich rowid in `search_fts`
+    - `search_fts`: FTS5-Tabelle mit trigram-Tokenizer (Teilstring-Suche ab 3 Zeichen)
+    - Trigger auf den Quelltabellen halten beides bei INSERT/UPDATE/DELETE aktuell;
+      fehlen sie (Tabelle außerhalb der App neu angelegt, z.B. migrate_db.py --replace),
+      legt `ensure()` sie neu an und baut den Index neu auf
+
+    Ohne FTS5/trigram (ältere SQLite-Versionen) wird per LIKE direkt in den
+    Quelltabellen gesucht, Trigger werden dann nicht angelegt.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.available = False
+        # letzte Suche hatte mehr als SEARCH_RANK_LIMIT Treffer (Ranking unvollständig)
+        self.last_broad = False
+
+    # ---------- Schema ----------
+    def ensure(self):
+        conn = self.db.conn
+        assert conn is not None
+        self.available = fts5_trigram_available(conn)
+        if not self.available:
+            return
+        if self.db.get_meta("search_index_version") == str(SEARCH_INDEX_VERSION):
+            if self._missing_triggers(conn):
+                with conn:
+                    for kind in SEARCH_SOURCES:
+                        self._drop_triggers(conn, kind)
+                        self._create_triggers(conn, kind)
+                self.rebuild()
+            return
+        with conn:
+            self._drop(conn)
+            conn.execute("""CREATE TABLE search_ref (
+                id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                ref TEXT NOT NULL,
+                UNIQUE (kind, ref)
+            );""")
+            conn.execute("CREATE VIRTUAL TABLE search_fts USING fts5(key, text, tokenize='trigram')")
+            conn.execute(f"INSERT INTO search_fts (search_fts, rank) VALUES ('rank', 'bm25({_BM25_WEIGHTS})')")
+            for kind in SEARCH_SOURCES:
+                self._create_triggers(conn, kind)
+            self._fill(conn)
+            self.db.set_meta("search_index_version", str(SEARCH_INDEX_VERSION))
+
+    def rebuild(self):
+        """Index aus den Quelltabellen neu füllen (z.B. wenn Trigger fehlten)."""
+        conn = self.db.conn
+        assert conn is not None
+        if not self.available:
+            return
+        with conn:
+            conn.execute("DELETE FROM search_fts")
+            conn.execute("DELETE FROM search_ref")
+            self._fill(conn)
+
+    def _drop(self, conn):
+        for kind in SEARCH_SOURCES:
+            self._drop_triggers(conn, kind)
+        conn.execute("DROP TABLE IF EXISTS search_fts")
+        conn.execute("DROP TABLE IF EXISTS search_ref")
+
+    @staticmethod
+    def _trigger_names() -> list[str]:
+        return [f"search_{kind}_{event}" for kind in SEARCH_SOURCES for event in ("insert", "update", "delete")]
+
+    def _missing_triggers(self, conn) -> list[str]:
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        return [name for name in self._trigger_names() if name not in existing]
+
+    def _drop_triggers(self, conn, kind: str):
+        for event in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER IF EXISTS search_{kind}_{event}")
+
+    def _create_triggers(self, conn, kind: str):
+        table, ref_col, key_col, text_cols = SEARCH_SOURCES[kind]
+
+        def add(prefix):
+            ref = _ref_expr(ref_col, prefix)
+            return f"""
+                INSERT OR IGNORE INTO search_ref (kind, ref) VALUES ('{kind}', {ref});
+                INSERT INTO search_fts (rowid, key, text)
+                    SELECT id, {_key_expr(key_col, prefix)}, {_text_expr(text_cols, prefix)}
+                    FROM search_ref WHERE kind = '{kind}' AND ref = {ref};"""
+
+        def remove(prefix):
+            ref = _ref_expr(ref_col, prefix)
+            return f"""
+                DELETE FROM search_fts WHERE rowid = (SELECT id FROM search_ref WHERE kind = '{kind}' AND ref = {ref});
+                DELETE FROM search_ref WHERE kind = '{kind}' AND ref = {ref};"""
+
+        watched = ", ".join(dict.fromkeys((ref_col, key_col, *text_cols)))
+        conn.execute(f"CREATE TRIGGER search_{kind}_insert AFTER INSERT ON {table} BEGIN {remove('NEW.')} {add('NEW.')} END")
+        conn.execute(f"CREATE TRIGGER search_{kind}_delete AFTER DELETE ON {table} BEGIN {remove('OLD.')} END")
+        conn.execute(
+            f"CREATE TRIGGER search_{kind}_update AFTER UPDATE OF {watched} ON {table} "
+            f"BEGIN {remove('OLD.')} {add('NEW.')} END"
+        )
+
+    def _fill(self, conn):
+        for kind, (table, ref_col, key_col, text_cols) in SEARCH_SOURCES.items():
+            conn.execute(
+                f"INSERT OR IGNORE INTO search_ref (kind, ref) "
+                f"SELECT '{kind}', {_ref_expr(ref_col, '')} FROM {table} WHERE {ref_col} IS NOT NULL"
+            )
+            conn.execute(
+                f"INSERT INTO search_fts (rowid, key, text) "
+                f"SELECT r.id, {_key_expr(key_col, 't.')}, {_text_expr(text_cols, 't.')} "
+                f"FROM {table} t JOIN search_ref r ON r.kind = '{kind}' AND r.ref = {_ref_expr(ref_col, 't.')}"
+            )
+
+    # ---------- Suche ----------
+    def search(self, text: str, limit: int = 50) -> list[dict]:
+        """
+        Treffer zu `text` (alle Wörter müssen als Teilstring vorkommen, ohne Groß-/Kleinschreibung),
+        als dicts mit kind, ref, key, text. Sortiert nach bm25, exakter Schlüssel zuerst.
+        Mit FTS5 schränken Wörter unter MIN_WORD_LENGTH Zeichen nur ein; besteht die
+        Suche nur aus solchen, gibt es keine Treffer (sonst liefe sie über jede Zeile).
+        Bei mehr als SEARCH_RANK_LIMIT Treffern wird nur unter den ersten gerankt
+        (`last_broad` ist dann gesetzt, die Suche sollte eingegrenzt werden).
+        """
+        self.last_broad = False
+        words = text.split()
+        if not words:
+            return []
+        if self.available:
+            return self._search_fts(words, limit)
+        return self._search_like(words, limit)
+
+    def _search_fts(self, words: list[str], limit: int) -> list[dict]:
+        conn = self.db.conn
+        assert conn is not None
+        long_words = [w for w in words if len(w) >= MIN_WORD_LENGTH]
+        short_words = [w for w in words if len(w) < MIN_WORD_LENGTH]
+        if not long_words:
+            return []
+        where = ["search_fts MATCH ?"]
+        params = [" AND ".join('"' + w.replace('"', '""') + '"' for w in long_words)]
+        for w in short_words:
+            where.append("(key LIKE ? ESCAPE '\\' OR text LIKE ? ESCAPE '\\')")
+            params.extend([_like_pattern(w)] * 2)
+        match_sql = " AND ".join(where)
+        # Treffer des MATCH nur bis SEARCH_RANK_LIMIT + 1 zählen (nur Doclist, bricht früh ab)
+        self.last_broad = conn.execute(
+            "SELECT COUNT(*) FROM (SELECT 1 FROM search_fts WHERE search_fts MATCH ? LIMIT ?)",
+            (params[0], SEARCH_RANK_LIMIT + 1),
+        ).fetchone()[0] > SEARCH_RANK_LIMIT
+        if self.last_broad:
+            ranked_sql = f"""
+                SELECT * FROM (
+                    SELECT rowid, key, text, bm25(search_fts, {_BM25_WEIGHTS}) AS score
+                    FROM search_fts
+                    WHERE {match_sql}
+                    LIMIT {SEARCH_RANK_LIMIT}
+                ) ORDER BY score LIMIT ?"""
+        else:
+            # über alle Treffer ranken (rank = bm25 mit _BM25_WEIGHTS), dann begrenzen
+            ranked_sql = f"""
+                SELECT rowid, key, text, rank AS score
+                FROM search_fts
+                WHERE {match_sql}
+                ORDER BY rank
+                LIMIT ?"""
+        # der exakte Schlüssel steht mit Gewicht 10 ohnehin oben und wird nur noch vorgezogen
+        cur = conn.execute(
+            f"""
+            SELECT r.kind, r.ref, f.key, f.text, f.score
+            FROM ({ranked_sql}) f JOIN search_ref r ON r.id = f.rowid
+            ORDER BY (lower(f.key) = ?) DESC, f.score, f.key
+            """,
+            (*params, limit, " ".join(words).lower()),
+        )
+        return [dict(row) for row in cur.fetchall()]
+
+    def _search_like(self, words: list[str], limit: int) -> list[dict]:
+        conn = self.db.conn
+        assert conn is not None
+        parts, params = [], []
+        for kind, (table, ref_col, key_col, text_cols) in SEARCH_SOURCES.items():
+            key, body = _key_expr(key_col, ""), _text_expr(text_cols, "")
+            conds = " AND ".join([f"py_lower({key} || ' ' || {body}) LIKE ? ESCAPE '\\'"] * len(words))
+            parts.append(
+                f"SELECT '{kind}' AS kind, {_ref_expr(ref_col, '')} AS ref, {key} AS key, {body} AS text, 0 AS score "
+                f"FROM {table} WHERE {conds}"
+            )
+            params.extend(_like_pattern(w) for w in words)
+        cur = conn.execute(
+            f"SELECT * FROM ({' UNION ALL '.join(parts)}) ORDER BY (lower(key) = ?) DESC, key LIMIT ?",
+            (*params, " ".join(words).lower(), limit),
+        )
+        return [dict(row) for row in cur.fetchall()]
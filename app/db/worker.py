@@ -0,0 +1,180 @@
+import queue
+import threading
+from typing import Callable, Hashable
+
+from app.core.lag_monitor import track
+
+# Abfrageintervall der Ergebnis-Queue, solange Jobs offen sind
+POLL_MS = 30
+
+
+class DbJob:
+    """Ein Auftrag an den DbWorker. `cancel()` verwirft ihn bzw. sein Ergebnis."""
+
+    def __init__(self, fn: Callable, args: tuple, on_done, on_error, key):
+        self.fn = fn
+        self.args = args
+        self.on_done = on_done
+        self.on_error = on_error
+        self.key = key
+        self.cancelled = False
+        self.finished = False
+        # Schreibzähler der Haupt-Database beim Einreichen (für versionierte Caches im Worker)
+        self.table_versions: dict[str, int] = {}
+
+    def cancel(self):
+        self.cancelled = True
+
+    @property
+    def active(self) -> bool:
+        """Noch nicht ausgeliefert und nicht abgebrochen."""
+        return not (self.cancelled or self.finished)
+
+
+class DbWorker:
+    """
+    Hintergrund-Thread mit eigener (Lese-)Verbindung zur selben Datei.
+
+    Jobs `fn(reader_db, *args)` laufen im Worker-Thread, `reader_db` ist eine
+    `DbReader` (nur Abfragemethoden, eigene Verbindung). Kommt die
+    Verbindung nicht zustande, bekommt jeder Job den Fehler an `on_error`.
+    Ergebnisse werden im Tk-Thread per `after()`-Polling an `on_done`/`on_error`
+    geliefert. Ein neuer Job mit gleichem `key` bricht den vorherigen ab
+    (z.B. überholte Filter-Aktualisierung).
+
+    Ohne laufenden Thread oder ohne `attach` (Skripte, :memory:) laufen Jobs
+    sofort synchron auf der Haupt-Database.
+    """
+
+    def __init__(self, owner):
+        self.owner = owner
+        self._widget = None
+        self._thread: threading.Thread | None = None
+        self._jobs: queue.Queue = queue.Queue()
+        self._results: queue.Queue = queue.Queue()
+        self._latest_by_key: dict[Hashable, DbJob] = {}
+        self._pending: set[DbJob] = set()
+        self._polling = False
+
+    def attach(self, widget):
+        """Tk-Widget, über dessen `after()` die Ergebnisse ausgeliefert werden."""
+        self._widget = widget
+
+    @property
+    def available(self) -> bool:
+        return self._widget is not None and self._thread is not None and self._thread.is_alive()
+
+    # ---------- Thread ----------
+    def start(self, path: str, pragmas: dict | None = None):
+        """(Neu-)Start für die Datei `path`; offene Jobs der alten Verbindung werden verworfen."""
+        self.stop()
+        if path == ":memory:":
+            return
+        self._jobs = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, args=(path, dict(pragmas or {}), self._jobs), name="db-worker", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        # Ergebnisse laufender Jobs gehören zur alten Verbindung -> verwerfen
+        for job in self._pending:
+            job.cancel()
+        self._pending.clear()
+        self._latest_by_key.clear()
+        if self._thread is not None:
+            self._jobs.put(None)
+            self._thread = None
+
+    def _run(self, path: str, pragmas: dict, jobs: queue.Queue):
+        from app.db.database import DbReader
+
+        reader, failure = None, None
+        try:
+            reader = DbReader(path, pragmas)
+        except Exception as ex:
+            # Thread läuft weiter und beantwortet offene wie spätere Jobs mit dem Fehler
+            failure = ex
+        try:
+            while True:
+                job = jobs.get()
+                if job is None:
+                    break
+                if job.cancelled:
+                    self._results.put((job, None, None))
+                    continue
+                if reader is None:
+                    self._results.put((job, None, failure))
+                    continue
+                reader.table_versions = job.table_versions
+                try:
+                    self._results.put((job, job.fn(reader, *job.args), None))
+                except Exception as ex:
+                    self._results.put((job, None, ex))
+        finally:
+            if reader is not None:
+                reader.close()
+
+    # ---------- Tk-Seite ----------
+    def submit(
+        self,
+        fn: Callable,
+        *args,
+        on_done: Callable | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+        key: Hashable | None = None,
+    ) -> DbJob:
+        job = DbJob(fn, args, on_done, on_error, key)
+        if key is not None:
+            previous = self._latest_by_key.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._latest_by_key[key] = job
+
+        if not self.available:
+            try:
+                result = fn(self.owner, *args)
+            except Exception as ex:
+                self._deliver(job, None, ex)
+            else:
+                self._deliver(job, result, None)
+            return job
+
+        job.table_versions = dict(self.owner._table_versions)
+        self._pending.add(job)
+        self._jobs.put(job)
+        if not self._polling:
+            self._polling = True
+            self._widget.after(POLL_MS, self._poll)
+        return job
+
+    def _poll(self):
+        while True:
+            try:
+                job, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(job)
+            self._deliver(job, result, error)
+        if self._pending and self._widget is not None:
+            self._widget.after(POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+    def _deliver(self, job: DbJob, result, error):
+        if job.key is not None and self._latest_by_key.get(job.key) is job:
+            del self._latest_by_key[job.key]
+        if job.cancelled:
+            return
+        job.finished = True
+        callback = job.on_error if error is not None else job.on_done
+        with track(f"DB-Ergebnis {getattr(callback, '__qualname__', job.key)}"):
+            if error is not None:
+                if job.on_error is not None:
+                    job.on_error(error)
+                elif self._widget is not None:
+                    self._widget.report_callback_exception(type(error), error, error.__traceback__)
+                else:
+                    raise error
+            elif job.on_done is not None:
+                job.on_done(result)
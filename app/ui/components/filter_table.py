@@ -1,16 +1,67 @@
+import heapq
+import time
 import tkinter as tk
 from tkinter import ttk
 from tkinter import font as tkfont
+from typing import Callable
+
+from app.core.lag_monitor import track
 
 
 class FilterTable(ttk.Frame):
-    def __init__(self, master, columns: list[str], *, bool_columns: set[str] | None = None):
+    """
+    Tabelle mit Filterzeile.
+
+    Die Zeilen werden Python-seitig als (iid, values, tags) gehalten. Im
+    virtuellen Modus (`virtual=True`) legt der Treeview nur die gerade sichtbaren
+    Zeilen (+ `buffer_rows`) an und befüllt sie beim Scrollen neu, der Scrollbalken
+    bezieht sich dann auf die komplette Zeilenliste.
+
+    Tastatureingaben in der Filterzeile lösen `<<FilterChanged>>` erst nach
+    `debounce_ms` Ruhe aus. Verschärft ein neuer Filter nur den zuletzt geladenen
+    (z.B. "Kara" -> "Karab"), werden die vorhandenen Zeilen direkt weiter gefiltert
+    und es gibt gar kein `<<FilterChanged>>`. `timing_hook(event, gesparte_sekunden)`
+    meldet dabei die eingesparte Zeit ("filter_debounced" / "filter_narrowed").
+    """
+
+    # gemessene Textbreiten je Font, geteilt von allen Tabellen
+    _width_cache: dict[str, dict[str, int]] = {}
+    WIDTH_CACHE_SIZE = 20000
+
+    def __init__(
+        self,
+        master,
+        columns: list[str],
+        *,
+        bool_columns: set[str] | None = None,
+        virtual: bool = False,
+        buffer_rows: int = 10,
+        debounce_ms: int = 250,
+        timing_hook: Callable[[str, float], None] | None = None,
+    ):
         super().__init__(master)
         self.columns = columns
         self.bool_columns = bool_columns or set()
         self.filter_vars: dict[str, tk.StringVar] = {}
         self._filter_entries: dict[str, ttk.Entry] = {}
 
+        self.virtual = virtual
+        self.buffer_rows = buffer_rows
+        self._rows: list[tuple[str, list, tuple]] = []
+        self._row_index: dict[str, int] = {}
+        self._offset = 0
+        self._render_pending = False
+        self._rendering = False
+        self._selection: set[str] = set()
+        self._focus_iid = ""
+
+        self.debounce_ms = debounce_ms
+        self.timing_hook = timing_hook
+        self._debounce_id: str | None = None
+        self._debounced_events = 0
+        self._applied_filters: dict | None = None
+        self._last_full_refresh_s = 0.0
+
         style = ttk.Style(self)
 
         # ---------- Fonts ----------
@@ -59,7 +110,7 @@ class FilterTable(ttk.Frame):
             # >>> Feste Breite in ZEICHEN (macht wirklich schmal)
             ent = ttk.Entry(entry_wrap, textvariable=var, style="FilterTable.TEntry", width=8)
             ent.pack(side="left")
-            ent.bind("<KeyRelease>", lambda e: self.event_generate("<<FilterChanged>>"))
+            ent.bind("<KeyRelease>", lambda e: self._schedule_filter_changed())
 
             clear_btn = ttk.Button(
                 entry_wrap,
@@ -86,18 +137,44 @@ class FilterTable(ttk.Frame):
             # Tree kann normal breit sein – Filter bleibt schmal (unabhängig)
             self.tree.column(c, width=120, minwidth=40, stretch=True, anchor=tk.W)
 
-        vsb = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
         hsb = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        if self.virtual:
+            self.vsb = ttk.Scrollbar(self, orient="vertical", command=self._on_vscroll)
+            self.tree.configure(yscrollcommand=self._on_tree_yscroll, xscrollcommand=hsb.set)
+            self.tree.bind("<Configure>", lambda _e: self._schedule_render())
+            self.tree.bind("<MouseWheel>", self._on_mousewheel)
+            self.tree.bind("<Button-4>", lambda _e: self._scroll_rows(-3))
+            self.tree.bind("<Button-5>", lambda _e: self._scroll_rows(3))
+            self.tree.bind("<Prior>", lambda _e: self._scroll_rows(-self._visible_rows()))
+            self.tree.bind("<Next>", lambda _e: self._scroll_rows(self._visible_rows()))
+            self.tree.bind("<Up>", self._on_key_up)
+        else:
+            self.vsb = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+            self.tree.configure(yscrollcommand=self.vsb.set, xscrollcommand=hsb.set)
 
         self.tree.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
-        vsb.pack(fill=tk.Y, side=tk.LEFT)
+        self.vsb.pack(fill=tk.Y, side=tk.LEFT)
         hsb.pack(fill=tk.X)
 
         # >>> WICHTIG: KEIN _sync_filter_widths mehr, keine Binds mehr!
 
-    def autosize_columns(self, *, min_width: int = 20, max_width: int = 500, padding: int = 24):
-        """Passe Spaltenbreiten an Inhalt + Header an."""
+    def autosize_columns(
+        self,
+        *,
+        min_width: int = 20,
+        max_width: int = 500,
+        padding: int = 24,
+        sample_rows: int | None = 5000,
+        longest_candidates: int = 12,
+    ):
+        """
+        Passe Spaltenbreiten an Inhalt + Header an.
+
+        Gemessen wird auf den Python-seitigen Zeilen, nicht im Treeview. Je Spalte
+        werden nur die `longest_candidates` längsten verschiedenen Texte gemessen;
+        bei mehr als `sample_rows` Zeilen nur eine gleichmäßige Stichprobe.
+        Breiten je Text werden über Aufrufe hinweg gecacht (`font.measure` ist ein Tcl-Aufruf).
+        """
         if not self.columns:
             return
 
@@ -105,15 +182,32 @@ class FilterTable(ttk.Frame):
         heading_font_name = ttk.Style(self).lookup("Treeview.Heading", "font")
         heading_font = tkfont.nametofont(heading_font_name) if heading_font_name else measure_font
 
-        for col in self.columns:
-            width = heading_font.measure(str(col)) + padding
-            for item in self.tree.get_children():
-                value = self.tree.set(item, col)
-                width = max(width, measure_font.measure(str(value)) + padding)
+        rows = self._rows
+        if sample_rows is not None and len(rows) > sample_rows:
+            step = len(rows) / sample_rows
+            rows = [rows[int(i * step)] for i in range(sample_rows)]
+
+        for j, col in enumerate(self.columns):
+            width = self._text_width(heading_font, str(col)) + padding
+            texts = {str(values[j]) for _iid, values, _tags in rows if j < len(values)}
+            # Textbreite wächst (fast) mit der Zeichenzahl -> nur die längsten messen
+            for text in heapq.nlargest(longest_candidates, texts, key=len):
+                width = max(width, self._text_width(measure_font, text) + padding)
+                if width >= max_width:
+                    break
 
             width = max(min_width, min(width, max_width))
             self.tree.column(col, width=width)
 
+    def _text_width(self, font: tkfont.Font, text: str) -> int:
+        cache = self._width_cache.setdefault(str(font), {})
+        width = cache.get(text)
+        if width is None:
+            if len(cache) >= self.WIDTH_CACHE_SIZE:
+                cache.clear()
+            width = cache[text] = font.measure(text)
+        return width
+
     def _on_filter_change(self, var: tk.StringVar, clear_btn: ttk.Button):
         if var.get().strip():
             clear_btn.state(["!disabled"])
@@ -125,17 +219,287 @@ class FilterTable(ttk.Frame):
             return
         var.set("")
         entry.focus_set()
-        self.event_generate("<<FilterChanged>>")
+        self._fire_filter_changed()
+
+    # ---------- Filter-Events (Debounce + Eingrenzen) ----------
+    def _schedule_filter_changed(self):
+        if self._debounce_id is not None:
+            self.after_cancel(self._debounce_id)
+            self._debounced_events += 1
+        if self.debounce_ms <= 0:
+            self._fire_filter_changed()
+            return
+        self._debounce_id = self.after(self.debounce_ms, self._fire_filter_changed)
+
+    def _fire_filter_changed(self):
+        if self._debounce_id is not None:
+            self.after_cancel(self._debounce_id)
+            self._debounce_id = None
+        if self._debounced_events:
+            self._report_timing("filter_debounced", self._debounced_events * self._last_full_refresh_s)
+            self._debounced_events = 0
+
+        filters = self.get_filters()
+        t0 = time.perf_counter()
+        # Hänger beim Filtern dem Tab zuordnen (LagMonitor)
+        with track(f"<<FilterChanged>> {type(self.master).__name__}"):
+            if self._narrow_rows(filters):
+                elapsed = time.perf_counter() - t0
+                self._report_timing("filter_narrowed", max(0.0, self._last_full_refresh_s - elapsed))
+                return
+            self.event_generate("<<FilterChanged>>")
+        self._last_full_refresh_s = time.perf_counter() - t0
+
+    def _report_timing(self, event: str, saved_s: float):
+        if self.timing_hook is not None:
+            self.timing_hook(event, saved_s)
+
+    def _narrow_rows(self, filters: dict) -> bool:
+        """
+        Grenzt die geladenen Zeilen weiter ein, wenn jeder bisherige Filter-Text
+        im neuen Filter derselben Spalte enthalten ist. False = neu laden nötig.
+        """
+        previous = self._applied_filters
+        if previous is None:
+            return False
+        for col, needle in previous.items():
+            new_needle = filters.get(col)
+            if new_needle is None or needle.lower() not in new_needle.lower():
+                return False
+        if filters == previous:
+            return True
+
+        checks = [(self.columns.index(col), needle.lower()) for col, needle in filters.items()]
+        kept, removed = [], []
+        for row in self._rows:
+            values = row[1]
+            if all(needle in str(values[j]).lower() for j, needle in checks):
+                kept.append(row)
+            else:
+                removed.append(row[0])
+
+        self._rows = kept
+        self._row_index = {iid: idx for idx, (iid, _values, _tags) in enumerate(kept)}
+        self._applied_filters = dict(filters)
+        self._selection.difference_update(removed)
+        if self.virtual:
+            self._render()
+        else:
+            stale = [iid for iid in removed if self.tree.exists(iid)]
+            if stale:
+                self.tree.delete(*stale)
+        return True
 
     def get_filters(self) -> dict:
         return {k: v.get().strip() for k, v in self.filter_vars.items() if v.get().strip()}
 
+    # ---------- Zeilenquelle ----------
     def clear(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        self._applied_filters = None
+        self._rows = []
+        self._row_index = {}
+        self._offset = 0
+        self._selection.clear()
+        self._focus_iid = ""
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        if self.virtual:
+            self._update_scrollbar()
+
+    def set_rows(self, rows, *, applied_filters: dict | None = None):
+        """
+        Ersetzt alle Zeilen. rows: Iterable von (iid, values, tags); iid darf None sein.
+        applied_filters: die Filter, mit denen rows geladen wurden (erlaubt späteres Eingrenzen).
+        """
+        self.clear()
+        row_list, row_index = self._rows, self._row_index
+        for iid, values, tags in rows:
+            key = str(iid) if iid not in (None, "") else ""
+            if not key or key in row_index:
+                self._append_row(iid, values, tags)
+                continue
+            row_index[key] = len(row_list)
+            row_list.append((key, list(values), tuple(tags or ())))
+        self._applied_filters = dict(applied_filters) if applied_filters is not None else None
+        if self.virtual:
+            self._render()
+        else:
+            for iid, values, tags in self._rows:
+                self.tree.insert("", tk.END, iid=iid, values=values, tags=tags)
+
+    def insert_row(self, values: list, *, tags=(), iid=None):
+        iid = self._append_row(iid, values, tags)
+        if self.virtual:
+            self._schedule_render()
+            return iid
+        return self.tree.insert("", tk.END, iid=iid, values=values, tags=tags)
+
+    def _append_row(self, iid, values, tags) -> str:
+        if iid in (None, "") or str(iid) in self._row_index:
+            iid = f"#row{len(self._rows)}"
+        iid = str(iid)
+        self._row_index[iid] = len(self._rows)
+        self._rows.append((iid, list(values), tuple(tags or ())))
+        return iid
 
-    def insert_row(self, values: list, *, tags=()):
-        return self.tree.insert("", tk.END, values=values, tags=tags)
+    def upsert_row(self, iid: str, values: list, *, tags=()):
+        """Ersetzt die Zeile `iid` an Ort und Stelle oder hängt sie hinten an."""
+        iid = str(iid)
+        idx = self._row_index.get(iid)
+        if idx is None:
+            self.insert_row(values, tags=tags, iid=iid)
+            return
+        self._rows[idx] = (iid, list(values), tuple(tags or ()))
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=values, tags=tags)
+
+    def remove_row(self, iid: str):
+        iid = str(iid)
+        idx = self._row_index.pop(iid, None)
+        if idx is None:
+            return
+        del self._rows[idx]
+        for pos in range(idx, len(self._rows)):
+            self._row_index[self._rows[pos][0]] = pos
+        self._selection.discard(iid)
+        if self._focus_iid == iid:
+            self._focus_iid = ""
+        if self.tree.exists(iid):
+            self.tree.delete(iid)
+        if self.virtual:
+            # Fenster nachfüllen / Scrollbalken anpassen
+            self._schedule_render()
+
+    @property
+    def row_count(self) -> int:
+        return len(self._rows)
+
+    def get_row(self, iid: str) -> tuple[str, list, tuple] | None:
+        idx = self._row_index.get(str(iid))
+        return self._rows[idx] if idx is not None else None
+
+    # ---------- Virtueller Modus ----------
+    def _visible_rows(self) -> int:
+        style = ttk.Style(self)
+        try:
+            row_height = int(style.lookup("Treeview", "rowheight") or 0)
+        except (TypeError, ValueError):
+            row_height = 0
+        if row_height <= 0:
+            row_height = tkfont.nametofont("TkDefaultFont").metrics("linespace") + 3
+        height = self.tree.winfo_height()
+        if height <= 1:
+            height = int(self.tree.cget("height") or 10) * row_height
+        # Kopfzeile abziehen
+        return max(1, (height - row_height) // row_height)
+
+    def _max_offset(self) -> int:
+        return max(0, len(self._rows) - self._visible_rows())
+
+    def _schedule_render(self):
+        if self._render_pending:
+            return
+        self._render_pending = True
+        self.after_idle(self._render)
+
+    def _render(self):
+        """Befüllt den Treeview mit dem sichtbaren Fenster ab self._offset."""
+        self._render_pending = False
+        if not self.virtual or self._rendering:
+            return
+        self._rendering = True
+        try:
+            shown = self.tree.get_children()
+            if shown:
+                # Auswahl/Fokus der bisher sichtbaren Zeilen übernehmen
+                self._selection.difference_update(shown)
+                self._selection.update(self.tree.selection())
+                self._focus_iid = self.tree.focus() or self._focus_iid
+                self.tree.delete(*shown)
+
+            self._offset = max(0, min(self._offset, self._max_offset()))
+            end = min(len(self._rows), self._offset + self._visible_rows() + self.buffer_rows)
+            for iid, values, tags in self._rows[self._offset:end]:
+                self.tree.insert("", tk.END, iid=iid, values=values, tags=tags)
+
+            visible_selection = [iid for iid in self._selection if self.tree.exists(iid)]
+            if visible_selection:
+                self.tree.selection_set(visible_selection)
+            if self._focus_iid and self.tree.exists(self._focus_iid):
+                self.tree.focus(self._focus_iid)
+            self.tree.yview_moveto(0)
+        finally:
+            self._rendering = False
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        total = len(self._rows)
+        if not total:
+            self.vsb.set(0.0, 1.0)
+            return
+        first = self._offset / total
+        last = min(1.0, (self._offset + self._visible_rows()) / total)
+        self.vsb.set(first, last)
+
+    def _scroll_rows(self, delta: int):
+        new_offset = max(0, min(self._offset + delta, self._max_offset()))
+        if new_offset != self._offset:
+            self._offset = new_offset
+            self._render()
+        return "break"
+
+    def _on_vscroll(self, *args):
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._offset = int(float(args[1]) * len(self._rows))
+            self._render()
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                step *= self._visible_rows()
+            self._scroll_rows(step)
+
+    def _on_mousewheel(self, event):
+        delta = event.delta
+        if abs(delta) >= 120:
+            delta //= 40
+        return self._scroll_rows(-delta if delta else 0)
+
+    def _on_key_up(self, _event):
+        # Pfeil hoch auf der obersten angelegten Zeile: Fenster eine Zeile zurück
+        children = self.tree.get_children()
+        if not children or self.tree.focus() != children[0] or self._offset == 0:
+            return None
+        prev_iid = self._rows[self._offset - 1][0]
+        self._scroll_rows(-1)
+        self.tree.focus(prev_iid)
+        self.tree.selection_set(prev_iid)
+        return "break"
+
+    def _on_tree_yscroll(self, first, _last):
+        # Treeview scrollt intern (z.B. Pfeiltasten/see()): als Fensterverschiebung übernehmen
+        if self._rendering:
+            return
+        shown = len(self.tree.get_children())
+        shift = round(float(first) * shown)
+        if shift > 0:
+            self._offset += shift
+            self._render()
+
+    def see_row(self, iid: str):
+        """Scrollt (auch im virtuellen Modus) zur Zeile und fokussiert sie."""
+        idx = self._row_index.get(str(iid))
+        if idx is None:
+            return
+        if self.virtual and not (self._offset <= idx < self._offset + self._visible_rows()):
+            self._offset = max(0, idx - self._visible_rows() // 2)
+            self._render()
+        if self.tree.exists(iid):
+            self.tree.see(iid)
+            self.tree.focus(iid)
+            self.tree.selection_set(iid)
 
     def add_tag_style(self, tag: str, **kw):
         self.tree.tag_configure(tag, **kw)
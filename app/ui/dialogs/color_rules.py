@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, colorchooser
 from app.core.utils import random_hex_color
+from app.core.lag_monitor import tracked
 
 class ColorRulesDialog(tk.Toplevel):
     def __init__(self, master, settings, on_save=None):
@@ -73,6 +74,7 @@ class ColorRulesDialog(tk.Toplevel):
         del self.settings.color_rules[idx]
         self.load_rules()
 
+    @tracked()
     def save(self):
         self.settings.save()
         if self.on_save:
@@ -1,37 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from settings.constants import INVENTORY_COLUMNS, ID_LIST_FILE
-from app.core.utils import today_str, parse_date, delete_file, append_line, generate_next_valid_id_item
-
-
-def _build_member_name_map(db) -> dict[str, str]:
-    member_name_by_id: dict[str, str] = {}
-    for member in db.get_members_basic():
-        first_name = (member.get("first_name") or "").strip()
-        last_name = (member.get("last_name") or "").strip()
-        full_name = f"{first_name} {last_name}".strip()
-        if not full_name:
-            continue
-
-        member_id = str(member.get("ID") or "").strip()
-        if not member_id:
-            continue
-
-        member_name_by_id[member_id] = full_name
-        if member_id.startswith("/"):
-            member_name_by_id[member_id[1:]] = full_name
-        else:
-            member_name_by_id[f"/{member_id}"] = full_name
-    return member_name_by_id
-
-
-def _format_location_option(location: str, member_name_by_id: dict[str, str]) -> str:
-    location_str = str(location).strip()
-    if location_str.startswith("/NR"):
-        member_name = member_name_by_id.get(location_str) or member_name_by_id.get(location_str[1:])
-        if member_name:
-            return f"{location_str} ({member_name})"
-    return location_str
+from app.core.utils import today_str, parse_date, delete_file, append_lines
+from app.core.id_allocator import IdAllocator
+from app.core.lag_monitor import tracked
 
 
 def _location_value_from_display(value: str) -> str:
@@ -41,15 +13,15 @@ def _location_value_from_display(value: str) -> str:
     return cleaned
 
 
-def _build_location_dropdown_options(db, member_name_by_id: dict[str, str]) -> list[str]:
+def _build_location_dropdown_options(db) -> list[str]:
     options: list[str] = []
 
-    for member in db.get_members_basic():
+    for member in db.member_names.members():
         member_id = str(member.get("ID") or "").strip()
         if not member_id:
             continue
         normalized_member_id = member_id if member_id.startswith("/") else f"/{member_id}"
-        options.append(_format_location_option(normalized_member_id, member_name_by_id))
+        options.append(db.member_names.format_location(normalized_member_id))
 
     for row in db.fetch_location_rows():
         location = str(row["location"] or "").strip()
@@ -74,7 +46,6 @@ class AddInventoryDialog(tk.Toplevel):
         self.title("Material hinzufügen")
         self.db = db
         self.on_saved = on_saved
-        self.member_name_by_id = _build_member_name_map(db)
         self.geometry("720x520")
         self.transient(master)
         self.grab_set()
@@ -91,7 +62,7 @@ class AddInventoryDialog(tk.Toplevel):
             dd = ttk.Combobox(form, state="normal")
             try:
                 if col == "location":
-                    dd_values = _build_location_dropdown_options(self.db, self.member_name_by_id)
+                    dd_values = _build_location_dropdown_options(self.db)
                 else:
                     dd_values = self.db.get_distinct_values("inventory", col)
                 dd["values"] = [""] + dd_values
@@ -141,8 +112,7 @@ class AddInventoryDialog(tk.Toplevel):
         if not isinstance(location_input, ttk.Combobox):
             return
         current_value = location_input.get()
-        self.member_name_by_id = _build_member_name_map(self.db)
-        values = _build_location_dropdown_options(self.db, self.member_name_by_id)
+        values = _build_location_dropdown_options(self.db)
         location_input["values"] = [""] + values
         if current_value:
             location_input.set(current_value)
@@ -159,6 +129,7 @@ class AddInventoryDialog(tk.Toplevel):
             return _location_value_from_display(selected)
         return selected
 
+    @tracked()
     def save(self):
         for col in ("manufactury_date", "check_date"):
             val = self.resolve_value(col)
@@ -179,25 +150,23 @@ class AddInventoryDialog(tk.Toplevel):
 
         try:
             delete_file(ID_LIST_FILE)
-            for _ in range(count):
-                rec = {}
-                for col, _ in INVENTORY_COLUMNS:
-                    if col == "ID":
-                        old_list = self.db.get_inventory_ids()
-                        rec[col] = generate_next_valid_id_item(old_list)
-                        append_line(ID_LIST_FILE, rec[col])
-                    elif col == "psa_check":
-                        rec[col] = 1 if self.inputs[col]["var"].get() else 0
-                    else:
-                        rec[col] = self.resolve_value(col)
-                self.db.insert_inventory(rec)
-            self.db.commit()
+            template = {}
+            for col, _ in INVENTORY_COLUMNS:
+                if col == "ID":
+                    continue
+                elif col == "psa_check":
+                    template[col] = 1 if self.inputs[col]["var"].get() else 0
+                else:
+                    template[col] = self.resolve_value(col)
+            new_ids = IdAllocator.for_items(self.db.get_inventory_ids()).allocate(count)
+            self.db.insert_inventory_many([{**template, "ID": new_id} for new_id in new_ids])
+            append_lines(ID_LIST_FILE, new_ids)
         except Exception as ex:
             messagebox.showerror("Fehler", f"Beim Speichern ist ein Fehler aufgetreten: {ex}")
             return
 
         if self.on_saved:
-            self.on_saved()
+            self.on_saved(changed_ids=new_ids)
         self.destroy()
 
 class EditInventoryDialog(tk.Toplevel):
@@ -207,7 +176,6 @@ class EditInventoryDialog(tk.Toplevel):
         self.db = db
         self.rec_id = record.get("ID")
         self.on_saved = on_saved
-        self.member_name_by_id = _build_member_name_map(db)
         self.geometry("720x520")
         self.transient(master)
         self.grab_set()
@@ -225,7 +193,7 @@ class EditInventoryDialog(tk.Toplevel):
             dd = ttk.Combobox(form, state="normal")
             try:
                 if col == "location":
-                    dd_values = _build_location_dropdown_options(self.db, self.member_name_by_id)
+                    dd_values = _build_location_dropdown_options(self.db)
                 else:
                     dd_values = self.db.get_distinct_values("inventory", col)
                 dd["values"] = [""] + dd_values
@@ -236,7 +204,7 @@ class EditInventoryDialog(tk.Toplevel):
                 ttk.Button(form, text="Lagerort hinzufügen", command=self.open_location_dialog).grid(row=row, column=3, padx=4)
             current_val = record.get(col) if record.get(col) is not None else ""
             if col == "location":
-                current_val = _format_location_option(str(current_val), self.member_name_by_id)
+                current_val = self.db.member_names.format_location(current_val)
             dd.insert(0, str(current_val))
 
             self.inputs[col] = dd
@@ -269,8 +237,7 @@ class EditInventoryDialog(tk.Toplevel):
         if not isinstance(location_input, ttk.Combobox):
             return
         current_value = location_input.get()
-        self.member_name_by_id = _build_member_name_map(self.db)
-        values = _build_location_dropdown_options(self.db, self.member_name_by_id)
+        values = _build_location_dropdown_options(self.db)
         location_input["values"] = [""] + values
         if current_value:
             location_input.set(current_value)
@@ -287,6 +254,7 @@ class EditInventoryDialog(tk.Toplevel):
             return _location_value_from_display(selected)
         return selected
 
+    @tracked()
     def save(self):
         for col in ("manufactury_date", "check_date"):
             val = self.resolve_value(col)
@@ -314,18 +282,22 @@ class EditInventoryDialog(tk.Toplevel):
             messagebox.showerror("Fehler", f"Beim Speichern ist ein Fehler aufgetreten: {ex}")
             return
         if self.on_saved:
-            self.on_saved()
-            if hasattr(self.master.master.master, "status_var"):
-                self.master.master.master.status_var.set(f"Material (ID: {self.rec_id}) bearbeitet")
+            self.on_saved(changed_ids=[self.rec_id])
+            self._set_status(f"Material (ID: {self.rec_id}) bearbeitet")
         self.destroy()
 
+    def _set_status(self, text: str):
+        # Dialog kommt vom Material-Tab oder direkt von der App (Suche)
+        status_var = getattr(self.master.winfo_toplevel(), "status_var", None)
+        if status_var is not None:
+            status_var.set(text)
+
     def delete(self):
         answer = messagebox.askokcancel("Warnung", "Wirklich den Eintrag löschen?")
         if answer:
             self.db.delete_inventory(self.rec_id)
             self.db.commit()
             if self.on_saved:
-                self.on_saved()
-            if hasattr(self.master.master.master, "status_var"):
-                self.master.master.master.status_var.set(f"Material (ID: {self.rec_id}) gelöscht")
+                self.on_saved(removed_ids=[self.rec_id])
+            self._set_status(f"Material (ID: {self.rec_id}) gelöscht")
         self.destroy()
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 from settings.constants import KLEIDUNG_COLUMNS
+from app.core.lag_monitor import tracked
 
 
 class AddKleidungDialog(tk.Toplevel):
@@ -31,6 +32,7 @@ class AddKleidungDialog(tk.Toplevel):
         ttk.Button(btns, text="Speichern", command=self.save).pack(side=tk.RIGHT, padx=6)
         ttk.Button(btns, text="Abbrechen", command=self.destroy).pack(side=tk.RIGHT)
 
+    @tracked()
     def save(self):
         rec = {c: self.inputs[c].get().strip() for c, _ in KLEIDUNG_COLUMNS}
         if not rec["type"]:
@@ -77,6 +79,7 @@ class EditKleidungDialog(tk.Toplevel):
         ttk.Button(btns, text="Löschen", command=self.delete).pack(side=tk.RIGHT, padx=6)
         ttk.Button(btns, text="Speichern", command=self.save).pack(side=tk.RIGHT, padx=6)
 
+    @tracked()
     def save(self):
         rec = {c: self.inputs[c].get().strip() for c, _ in KLEIDUNG_COLUMNS}
         if not rec["type"]:
@@ -1,5 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
+from app.core.lag_monitor import tracked
 
 
 class LocationManageDialog(tk.Toplevel):
@@ -90,6 +91,7 @@ class LocationManageDialog(tk.Toplevel):
             db_soll = db_soll[len(self.PREFIX):]
         self.database_var.set(db_soll)
 
+    @tracked()
     def _save(self):
         location = self.location_var.get().strip()
         set_name = self.set_name_var.get().strip().lstrip("/")
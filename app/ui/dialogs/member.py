@@ -1,7 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from settings.constants import MEMBER_COLUMNS
-from app.core.utils import generate_next_valid_id_member
+from app.core.id_allocator import IdAllocator
+from app.core.lag_monitor import tracked
 
 class AddMemberDialog(tk.Toplevel):
     BOOL_COLS = {"ET_SO", "ET_WI", "PR_SO", "PR_WI", "NFM", "LR", "EL"}
@@ -51,6 +52,7 @@ class AddMemberDialog(tk.Toplevel):
         except Exception:
             return []
 
+    @tracked()
     def save(self):
         first = self.e_first.get().strip()
         last = self.e_last.get().strip()
@@ -59,8 +61,7 @@ class AddMemberDialog(tk.Toplevel):
             return
         try:
             rec = {c: None for c, _ in MEMBER_COLUMNS}
-            old_list = self.db.get_member_ids()
-            rec["ID"] = generate_next_valid_id_member(old_list)  # Bugfix: eigene Member-ID
+            rec["ID"] = IdAllocator.for_members(self.db.get_member_ids()).allocate(1)[0]  # Bugfix: eigene Member-ID
             rec["first_name"] = first
             rec["last_name"] = last
             for c in self.BOOL_COLS:
@@ -128,6 +129,7 @@ class EditMemberDialog(tk.Toplevel):
         except Exception:
             return []
 
+    @tracked()
     def save(self):
         first = self.e_first.get().strip()
         last = self.e_last.get().strip()
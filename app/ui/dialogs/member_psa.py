@@ -0,0 +1,163 @@
+import os
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from datetime import datetime
+
+from app.core.member_psa import MEMBER_PSA_COLUMNS, compute_member_psa, member_label, member_psa_report_rows
+
+
+class MemberPsaDialog(tk.Toplevel):
+    """
+    PSA Bedarf Einsatzkräfte: psa-Vorgaben je Rolle gegen das Material unter "/NR..".
+    - Je Einsatzkraft eine Gruppe mit Rollen und Summen, darunter die Positionen
+    - Rot = fehlt, Gelb = zu viel
+    - PDF-Export über export_table_to_pdf
+    """
+
+    LINE_COLUMNS = ("product_type", "property_1", "property_2", "soll", "ist", "missing", "surplus")
+
+    def __init__(self, master, db):
+        super().__init__(master)
+        self.title("PSA Bedarf Einsatzkräfte (Soll/Ist)")
+        self.geometry("980x620")
+        self.transient(master)
+        self.grab_set()
+
+        self.db = db
+        self.members: list[dict] = []
+        self.var_only_deviations = tk.BooleanVar(value=True)
+        self.var_summary = tk.StringVar()
+
+        top = ttk.Frame(self)
+        top.pack(fill=tk.X, padx=10, pady=(10, 6))
+        ttk.Checkbutton(
+            top, text="Nur Abweichungen", variable=self.var_only_deviations, command=self._fill_tree
+        ).pack(side=tk.LEFT)
+        ttk.Label(top, textvariable=self.var_summary).pack(side=tk.LEFT, padx=12)
+
+        table_frame = ttk.Frame(self)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=6)
+        self.tree = ttk.Treeview(table_frame, columns=self.LINE_COLUMNS, show="tree headings")
+        self.tree.heading("#0", text="Einsatzkraft")
+        self.tree.column("#0", width=220)
+        headings = {
+            "product_type": ("product_type", 160), "property_1": ("property_1", 130), "property_2": ("property_2", 130),
+            "soll": ("Soll", 60), "ist": ("Ist", 60), "missing": ("Fehlt", 60), "surplus": ("Zuviel", 60),
+        }
+        for col in self.LINE_COLUMNS:
+            text, width = headings[col]
+            self.tree.heading(col, text=text)
+            self.tree.column(col, width=width, anchor="e" if width == 60 else "w")
+        self.tree.tag_configure("missing", background="#FFCCCC")
+        self.tree.tag_configure("surplus", background="#FFEA8D")
+        self.tree.tag_configure("member", font=("Arial", 10, "bold"))
+        y_scroll = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=y_scroll.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+        btns = ttk.Frame(self)
+        btns.pack(fill=tk.X, padx=10, pady=(0, 10))
+        ttk.Button(btns, text="Schließen", command=self.destroy).pack(side=tk.RIGHT)
+        self.btn_pdf = ttk.Button(btns, text="PDF exportieren", command=self._export_pdf)
+        self.btn_pdf.pack(side=tk.RIGHT, padx=6)
+        ttk.Button(btns, text="Aktualisieren", command=self.refresh).pack(side=tk.LEFT)
+
+        self.refresh()
+
+    def refresh(self):
+        self.var_summary.set("Wird berechnet…")
+        self.db.worker.submit(
+            compute_member_psa,
+            on_done=self._on_computed,
+            on_error=self._on_compute_error,
+            key=("member_psa", id(self)),
+        )
+
+    def _on_computed(self, members: list[dict]):
+        if not self.winfo_exists():
+            return
+        self.members = members
+        self._fill_tree()
+
+    def _on_compute_error(self, ex: Exception):
+        if not self.winfo_exists():
+            return
+        messagebox.showerror("Fehler", f"Soll/Ist konnte nicht berechnet werden: {ex}", parent=self)
+        self.members = []
+        self._fill_tree()
+
+    def _fill_tree(self):
+        self.tree.delete(*self.tree.get_children())
+        only_deviations = self.var_only_deviations.get()
+        for member in self.members:
+            parent = self.tree.insert(
+                "", tk.END,
+                text=member_label(member),
+                values=(", ".join(member["roles"]), "", "", member["soll_total"], member["ist_total"],
+                        member["missing_total"] or "", member["surplus_total"] or ""),
+                tags=("member",),
+                open=bool(member["missing_total"] or member["surplus_total"]),
+            )
+            for line in member["lines"]:
+                if only_deviations and not (line["missing"] or line["surplus"]):
+                    continue
+                tags = ("missing",) if line["missing"] else ("surplus",) if line["surplus"] else ()
+                self.tree.insert(
+                    parent, tk.END,
+                    values=(line["product_type"], line["property_1"], line["property_2"], line["soll"], line["ist"],
+                            line["missing"] or "", line["surplus"] or ""),
+                    tags=tags,
+                )
+        missing = sum(m["missing_total"] for m in self.members)
+        surplus = sum(m["surplus_total"] for m in self.members)
+        if self.members:
+            self.var_summary.set(f"{len(self.members)} Einsatzkräfte | fehlt: {missing} | zu viel: {surplus}")
+        else:
+            self.var_summary.set("Keine PSA-Vorgaben oder kein Material bei Einsatzkräften.")
+
+    def _export_pdf(self):
+        rows = member_psa_report_rows(self.members, only_deviations=self.var_only_deviations.get())
+        if not rows:
+            messagebox.showinfo("Hinweis", "Keine Positionen für den Export vorhanden.", parent=self)
+            return
+        os.makedirs("./output", exist_ok=True)
+        ts = datetime.now().strftime("%Y-%m-%d_%H-%M")
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title="PDF speichern unter",
+            initialdir=os.path.abspath("./output"),
+            initialfile=f"psa_bedarf_einsatzkraefte_{ts}.pdf",
+            defaultextension=".pdf",
+            filetypes=[("PDF-Datei", "*.pdf")],
+        )
+        if not path:
+            return
+
+        def build(_reader):
+            from app.core.pdf_export import export_table_to_pdf
+            export_table_to_pdf(
+                pdf_title="PSA Bedarf Einsatzkräfte",
+                columns=MEMBER_PSA_COLUMNS,
+                rows=rows,
+                out_path=path,
+                logo_path="settings/BW_LOGO_mit_NBG_bunt.svg",
+                footer_lines=["Erstellt am:", "Ort/Datum              Unterschrift"],
+            )
+
+        # PDF-Erzeugung im DbWorker, der Dialog bleibt bedienbar
+        self.btn_pdf.state(["disabled"])
+        self.db.worker.submit(
+            build,
+            on_done=lambda _result: self._on_pdf_done(path, None),
+            on_error=lambda ex: self._on_pdf_done(path, ex),
+        )
+
+    def _on_pdf_done(self, path: str, error: Exception | None):
+        if not self.winfo_exists():
+            return
+        self.btn_pdf.state(["!disabled"])
+        if error is not None:
+            messagebox.showerror("Fehler", f"PDF konnte nicht erstellt werden: {error}", parent=self)
+            return
+        messagebox.showinfo("Erfolg", f"PDF gespeichert:\n{path}", parent=self)
@@ -5,8 +5,6 @@ from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
 
 from settings.constants import MEMBER_COLUMNS, INVENTORY_COLUMNS
-from app.core.pdf_export import export_table_to_pdf  # generischer Exporter
-from app.db.database import Database
 
 INVENTORY_EXPORT_COLUMNS = [
     ("ID", "TEXT PRIMARY KEY"),
@@ -76,7 +74,8 @@ class PrintExportDialog(tk.Toplevel):
         btns = ttk.Frame(self)
         btns.pack(fill=tk.X, padx=12, pady=(6, 12))
         ttk.Button(btns, text="Abbrechen", command=self.destroy).pack(side=tk.RIGHT)
-        ttk.Button(btns, text="Speichern", command=self._save_pdf).pack(side=tk.RIGHT, padx=(0, 8))
+        self.btn_save = ttk.Button(btns, text="Speichern", command=self._save_pdf)
+        self.btn_save.pack(side=tk.RIGHT, padx=(0, 8))
 
         # Layout-Feinschliff
         form.columnconfigure(1, weight=1)
@@ -117,7 +116,7 @@ class PrintExportDialog(tk.Toplevel):
             self.path_var.set(path)
 
     def _load_members(self):
-        members = self.db.get_members_basic()  # nutzt jetzt den Wrapper
+        members = self.db.member_names.members()
         self._member_display_to_id = {}
         self._member_list = []
 
@@ -151,15 +150,29 @@ class PrintExportDialog(tk.Toplevel):
             messagebox.showwarning("Fehlender Dateiname", "Bitte einen Zielspeicherort auswählen.")
             return
 
-        try:
-            # Inventar für dieses Mitglied holen: location = member.ID
-            rows = self._fetch_inventory_for_member(member_id)
-            if not rows:
-                if not messagebox.askyesno("Keine Daten", "Für dieses Mitglied wurden keine Gegenstände gefunden.\nLeeres PDF trotzdem erzeugen?"):
-                    return
+        # Daten holen und PDF bauen im DbWorker, der Dialog bleibt bedienbar
+        self.btn_save.state(["disabled"])
+        self.db.worker.submit(
+            # Inventar für dieses Mitglied holen: location = member.ID, nur die PDF-Spalten
+            lambda reader: reader.get_inventory_for_member(member_id, INVENTORY_EXPORT_COLNAMES),
+            on_done=lambda rows: self._on_rows_loaded(display, out_path, rows),
+            on_error=self._on_export_error,
+        )
+
+    def _on_rows_loaded(self, display: str, out_path: str, rows: list[dict]):
+        if not self.winfo_exists():
+            return
+        if not rows:
+            if not messagebox.askyesno("Keine Daten", "Für dieses Mitglied wurden keine Gegenstände gefunden.\nLeeres PDF trotzdem erzeugen?"):
+                self.btn_save.state(["!disabled"])
+                return
+
+        # Nur die gewünschten Spalten in die PDF bringen
+        title = f"Inventarliste für {display}"
 
-            # Nur die gewünschten Spalten in die PDF bringen
-            title = f"Inventarliste für {display}"
+        def build(_reader):
+            # fpdf erst beim ersten Export laden (Startzeit)
+            from app.core.pdf_export import export_table_to_pdf
             export_table_to_pdf(
                 pdf_title=title,
                 columns=INVENTORY_EXPORT_COLUMNS,   # nur die 7 gewünschten Spalten
@@ -178,15 +191,20 @@ class PrintExportDialog(tk.Toplevel):
                 },
             )
 
-            messagebox.showinfo("PDF erstellt", f"Export erfolgreich:\n{out_path}")
-            if self.on_saved:
-                self.on_saved()
-            self.destroy()
-
-        except Exception as e:
-            messagebox.showerror("Fehler beim PDF-Export", str(e))
+        self.db.worker.submit(
+            build,
+            on_done=lambda _result: self._on_export_done(out_path),
+            on_error=self._on_export_error,
+        )
 
-    def _fetch_inventory_for_member(self, member_id: str) -> list[dict]:
-        # holt nur die Spalten, die ins PDF sollen
-        return self.db.get_inventory_for_member(member_id, INVENTORY_EXPORT_COLNAMES)
+    def _on_export_done(self, out_path: str):
+        messagebox.showinfo("PDF erstellt", f"Export erfolgreich:\n{out_path}")
+        if self.on_saved:
+            self.on_saved()
+        if self.winfo_exists():
+            self.destroy()
 
+    def _on_export_error(self, ex: Exception):
+        if self.winfo_exists():
+            self.btn_save.state(["!disabled"])
+        messagebox.showerror("Fehler beim PDF-Export", str(ex))
@@ -2,6 +2,8 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 from app.core.utils import parse_date, today_str
+from app.core.lag_monitor import tracked
+from app.db.database import code_key
 
 
 class DepotPsaCheckDialog(tk.Toplevel):
@@ -24,9 +26,16 @@ class DepotPsaCheckDialog(tk.Toplevel):
         self.var_check_date = tk.StringVar(value=today_str())
 
         self.row_selected: dict[str, bool] = {}
+        # Scan-Modus: code_key(ID/Seriennummer), also klein geschrieben -> Tree-iid der geladenen Zeilen
+        self._item_by_code: dict[str, str] = {}
+        # per Scan gesetzte Häkchen, bleiben über Filterwechsel bis zum Speichern erhalten
+        self.scan_session: dict[str, bool] = {}
+        self.var_scan = tk.StringVar()
+        self.var_scan_status = tk.StringVar(value="Scanner: ID oder Seriennummer scannen, Enter schließt ab.")
 
         self._build_ui()
         self._load_locations()
+        self.entry_scan.focus_set()
 
     def _build_ui(self):
         filters = ttk.LabelFrame(self, text="Filter")
@@ -63,6 +72,15 @@ class DepotPsaCheckDialog(tk.Toplevel):
         self.entry_date.pack(side=tk.LEFT, padx=6)
         ttk.Button(date_frame, text="Heute", command=lambda: self.var_check_date.set(today_str())).pack(side=tk.LEFT)
 
+        scan_frame = ttk.Frame(self)
+        scan_frame.pack(fill=tk.X, padx=10, pady=(0, 6))
+        ttk.Label(scan_frame, text="Scan").pack(side=tk.LEFT)
+        self.entry_scan = ttk.Entry(scan_frame, textvariable=self.var_scan, width=30)
+        self.entry_scan.pack(side=tk.LEFT, padx=6)
+        self.entry_scan.bind("<Return>", self._handle_scan)
+        self.entry_scan.bind("<KP_Enter>", self._handle_scan)
+        ttk.Label(scan_frame, textvariable=self.var_scan_status).pack(side=tk.LEFT, padx=6)
+
         table_frame = ttk.Frame(self)
         table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=6)
 
@@ -88,6 +106,9 @@ class DepotPsaCheckDialog(tk.Toplevel):
         y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
 
         self.tree.bind("<Button-1>", self._handle_tree_click)
+        self.tree.tag_configure("scanned", background="#B8E7A7")
+        self.tree.tag_configure("scanned_off", background="#FFEA8D")
+        self.tree.tag_configure("scanned_extra", background="#CDE3FF")
 
         btns = ttk.Frame(self)
         btns.pack(fill=tk.X, padx=10, pady=(0, 10))
@@ -148,38 +169,106 @@ class DepotPsaCheckDialog(tk.Toplevel):
         self._refresh_table()
 
     def _refresh_table(self):
-        for iid in self.tree.get_children():
-            self.tree.delete(iid)
-        self.row_selected.clear()
-
         if not self.var_location.get():
+            self._fill_table([])
             return
 
-        rows = self.db.fetch_inventory_for_psa_check(
-            location=self.var_location.get(),
-            product_type=self.var_product_type.get() or None,
-            property_1=self.var_property_1.get() or None,
-            property_2=self.var_property_2.get() or None,
+        # im DbWorker; ein neuer Filterwechsel verwirft die noch laufende Abfrage
+        self.db.worker.submit(
+            lambda reader, *filters: reader.fetch_inventory_for_psa_check(*filters),
+            self.var_location.get(),
+            self.var_product_type.get() or None,
+            self.var_property_1.get() or None,
+            self.var_property_2.get() or None,
+            on_done=self._fill_table,
+            on_error=self._on_load_error,
+            key=("psa_check_depot", id(self)),
         )
 
+    def _fill_table(self, rows):
+        if not self.winfo_exists():
+            return
+        self.tree.delete(*self.tree.get_children())
+        self.row_selected.clear()
+        self._item_by_code.clear()
         for row in rows:
+            self._insert_row(row)
+
+    def _on_load_error(self, ex: Exception):
+        if self.winfo_exists():
+            messagebox.showerror("Fehler", f"Einträge konnten nicht geladen werden: {ex}", parent=self)
+
+    def _insert_row(self, row, tags=()):
+        item_id = row["ID"]
+        default_checked = str(row["psa_check"] or "0") == "1"
+        if item_id in self.scan_session:
+            default_checked = self.scan_session[item_id]
+            tags = tags or (("scanned",) if default_checked else ("scanned_off",))
+        self.row_selected[item_id] = default_checked
+        self.tree.insert(
+            "",
+            tk.END,
+            iid=item_id,
+            tags=tags,
+            values=(
+                "☑" if default_checked else "☐",
+                row["ID"],
+                row["product_type"],
+                row["property_1"],
+                row["property_2"],
+                row["serial_number"],
+                row["check_date"] or "",
+            ),
+        )
+        # Seriennummern zuerst, damit eine gleichlautende ID Vorrang hat
+        serial = code_key(row["serial_number"])
+        if serial:
+            self._item_by_code.setdefault(serial, item_id)
+        self._item_by_code[code_key(item_id)] = item_id
+
+    # ---------- Scan-Modus ----------
+    def _handle_scan(self, _event=None):
+        # Tastatur-Scanner schicken Code + Enter, eingefügte Listen enthalten mehrere Codes
+        codes = self.var_scan.get().split()
+        self.var_scan.set("")
+        messages = [self._scan_code(code) for code in codes]
+        if messages:
+            marked = sum(1 for selected in self.scan_session.values() if selected)
+            self.var_scan_status.set(f"{messages[-1]}  |  Sitzung: {marked} markiert")
+        return "break"
+
+    def _scan_code(self, code: str) -> str:
+        item_id = self._item_by_code.get(code_key(code))
+        extra = False
+        if item_id is None:
+            # nicht in der aktuellen Ansicht -> DB (Primärschlüssel/Seriennummer-Index)
+            rows = self.db.find_inventory_by_code(code)
+            if not rows:
+                self.bell()
+                return f"{code}: unbekannt"
+            if len(rows) > 1:
+                self.bell()
+                return f"{code}: mehrdeutig ({', '.join(r['ID'] for r in rows)})"
+            row = rows[0]
             item_id = row["ID"]
-            default_checked = str(row["psa_check"] or "0") == "1"
-            self.row_selected[item_id] = default_checked
-            self.tree.insert(
-                "",
-                tk.END,
-                iid=item_id,
-                values=(
-                    "☑" if default_checked else "☐",
-                    row["ID"],
-                    row["product_type"],
-                    row["property_1"],
-                    row["property_2"],
-                    row["serial_number"],
-                    row["check_date"] or "",
-                ),
-            )
+            if not self.tree.exists(item_id):
+                self._insert_row(row, tags=("scanned_extra",))
+                extra = True
+
+        selected = not self.row_selected.get(item_id, False)
+        self.row_selected[item_id] = selected
+        self.scan_session[item_id] = selected
+        values = list(self.tree.item(item_id, "values"))
+        values[0] = "☑" if selected else "☐"
+        tags = ("scanned_extra",) if extra or "scanned_extra" in self.tree.item(item_id, "tags") else (
+            ("scanned",) if selected else ("scanned_off",)
+        )
+        self.tree.item(item_id, values=values, tags=tags)
+        self.tree.selection_set(item_id)
+        self.tree.see(item_id)
+
+        state = "markiert" if selected else "entfernt"
+        return f"{item_id}: {state}" + (" (anderer Filter/Lagerort)" if extra else "")
 
     def _handle_tree_click(self, event):
         region = self.tree.identify("region", event.x, event.y)
@@ -193,17 +282,25 @@ class DepotPsaCheckDialog(tk.Toplevel):
             return
 
         self.row_selected[item_id] = not self.row_selected.get(item_id, False)
+        if item_id in self.scan_session:
+            self.scan_session[item_id] = self.row_selected[item_id]
         values = list(self.tree.item(item_id, "values"))
         values[0] = "☑" if self.row_selected[item_id] else "☐"
         self.tree.item(item_id, values=values)
+        # Fokus zurück ins Scan-Feld, damit der Scanner weiter tippen kann
+        self.entry_scan.focus_set()
 
+    @tracked()
     def _finish_check(self):
         check_date = self.var_check_date.get().strip()
         if not parse_date(check_date):
             messagebox.showerror("Ungültiges Datum", "Bitte Datum im Format YYYY-MM-DD eingeben.")
             return
 
-        selected_ids = [item_id for item_id, selected in self.row_selected.items() if selected]
+        selection = dict(self.row_selected)
+        # Scans außerhalb der aktuellen Ansicht gehören zur selben Sitzung
+        selection.update(self.scan_session)
+        selected_ids = [item_id for item_id, selected in selection.items() if selected]
         if not selected_ids:
             messagebox.showinfo("Hinweis", "Keine Einträge für PSA-Check ausgewählt.")
             return
@@ -215,6 +312,7 @@ class DepotPsaCheckDialog(tk.Toplevel):
             return
 
         messagebox.showinfo("Erfolg", f"PSA-Check gespeichert: {len(selected_ids)} Einträge aktualisiert.")
+        self.scan_session.clear()
         self._refresh_table()
         if self.on_saved:
-            self.on_saved()
+            self.on_saved(changed_ids=selected_ids)
@@ -1,6 +1,7 @@
 import re
 import tkinter as tk
 from tkinter import messagebox, ttk
+from app.core.lag_monitor import tracked
 
 
 class PlaceholderAbortDialog(tk.Toplevel):
@@ -197,6 +198,7 @@ class VehicleSetEditDialog(tk.Toplevel):
         if row:
             self.count_var.set(str(row["count"]))
 
+    @tracked()
     def save_count(self):
         if not self.selected_iid:
             messagebox.showinfo("Hinweis", "Bitte zuerst eine Zeile auswählen.")
@@ -288,6 +290,7 @@ class AddVehicleSetEntryDialog(tk.Toplevel):
         self.property_2_combo["values"] = values
         self.property_2_combo.configure(state="readonly")
 
+    @tracked()
     def save(self):
         product_type = self.product_type_var.get().strip()
         property_1 = self.property_1_var.get().strip()
@@ -0,0 +1,154 @@
+import os
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from datetime import datetime
+
+
+class QueryStatsDialog(tk.Toplevel):
+    """
+    Abfrage-Statistik der Database (siehe app.db.instrumentation.QueryStats).
+    - Messung an/aus und Schwelle fürs Slow-Log, beides in settings.cfg gespeichert
+    - Je Methode: Aufrufe, p50/p95/max, Gesamtzeit, Zeilen, SQL-Anweisungen
+    - Langsame Aufrufe mit SQL und EXPLAIN QUERY PLAN
+    - Export als JSON
+    """
+
+    METHOD_COLUMNS = ("method", "count", "p50", "p95", "max", "total", "rows", "statements")
+    SLOW_COLUMNS = ("time", "method", "ms", "rows")
+
+    def __init__(self, master, db, settings):
+        super().__init__(master)
+        self.title("Abfrage-Statistik")
+        self.geometry("980x640")
+        self.transient(master)
+
+        self.db = db
+        self.settings = settings
+        self.stats = db.query_stats
+        self.var_enabled = tk.BooleanVar(value=self.stats.enabled)
+        self.var_slow_ms = tk.StringVar(value=str(settings.slow_query_ms))
+        self.var_summary = tk.StringVar()
+
+        top = ttk.Frame(self)
+        top.pack(fill=tk.X, padx=10, pady=(10, 6))
+        ttk.Checkbutton(top, text="Messung aktiv", variable=self.var_enabled).pack(side=tk.LEFT)
+        ttk.Label(top, text="Langsam ab (ms):").pack(side=tk.LEFT, padx=(16, 4))
+        ttk.Entry(top, textvariable=self.var_slow_ms, width=8).pack(side=tk.LEFT)
+        ttk.Button(top, text="Übernehmen", command=self._apply).pack(side=tk.LEFT, padx=6)
+        ttk.Label(top, textvariable=self.var_summary).pack(side=tk.LEFT, padx=12)
+
+        panes = ttk.PanedWindow(self, orient=tk.VERTICAL)
+        panes.pack(fill=tk.BOTH, expand=True, padx=10, pady=6)
+
+        method_frame = ttk.Frame(panes)
+        self.method_tree = ttk.Treeview(method_frame, columns=self.METHOD_COLUMNS, show="headings", height=10)
+        headings = {
+            "method": ("Methode", 240), "count": ("Aufrufe", 70), "p50": ("p50 ms", 80), "p95": ("p95 ms", 80),
+            "max": ("max ms", 80), "total": ("Summe ms", 90), "rows": ("Zeilen", 80), "statements": ("SQL", 70),
+        }
+        for col in self.METHOD_COLUMNS:
+            text, width = headings[col]
+            self.method_tree.heading(col, text=text)
+            self.method_tree.column(col, width=width, anchor="w" if col == "method" else "e")
+        y_scroll = ttk.Scrollbar(method_frame, orient="vertical", command=self.method_tree.yview)
+        self.method_tree.configure(yscrollcommand=y_scroll.set)
+        self.method_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        panes.add(method_frame, weight=3)
+
+        slow_frame = ttk.Frame(panes)
+        ttk.Label(slow_frame, text="Langsame Aufrufe").pack(anchor="w")
+        self.slow_tree = ttk.Treeview(slow_frame, columns=self.SLOW_COLUMNS, show="headings", height=6)
+        for col, text, width in (("time", "Zeit", 150), ("method", "Methode", 240), ("ms", "ms", 90), ("rows", "Zeilen", 80)):
+            self.slow_tree.heading(col, text=text)
+            self.slow_tree.column(col, width=width, anchor="e" if col in ("ms", "rows") else "w")
+        self.slow_tree.pack(fill=tk.BOTH, expand=True)
+        self.slow_tree.bind("<<TreeviewSelect>>", self._show_slow_detail)
+        self.txt_detail = tk.Text(slow_frame, height=9, wrap="word")
+        self.txt_detail.pack(fill=tk.BOTH, expand=True, pady=(6, 0))
+        panes.add(slow_frame, weight=2)
+
+        btns = ttk.Frame(self)
+        btns.pack(fill=tk.X, padx=10, pady=(0, 10))
+        ttk.Button(btns, text="Schließen", command=self.destroy).pack(side=tk.RIGHT)
+        ttk.Button(btns, text="Exportieren…", command=self._export).pack(side=tk.RIGHT, padx=6)
+        ttk.Button(btns, text="Zurücksetzen", command=self._reset).pack(side=tk.LEFT)
+        ttk.Button(btns, text="Aktualisieren", command=self.refresh).pack(side=tk.LEFT, padx=6)
+
+        self.refresh()
+
+    def _apply(self):
+        try:
+            slow_ms = int(self.var_slow_ms.get().strip())
+            if slow_ms < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Fehler", "'Langsam ab' muss eine ganze Zahl ≥ 0 sein.", parent=self)
+            return
+        self.settings.slow_query_ms = slow_ms
+        self.settings.query_stats_enabled = self.var_enabled.get()
+        self.settings.save()
+        if self.settings.query_stats_enabled:
+            self.stats.enable(slow_ms)
+        else:
+            self.stats.disable()
+        self.refresh()
+
+    def _reset(self):
+        self.stats.reset()
+        self.refresh()
+
+    def refresh(self):
+        self.method_tree.delete(*self.method_tree.get_children())
+        for name, stats in self.stats.summary():
+            self.method_tree.insert("", tk.END, values=(
+                name, stats.count, f"{stats.percentile(0.50):.1f}", f"{stats.percentile(0.95):.1f}",
+                f"{stats.max_ms:.1f}", f"{stats.total_ms:.1f}", stats.rows, stats.statements,
+            ))
+        self.slow_tree.delete(*self.slow_tree.get_children())
+        # neueste zuerst, iid = Index im Slow-Log
+        for idx in range(len(self.stats.slow_log) - 1, -1, -1):
+            entry = self.stats.slow_log[idx]
+            self.slow_tree.insert("", tk.END, iid=str(idx), values=(
+                entry["time"], entry["method"], f"{entry['ms']:.1f}", "" if entry["rows"] is None else entry["rows"],
+            ))
+        self.txt_detail.delete("1.0", tk.END)
+
+        state = "aktiv" if self.stats.enabled else "aus"
+        calls = sum(stats.count for stats in self.stats.methods.values())
+        self.var_summary.set(
+            f"Messung {state} | seit {self.stats.since:%H:%M:%S} | {calls} Aufrufe | {len(self.stats.slow_log)} langsam"
+        )
+
+    def _show_slow_detail(self, _event=None):
+        sel = self.slow_tree.selection()
+        self.txt_detail.delete("1.0", tk.END)
+        if not sel:
+            return
+        entry = self.stats.slow_log[int(sel[0])]
+        lines = [f"{entry['method']}: {entry['ms']:.1f} ms"]
+        for statement in entry["statements"]:
+            lines.append("")
+            lines.append(statement["sql"])
+            lines.extend(f"    {detail}" for detail in statement["plan"])
+        self.txt_detail.insert("1.0", "\n".join(lines))
+
+    def _export(self):
+        os.makedirs("./output", exist_ok=True)
+        ts = datetime.now().strftime("%Y-%m-%d_%H-%M")
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title="Statistik speichern unter",
+            initialdir=os.path.abspath("./output"),
+            initialfile=f"abfrage_statistik_{ts}.json",
+            defaultextension=".json",
+            filetypes=[("JSON-Datei", "*.json")],
+        )
+        if not path:
+            return
+        try:
+            self.stats.export_json(path)
+        except OSError as ex:
+            messagebox.showerror("Fehler", f"Export fehlgeschlagen: {ex}", parent=self)
+            return
+        messagebox.showinfo("Erfolg", f"Statistik gespeichert:\n{path}", parent=self)
@@ -0,0 +1,123 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from app.db.search import MIN_WORD_LENGTH, SEARCH_KIND_LABELS
+
+
+class GlobalSearchDialog(tk.Toplevel):
+    """
+    Globale Suche über Material, Einsatzkräfte, Kleidung und Lagerorte.
+    - Suche läuft beim Tippen (entprellt), alle Wörter müssen vorkommen.
+    - Doppelklick/Enter öffnet den Bearbeiten-Dialog des Treffers.
+    """
+
+    DEBOUNCE_MS = 150
+
+    def __init__(self, master, db):
+        super().__init__(master)
+        self.title("Suchen")
+        self.geometry("760x440")
+        self.transient(master)
+
+        self.db = db
+        self.var_query = tk.StringVar()
+        self._after_id = None
+        self._hits_by_item: dict[str, dict] = {}
+
+        top = ttk.Frame(self)
+        top.pack(fill=tk.X, padx=10, pady=(10, 6))
+        ttk.Label(top, text="Suche:").pack(side=tk.LEFT)
+        self.entry = ttk.Entry(top, textvariable=self.var_query)
+        self.entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=6)
+        self.var_status = tk.StringVar()
+        ttk.Label(top, textvariable=self.var_status, width=16, anchor=tk.E).pack(side=tk.RIGHT)
+
+        table_frame = ttk.Frame(self)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        columns = ("kind", "key", "text")
+        self.tree = ttk.Treeview(table_frame, columns=columns, show="headings", selectmode="browse")
+        for col, heading, width in (("kind", "Bereich", 110), ("key", "Schlüssel", 120), ("text", "Treffer", 480)):
+            self.tree.heading(col, text=heading)
+            self.tree.column(col, width=width, anchor=tk.W, stretch=(col == "text"))
+        vsb = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=vsb.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        vsb.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.var_query.trace_add("write", lambda *_: self._schedule_search())
+        self.entry.bind("<Down>", self._focus_results)
+        self.entry.bind("<Return>", lambda _e: self._open_selected())
+        self.tree.bind("<Double-1>", lambda _e: self._open_selected())
+        self.tree.bind("<Return>", lambda _e: self._open_selected())
+        self.bind("<Escape>", lambda _e: self.destroy())
+
+        self.entry.focus_set()
+
+    def _schedule_search(self):
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+        self._after_id = self.after(self.DEBOUNCE_MS, self._run_search)
+
+    def _run_search(self):
+        self._after_id = None
+        hits = self.db.search(self.var_query.get(), limit=100)
+        self.tree.delete(*self.tree.get_children())
+        self._hits_by_item.clear()
+        for hit in hits:
+            item = self.tree.insert(
+                "", tk.END,
+                values=(SEARCH_KIND_LABELS.get(hit["kind"], hit["kind"]), hit["key"], " ".join(hit["text"].split())),
+            )
+            self._hits_by_item[item] = hit
+        words = self.var_query.get().split()
+        if not words:
+            self.var_status.set("")
+        elif not hits and self.db.search_index.available and all(len(w) < MIN_WORD_LENGTH for w in words):
+            self.var_status.set(f"ab {MIN_WORD_LENGTH} Zeichen")
+        elif self.db.search_index.last_broad:
+            self.var_status.set("Suche eingrenzen")
+        else:
+            self.var_status.set(f"{len(hits)} Treffer")
+        children = self.tree.get_children()
+        if children:
+            self.tree.selection_set(children[0])
+            self.tree.focus(children[0])
+
+    def _focus_results(self, _event=None):
+        if self.tree.get_children():
+            self.tree.focus_set()
+        return "break"
+
+    def _open_selected(self):
+        item = self.tree.focus()
+        hit = self._hits_by_item.get(item)
+        if not hit:
+            return
+        app = self.master
+        kind, ref = hit["kind"], hit["ref"]
+        if kind == "inventory":
+            from app.ui.dialogs.inventory import EditInventoryDialog
+            row = self.db.fetch_by_id("inventory", ref)
+            if row:
+                EditInventoryDialog(app, self.db, dict(row), on_saved=getattr(app, "refresh_inventory", None))
+                return
+        elif kind == "member":
+            from app.ui.dialogs.member import EditMemberDialog
+            row = self.db.fetch_by_id("member", ref)
+            if row:
+                EditMemberDialog(app, self.db, dict(row), on_saved=getattr(app, "refresh_member", None))
+                return
+        elif kind == "kleidung":
+            from app.ui.dialogs.kleidung import EditKleidungDialog
+            row = self.db.fetch_kleidung_by_rowid(int(ref))
+            if row:
+                EditKleidungDialog(app, self.db, dict(row), on_saved=getattr(app, "refresh_kleidung", None))
+                return
+        elif kind == "location":
+            from app.ui.dialogs.location import LocationManageDialog
+            dialog = LocationManageDialog(app, self.db)
+            dialog.location_var.set(ref)
+            dialog._on_location_selected()
+            return
+        messagebox.showinfo("Hinweis", "Der Eintrag existiert nicht mehr.", parent=self)
+        self._run_search()
@@ -10,7 +10,6 @@ class KleidungTab(ttk.Frame):
         super().__init__(master)
         self.db = db
         self.columns = [c for c, _ in KLEIDUNG_COLUMNS]
-        self.member_name_by_id: dict[str, str] = {}
         self.table = FilterTable(self, self.columns)
         self.table.pack(fill=tk.BOTH, expand=True)
         self.table.bind("<<FilterChanged>>", lambda e: self.refresh())
@@ -21,25 +20,18 @@ class KleidungTab(ttk.Frame):
     def refresh(self):
         if not self.db.conn:
             return
-        self.member_name_by_id = self._build_member_name_map()
-        rows = self.db.fetch_all_kleidung()
         filters = self.table.get_filters()
-        self.table.clear()
+        rows = self.db.query_kleidung(filters)
         self._rowid_by_item.clear()
         self._row_by_item.clear()
+        table_rows = []
         for r in rows:
+            item = str(r["rowid"])
             values = [self.format_value(c, r[c]) for c, _ in KLEIDUNG_COLUMNS]
-            keep = True
-            for col, needle in filters.items():
-                idx = self.columns.index(col)
-                if needle.lower() not in str(values[idx]).lower():
-                    keep = False
-                    break
-            if not keep:
-                continue
-            item = self.table.tree.insert("", tk.END, values=values)
+            table_rows.append((item, values, ()))
             self._rowid_by_item[item] = r["rowid"]
             self._row_by_item[item] = dict(r)
+        self.table.set_rows(table_rows, applied_filters=filters)
 
         self.table.autosize_columns()
 
@@ -64,28 +56,10 @@ class KleidungTab(ttk.Frame):
             on_saved_cb = top.refresh_kleidung
         EditKleidungDialog(self, self.db, record, on_saved=on_saved_cb)
 
-    def _build_member_name_map(self) -> dict[str, str]:
-        member_name_by_id: dict[str, str] = {}
-        for member in self.db.get_members_basic():
-            first_name = (member.get("first_name") or "").strip()
-            last_name = (member.get("last_name") or "").strip()
-            full_name = f"{first_name} {last_name}".strip()
-            if full_name:
-                member_id = str(member["ID"]).strip()
-                member_name_by_id[member_id] = full_name
-                if member_id.startswith("/"):
-                    member_name_by_id[member_id[1:]] = full_name
-                else:
-                    member_name_by_id[f"/{member_id}"] = full_name
-        return member_name_by_id
-
     def format_value(self, col: str, v):
         if col == "location" and v not in (None, ""):
             location = str(v).strip()
-            if location.startswith("/NR"):
-                member_name = self.member_name_by_id.get(location)
-                if not member_name:
-                    member_name = self.member_name_by_id.get(location[1:])
-                if member_name:
-                    return f"{location} ({member_name})"
+            member_name = self.db.member_names.name_for_location(location)
+            if member_name:
+                return f"{location} ({member_name})"
         return v if v is not None else ""
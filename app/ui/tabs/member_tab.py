@@ -18,21 +18,12 @@ class MemberTab(ttk.Frame):
     def refresh(self):
         if not self.db.conn:
             return
-        rows = self.db.fetch_all("member")
         filters = self.table.get_filters()
-        self.table.clear()
-        for r in rows:
-            keep = True
-            for col, needle in filters.items():
-                val = r[col]
-                disp_val = self.format_value(col, val)
-                if needle.lower() not in str(disp_val).lower():
-                    keep = False
-                    break
-            if not keep:
-                continue
-            values = [self.format_value(c, r[c]) for c, _ in MEMBER_COLUMNS]
-            self.table.insert_row(values)
+        rows = self.db.query_members(filters)
+        self.table.set_rows(
+            ((r["ID"], [self.format_value(c, r[c]) for c, _ in MEMBER_COLUMNS], ()) for r in rows),
+            applied_filters=filters,
+        )
 
         self.table.autosize_columns()
 
@@ -0,0 +1,34 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+from app.db.database import Database
+
+# zusätzliche Depot-Zeilen, damit die Abfragen nicht gegen ein fast leeres Inventar laufen
+NOISE_ITEMS = 50_000
+
+
+@contextmanager
+def temp_database(name: str, pragmas: dict | None = None):
+    """Frische `Database` in einem temporären Verzeichnis, wird danach geschlossen."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database()
+        db.connect(os.path.join(tmp, f"{name}.db"), pragmas=pragmas)
+        try:
+            yield db
+        finally:
+            db.worker.stop()
+            db.conn.close()
+
+
+def noise_items(start: int, count: int = NOISE_ITEMS) -> list[dict]:
+    """Depot-Material mit fortlaufenden IDs ab `start`."""
+    return [{"ID": f"{start + i:06d}", "location": "Depot", "product_type": "Seil"} for i in range(count)]
+
+
+def print_soll_ist_summary(label: str, groups: list[dict], items: int, seconds: float):
+    lines_total = sum(len(group["lines"]) for group in groups)
+    missing = sum(group["missing_total"] for group in groups)
+    surplus = sum(group["surplus_total"] for group in groups)
+    print(f"{len(groups)} {label}, {lines_total} Positionen, Inventar {items} Zeilen")
+    print(f"Fehlt: {missing} | Zuviel: {surplus} | Laufzeit: {seconds * 1000:.1f} ms")
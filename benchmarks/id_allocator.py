@@ -0,0 +1,85 @@
+"""Bulk-Vergabe gegen einen fast vollen 35³-ID-Raum (python -m benchmarks.id_allocator)."""
+import random
+import time
+
+from app.core.id_allocator import ITEM_ID_DIGITS, MEMBER_ID_DIGITS, IdAllocator
+
+
+def _legacy_used(old_list_id, width: int) -> list[str]:
+    list_id = []
+    old_id = ""
+    for idv in old_list_id:
+        if len(idv) > width:
+            idv = idv[:width]
+            if idv != old_id:
+                list_id.append(idv)
+                old_id = idv
+        else:
+            list_id.append(idv)
+    return list_id
+
+
+def legacy_next_item_id(old_list_id: list[str]) -> str | int:
+    """Der frühere Schleifen-Generator (generate_next_valid_id_item vor IdAllocator), als Vergleich."""
+    digits = ITEM_ID_DIGITS
+    list_id = _legacy_used(old_list_id, 3)
+    digit_0, digit_1, digit_2 = 1, 0, 0
+    while True:
+        new_id = digits[digit_2] + digits[digit_1] + digits[digit_0]
+        if new_id not in list_id:  # lineare Suche wie die frühere for-Schleife
+            return new_id
+        digit_0 += 1
+        if digit_0 > len(digits) - 1:
+            digit_0 = 0
+            digit_1 += 1
+            if digit_1 > len(digits) - 1:
+                digit_1 = 0
+                digit_2 += 1
+                if digit_2 > len(digits) - 1:
+                    return -1
+
+
+def legacy_next_member_id(old_list_id: list[str]) -> str | int:
+    """Der frühere Schleifen-Generator (generate_next_valid_id_member vor IdAllocator), als Vergleich."""
+    digits = MEMBER_ID_DIGITS
+    list_id = _legacy_used(old_list_id, 4)
+    digit_0, digit_1 = 1, 0
+    while True:
+        new_id = "NR" + digits[digit_1] + digits[digit_0]
+        if new_id not in list_id:
+            return new_id
+        digit_0 += 1
+        if digit_0 > len(digits) - 1:
+            digit_0 = 0
+            digit_1 += 1
+            if digit_1 > len(digits) - 1:
+                return -1
+
+
+def main(count: int = 1000, free_slots: int = 1500):
+    capacity = len(ITEM_ID_DIGITS) ** 3
+    all_ids = [IdAllocator.for_items([]).encode(i) for i in range(1, capacity)]
+    rnd = random.Random(42)
+    free = set(rnd.sample(range(len(all_ids)), free_slots))
+    used = [id_val for i, id_val in enumerate(all_ids) if i not in free]
+    print(f"ID-Raum: {capacity} | belegt: {len(used)} | angefordert: {count}")
+
+    t0 = time.perf_counter()
+    allocator = IdAllocator.for_items(used)
+    ids = allocator.allocate(count)
+    bulk = time.perf_counter() - t0
+    assert len(set(ids)) == count and not set(ids) & set(used)
+    print(f"IdAllocator.allocate({count}): {bulk * 1000:.1f} ms")
+
+    # bisheriger Generator: pro Datensatz alle Kandidaten der Reihe nach gegen die komplette ID-Liste
+    sample = 20
+    taken = list(used)
+    t0 = time.perf_counter()
+    for _ in range(sample):
+        taken.append(legacy_next_item_id(taken))
+    per_item = (time.perf_counter() - t0) / sample
+    print(f"Alter Generator je Datensatz: {per_item * 1000:.1f} ms/ID -> ~{per_item * count * 1000:.0f} ms für {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""300 Einsatzkräfte gegen 60 PSA-Vorgaben und ein gefülltes Inventar (python -m benchmarks.member_psa)."""
+import random
+import time
+
+from app.core.member_psa import compute_member_psa
+from app.db.database import MEMBER_BOOL_COLUMNS
+from benchmarks.common import noise_items, print_soll_ist_summary, temp_database
+
+
+def main(members: int = 300, requirements: int = 60):
+    rnd = random.Random(7)
+    with temp_database("member_psa") as db:
+        for k in range(requirements):
+            record = {"count": rnd.randint(1, 2), "type": f"Typ{k % 20}",
+                      "property_1": f"P{k}" if k % 3 else "", "property_2": ""}
+            for col in rnd.sample(MEMBER_BOOL_COLUMNS, 2):
+                record[col] = 1
+            db.insert_psa(record)
+        items = []
+        for m in range(members):
+            member_id = f"NR{m:04d}"
+            record = {"ID": member_id, "first_name": f"Vor{m}", "last_name": f"Nach{m}"}
+            for col in rnd.sample(MEMBER_BOOL_COLUMNS, 3):
+                record[col] = 1
+            db.insert_member(record)
+            for k in range(rnd.randint(5, 40)):
+                items.append({"ID": f"{len(items):06d}", "location": f"/{member_id}", "product_type": f"Typ{k % 25}",
+                              "property_1": f"P{rnd.randrange(requirements)}"})
+        items.extend(noise_items(len(items)))
+        db.insert_inventory_many(items)
+
+        t0 = time.perf_counter()
+        result = compute_member_psa(db)
+        print_soll_ist_summary("Einsatzkräfte", result, len(items), time.perf_counter() - t0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Journal-Profil (DB_PRAGMAS_DEFAULT) gegen SQLite-Standard bei typischen Schreibzugriffen (python -m benchmarks.pragmas)."""
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from app.db.database import Database
+from settings.constants import DB_PRAGMAS_DEFAULT
+
+
+def run_workload(path: str, pragmas: dict | None, items: int, batches: int, batch_size: int, edits: int) -> dict:
+    db = Database()
+    db.connect(path, pragmas=pragmas)
+    timings = {}
+
+    records = [
+        {
+            "ID": f"{i:05d}", "product_type": "Seil", "property_1": "60m", "property_2": "",
+            "producer": "Edelrid", "product_name": "Bench", "serial_number": f"SN{i}",
+            "location": "Depot", "manufactury_date": "2020-01-01", "check_date": "2025-03-01",
+            "life_time": 10, "psa_check": 0,
+        }
+        for i in range(items)
+    ]
+    t0 = time.perf_counter()
+    db.insert_inventory_many(records)
+    timings["Bulk-Insert"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for b in range(batches):
+        ids = [records[(b * batch_size + k) % items]["ID"] for k in range(batch_size)]
+        db.update_inventory_psa_check_dates(ids, "2026-05-01")
+    timings[f"PSA-Check {batches}x{batch_size}"] = time.perf_counter() - t0
+
+    # Bearbeiten-Dialog: je Datensatz ein UPDATE + Commit
+    t0 = time.perf_counter()
+    for k in range(edits):
+        rec = dict(records[k], product_name=f"Edit {k}")
+        db.update_inventory(rec["ID"], rec)
+        db.commit()
+    timings[f"Einzel-Update {edits}x"] = time.perf_counter() - t0
+
+    # Export liest in offener Transaktion, währenddessen schreibt die UI
+    reader = sqlite3.connect(path, timeout=0.2)
+    reader.execute("BEGIN")
+    reader.execute("SELECT COUNT(*) FROM inventory").fetchone()
+    try:
+        db.update_inventory_psa_check_dates([records[0]["ID"]], "2026-06-01")
+        timings["Schreiben während Export"] = "ok"
+    except sqlite3.OperationalError as ex:
+        timings["Schreiben während Export"] = f"blockiert ({ex})"
+        db.conn.rollback()
+    finally:
+        reader.rollback()
+        reader.close()
+    db.worker.stop()
+    db.conn.close()
+    return timings
+
+
+def main(items: int = 5000, batches: int = 200, batch_size: int = 10, edits: int = 200, repeats: int = 5):
+    """
+    Median aus `repeats` abwechselnden Läufen; Einzelläufe schwanken beim Bulk-Insert
+    um über 100 ms. Der Bulk-Insert wird von der Pflege der Indizes und des
+    FTS5-Suchindex (Trigger) bestimmt, das Journal-Profil ändert daran kaum etwas.
+    """
+    profiles = {
+        # nur busy_timeout, sonst SQLite-Standard (Rollback-Journal)
+        "Standard": {"busy_timeout": "200"},
+        "Profil": dict(DB_PRAGMAS_DEFAULT, busy_timeout="200"),
+    }
+    runs: dict[str, list[dict]] = {name: [] for name in profiles}
+    with tempfile.TemporaryDirectory() as tmp:
+        for rep in range(repeats):
+            for name, pragmas in profiles.items():
+                path = os.path.join(tmp, f"{name}_{rep}.db")
+                runs[name].append(run_workload(path, pragmas, items, batches, batch_size, edits))
+    print(f"Median aus {repeats} Läufen")
+    for label in runs["Standard"][0]:
+        cells = []
+        for name in profiles:
+            values = [run[label] for run in runs[name]]
+            if isinstance(values[0], float):
+                cells.append(f"{name}: {statistics.median(values) * 1000:8.1f} ms")
+            else:
+                cells.append(f"{name}: {values[-1]}")
+        print(f"{label:<26} " + " | ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Suchzeiten FTS5 vs. LIKE bei 100.000 Inventarzeilen (python -m benchmarks.search)."""
+import time
+
+from benchmarks.common import temp_database
+
+QUERIES = ["SN-1234", "petzl modell 42", "Müller12", "0A1F", "Helm Depot", "Seil NR1", "modell"]
+
+
+def main(items: int = 100_000, members: int = 500):
+    producers = ["Edelrid", "Petzl", "Mammut", "Beal", "Black Diamond", "Salewa"]
+    types = ["Seil", "Gurt", "Helm", "Karabiner", "Bandschlinge", "Abseilgerät"]
+    with temp_database("search") as db:
+        with db.conn:
+            db.conn.executemany(
+                "INSERT INTO inventory (ID, product_type, producer, product_name, serial_number, location) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (f"{i:06X}", types[i % len(types)], producers[i % len(producers)],
+                     f"Modell {i % 997}", f"SN-{i * 7919 % 10_000_000:07d}", f"/NR{i % members:02d}" if i % 3 else "Depot")
+                    for i in range(items)
+                ],
+            )
+            db.conn.executemany(
+                "INSERT INTO member (ID, first_name, last_name) VALUES (?, ?, ?)",
+                [(f"NR{i:03d}", f"Vorname{i}", f"Müller{i}") for i in range(members)],
+            )
+        for label, available in (("FTS5 trigram", db.search_index.available), ("LIKE", False)):
+            db.search_index.available = available
+            for q in QUERIES:
+                t0 = time.perf_counter()
+                hits = db.search(q, limit=50)
+                ms = (time.perf_counter() - t0) * 1000
+                print(f"{label:<13} {q!r:<20} {len(hits):3d} Treffer  {ms:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""50 Fahrzeuge x 200 Soll-Positionen gegen ein gefülltes Inventar (python -m benchmarks.vehicle_soll_ist)."""
+import random
+import time
+
+from app.core.vehicle_soll_ist import compute_vehicle_soll_ist
+from benchmarks.common import noise_items, print_soll_ist_summary, temp_database
+
+
+def main(vehicles: int = 50, lines: int = 200):
+    rnd = random.Random(7)
+    with temp_database("soll_ist") as db:
+        items = []
+        for v in range(vehicles):
+            table = f"set_vehicle_bench{v}"
+            db.create_vehicle_set_table(table)
+            soll_rows = [(f"Typ{k % 40}", f"P{k}", f"Q{k % 3}", rnd.randint(1, 4)) for k in range(lines)]
+            db.conn.executemany(
+                "INSERT INTO vehicle_set_item (set_name, product_type, property_1, property_2, count) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(f"bench{v}", *row) for row in soll_rows],
+            )
+            db.upsert_location(f"RTW{v}", "A", table)
+            for product_type, property_1, property_2, count in soll_rows:
+                for _ in range(max(0, count + rnd.randint(-2, 1))):
+                    items.append({"ID": f"{len(items):06d}", "location": f"RTW{v}/A", "product_type": product_type,
+                                  "property_1": property_1, "property_2": property_2})
+        items.extend(noise_items(len(items)))
+        db.insert_inventory_many(items)
+
+        t0 = time.perf_counter()
+        result = compute_vehicle_soll_ist(db)
+        print_soll_ist_summary("Fahrzeuge", result, len(items), time.perf_counter() - t0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,49 @@
+import time
+
+# vor allen anderen Imports, damit --profile-startup die Importzeit mitzählt
+_START = time.perf_counter()
+
 import os
+import sys
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
-from settings.constants import APP_TITLE
+from settings.constants import APP_TITLE, LAG_LOG_FILE
 from settings.app_settings import AppSettings
 from app.db.database import Database
 from app.ui.tabs.inventory_tab import InventoryTab
 from app.ui.tabs.member_tab import MemberTab
 from app.ui.tabs.jacken_tab import KleidungTab
-from app.ui.dialogs.color_rules import ColorRulesDialog
-from app.ui.dialogs.about import AboutDialog
-from app.ui.dialogs.print_member import PrintExportDialog
-from app.ui.dialogs.location import LocationManageDialog
-from app.ui.dialogs.psa_check_depot import DepotPsaCheckDialog
-from app.core.utils import create_folder
+from app.core.startup_profile import StartupProfile
+from app.core.lag_monitor import LagMonitor, track
+
+# Dialoge (und fpdf über pdf_export) werden erst beim ersten Öffnen importiert
+
+# mehr geänderte Zeilen -> komplette Tabelle neu aufbauen statt einzeln aktualisieren
+INCREMENTAL_REFRESH_LIMIT = 200
+
 
 class App(tk.Tk):
-    def __init__(self):
+    def __init__(self, profile: StartupProfile | None = None):
         super().__init__()
+        mark = profile.mark if profile is not None else (lambda _name: None)
         self.title(APP_TITLE)
         self.geometry("1450x700")
+        mark("Tk-Fenster")
 
         self.settings = AppSettings()
+        mark("Einstellungen laden")
         self.db = Database()
+        # Ergebnisse des DB-Worker-Threads kommen über after() in den Tk-Thread
+        self.db.worker.attach(self)
+        if self.settings.query_stats_enabled:
+            self.db.query_stats.enable(self.settings.slow_query_ms)
 
         self.create_menu()
         self.build_statusbar()
+        # erst nach dem ersten Zeichnen, der Programmstart selbst zählt nicht als Hänger
+        self.lag_monitor: LagMonitor | None = None
+        self.after_idle(self.start_lag_monitor)
 
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill=tk.BOTH, expand=True)
@@ -37,15 +55,26 @@ class App(tk.Tk):
         self.notebook.add(self.inventory_tab, text="Material")
         self.notebook.add(self.member_tab, text="Einsatzkräfte")
         self.notebook.add(self.kleidung_tab, text="Kleidung")
-        
+
+        # Tabs laden erst, wenn sie sichtbar werden; Änderungen an verdeckten Tabs setzen nur das Dirty-Flag
+        self._dirty_tabs: set[str] = set()
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        mark("Widgets")
+        if profile is not None:
+            # Start gilt als fertig, sobald der Material-Tab Zeilen zeigt (Laden läuft im DbWorker)
+            self.inventory_tab.first_show_hook = lambda: _report_startup(profile, "Erste Zeilen")
 
         if self.settings.last_db_path:
             try:
-                self.open_db(self.settings.last_db_path)
+                self.open_db(self.settings.last_db_path, profile=profile)
                 self.status_var.set(f"Zuletzt verwendete Datenbank geöffnet:{self.settings.last_db_path}")
             except Exception as ex:
                 messagebox.showwarning("Hinweis", f"Konnte letzte DB nicht öffnen: {ex}")
                 self.status_var.set("Zuletzt verwendete DB wurde nicht gefunden. Datei → Öffnen…")
+        if profile is not None and self.db.conn is None:
+            # ohne Datenbank gibt es keine Zeilen, dann zählt das leere Fenster
+            self.inventory_tab.first_show_hook = None
+            self.after_idle(_report_startup, profile, "Erstes Zeichnen")
 
     # -------------------------
     # Menu
@@ -54,52 +83,64 @@ class App(tk.Tk):
         menubar = tk.Menu(self)
 
         m_datei = tk.Menu(menubar, tearoff=0)
-        m_datei.add_command(label="Öffnen", command=self.menu_open)
+        self._add_command(m_datei, "Datei", label="Öffnen", command=self.menu_open)
+        self._add_command(m_datei, "Datei", label="Suchen…", accelerator="Strg+F", command=self.menu_search)
         m_datei.add_separator()
-        m_datei.add_command(label="Beenden", command=self.quit)
+        self._add_command(m_datei, "Datei", label="Beenden", command=self.quit)
         menubar.add_cascade(label="Datei", menu=m_datei)
 
         m_entries = tk.Menu(menubar, tearoff=0)
-        m_entries.add_command(label="Material hinzufügen", command=self.menu_add_inventory)
-        m_entries.add_command(label="Einsatzkräfte hinzufügen", command=self.menu_add_member)
-        m_entries.add_command(label="Kleidung hinzufügen", command=self.menu_add_kleidung)
+        self._add_command(m_entries, "Einträge", label="Material hinzufügen", command=self.menu_add_inventory)
+        self._add_command(m_entries, "Einträge", label="Einsatzkräfte hinzufügen", command=self.menu_add_member)
+        self._add_command(m_entries, "Einträge", label="Kleidung hinzufügen", command=self.menu_add_kleidung)
         
         menubar.add_cascade(label="Einträge", menu=m_entries)
 
         m_locations = tk.Menu(menubar, tearoff=0)
-        m_locations.add_command(label="Lagerorte verwalten", command=self.menu_manage_locations)
+        self._add_command(m_locations, "Lagerorte", label="Lagerorte verwalten", command=self.menu_manage_locations)
         menubar.add_cascade(label="Lagerorte", menu=m_locations)
 
         m_psacheck = tk.Menu(menubar, tearoff=0)
-        m_psacheck.add_command(label="Fahrzeuge", command=lambda: self.placeholder_dialog("PSA Check Fahrzeuge"))
-        m_psacheck.add_command(label="Einsatzkräfte", command=lambda: self.placeholder_dialog("PSA Check Einsatzkräfte"))
-        m_psacheck.add_command(label="Lagerort", command=self.menu_psa_check_depot)
+        self._add_command(m_psacheck, "PSA-Check", label="Fahrzeuge", command=lambda: self.placeholder_dialog("PSA Check Fahrzeuge"))
+        self._add_command(m_psacheck, "PSA-Check", label="Einsatzkräfte", command=lambda: self.placeholder_dialog("PSA Check Einsatzkräfte"))
+        self._add_command(m_psacheck, "PSA-Check", label="Lagerort", command=self.menu_psa_check_depot)
         menubar.add_cascade(label="PSA-Check", menu=m_psacheck)
 
         m_psa_soll_liste = tk.Menu(m_psacheck, tearoff=0)
-        m_psa_soll_liste.add_command(label="Check Fahrzeuge", command=lambda: self.placeholder_dialog("PSA Bedarf Berechnung"))
-        m_psa_soll_liste.add_command(label="Check Einsatzkräfte", command=lambda: self.placeholder_dialog("PSA Bedarf Berechnung"))
+        self._add_command(m_psa_soll_liste, "PSA Soll-Liste", label="Check Fahrzeuge", command=self.menu_vehicle_soll_ist)
+        self._add_command(m_psa_soll_liste, "PSA Soll-Liste", label="Check Einsatzkräfte", command=self.menu_member_psa)
         m_psa_soll_liste.add_separator()
-        m_psa_soll_liste.add_command(label="Fahrzeuge anpassen", command=self.menu_psa_soll_liste_fahrzeuge)
-        m_psa_soll_liste.add_command(label="Einsatzkräfte anpassen", command=self.menu_psa_soll_liste_einsatzkraefte)
+        self._add_command(m_psa_soll_liste, "PSA Soll-Liste", label="Fahrzeuge anpassen", command=self.menu_psa_soll_liste_fahrzeuge)
+        self._add_command(m_psa_soll_liste, "PSA Soll-Liste", label="Einsatzkräfte anpassen", command=self.menu_psa_soll_liste_einsatzkraefte)
         menubar.add_cascade(label="PSA Soll-Liste", menu=m_psa_soll_liste)
 
         m_print = tk.Menu(menubar, tearoff=0)
-        m_print.add_command(label="Listen Fahrzeuge", command=lambda: self.placeholder_dialog("Drucken Fahrzeuge"))
+        self._add_command(m_print, "Drucken", label="Listen Fahrzeuge", command=lambda: self.placeholder_dialog("Drucken Fahrzeuge"))
         m_print.add_separator()
-        m_print.add_command(label="Ausgabe Einsatzkräfte", command=self.open_print_dialog)
-        m_print.add_command(label="Rückgabe Einsatzkräfte", command=lambda: self.placeholder_dialog("Drucken Rückgabe Einsatzkräfte"))
+        self._add_command(m_print, "Drucken", label="Ausgabe Einsatzkräfte", command=self.open_print_dialog)
+        self._add_command(m_print, "Drucken", label="Rückgabe Einsatzkräfte", command=lambda: self.placeholder_dialog("Drucken Rückgabe Einsatzkräfte"))
         m_print.add_separator()
-        m_print.add_command(label="PSA-Check Listen", command=lambda: self.placeholder_dialog("Drucken PSA-Check Listen"))
+        self._add_command(m_print, "Drucken", label="PSA-Check Listen", command=lambda: self.placeholder_dialog("Drucken PSA-Check Listen"))
         menubar.add_cascade(label="Drucken", menu=m_print)
 
         m_settings = tk.Menu(menubar, tearoff=0)
-        m_settings.add_command(label="Farben PSA-Check", command=self.menu_settings)
+        self._add_command(m_settings, "Einstellung", label="Farben PSA-Check", command=self.menu_settings)
+        self._add_command(m_settings, "Einstellung", label="Abfrage-Statistik", command=self.menu_query_stats)
         m_settings.add_separator()
-        m_settings.add_command(label="Info", command=self.menu_help)
+        self._add_command(m_settings, "Einstellung", label="Info", command=self.menu_help)
         menubar.add_cascade(label="Einstellung", menu=m_settings)
 
         self.config(menu=menubar)
+        self.bind_all("<Control-f>", lambda _e: self._run_action("Strg+F", self.menu_search))
+
+    def _run_action(self, action: str, command):
+        with track(action):
+            command()
+
+    def _add_command(self, menu: tk.Menu, menu_title: str, label: str, command, **kwargs):
+        """menu.add_command, Aufruf wird für den LagMonitor als "Menü Titel → Eintrag" markiert."""
+        action = f"Menü {menu_title} → {label}"
+        menu.add_command(label=label, command=lambda: self._run_action(action, command), **kwargs)
 
     def placeholder_dialog(self, title: str):
         top = tk.Toplevel(self)
@@ -109,8 +150,24 @@ class App(tk.Tk):
 
     def build_statusbar(self):
         self.status_var = tk.StringVar(value="Keine Datenbank geöffnet. Datei → Öffnen…")
-        bar = ttk.Label(self, textvariable=self.status_var, anchor=tk.W)
+        # rechts: Kurzfassung der UI-Hänger (LagMonitor)
+        self.lag_var = tk.StringVar(value="")
+        bar = ttk.Frame(self)
         bar.pack(side=tk.BOTTOM, fill=tk.X)
+        ttk.Label(bar, textvariable=self.status_var, anchor=tk.W).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        ttk.Label(bar, textvariable=self.lag_var, anchor=tk.E).pack(side=tk.RIGHT)
+
+    def start_lag_monitor(self):
+        if not self.settings.lag_monitor_enabled:
+            return
+        self.lag_monitor = LagMonitor(
+            self,
+            threshold_ms=self.settings.lag_threshold_ms,
+            sample_stacks=self.settings.lag_stack_sampling,
+            log_path=LAG_LOG_FILE,
+            on_stall=lambda _stall: self.lag_var.set(self.lag_monitor.summary()),
+        )
+        self.lag_monitor.start()
 
     # -------------------------
     # Actions
@@ -131,12 +188,21 @@ class App(tk.Tk):
         except Exception as ex:
             messagebox.showerror("Fehler", f"DB konnte nicht geöffnet/angelegt werden: {ex}")
 
-    def open_db(self, path: str):
-        self.db.connect(path)
+    def open_db(self, path: str, profile: StartupProfile | None = None):
+        self.db.connect(path, pragmas=self.settings.db_pragmas, profile=profile)
         self.refresh_all()
+        if profile is not None:
+            profile.mark("Sichtbarer Tab")
         from settings.constants import APP_TITLE as TITLE  # avoid import cycle
         self.title(f"{TITLE} — {os.path.abspath(path)}")
 
+    def menu_search(self):
+        from app.ui.dialogs.search import GlobalSearchDialog
+        if not self.db.conn:
+            messagebox.showinfo("Hinweis", "Bitte zuerst eine Datenbank öffnen.")
+            return
+        GlobalSearchDialog(self, self.db)
+
     def menu_add_inventory(self):
         from app.ui.dialogs.inventory import AddInventoryDialog
         if not self.db.conn:
@@ -159,6 +225,7 @@ class App(tk.Tk):
         AddKleidungDialog(self, self.db, on_saved=self.refresh_kleidung)
 
     def menu_manage_locations(self):
+        from app.ui.dialogs.location import LocationManageDialog
         if not self.db.conn:
             messagebox.showinfo("Hinweis", "Bitte zuerst eine Datenbank öffnen.")
             return
@@ -171,42 +238,115 @@ class App(tk.Tk):
             return
         VehicleSetDialog(self, self.db)
 
+    def menu_vehicle_soll_ist(self):
+        from app.ui.dialogs.vehicle_soll_ist import VehicleSollIstDialog
+        if not self.db.conn:
+            messagebox.showinfo("Hinweis", "Bitte zuerst eine Datenbank öffnen.")
+            return
+        VehicleSollIstDialog(self, self.db)
+
+    def menu_member_psa(self):
+        from app.ui.dialogs.member_psa import MemberPsaDialog
+        if not self.db.conn:
+            messagebox.showinfo("Hinweis", "Bitte zuerst eine Datenbank öffnen.")
+            return
+        MemberPsaDialog(self, self.db)
+
     def menu_psa_soll_liste_einsatzkraefte(self):
         from app.ui.dialogs.psa_soll_liste import PlaceholderAbortDialog
         PlaceholderAbortDialog(self, "PSA Soll-Liste Einsatzkräfte", "Wird später implementiert.")
 
     def menu_psa_check_depot(self):
+        from app.ui.dialogs.psa_check_depot import DepotPsaCheckDialog
         if not self.db.conn:
             messagebox.showinfo("Hinweis", "Bitte zuerst eine Datenbank öffnen.")
             return
         DepotPsaCheckDialog(self, self.db, on_saved=self.refresh_inventory)
 
     def open_print_dialog(self):
+        from app.ui.dialogs.print_member import PrintExportDialog
         PrintExportDialog(self, self.db)
 
     def menu_settings(self):
+        from app.ui.dialogs.color_rules import ColorRulesDialog
         ColorRulesDialog(self, self.settings, on_save=self.refresh_inventory)
 
+    def menu_query_stats(self):
+        from app.ui.dialogs.query_stats import QueryStatsDialog
+        QueryStatsDialog(self, self.db, self.settings)
+
     def menu_help(self):
+        from app.ui.dialogs.about import AboutDialog
         AboutDialog(self)
 
-    def refresh_inventory(self):
-        self.inventory_tab.rebuild_color_tags()
-        self.inventory_tab.refresh()
+    # -------------------------
+    # Tabs (lazy)
+    # -------------------------
+    def _tab_visible(self, tab) -> bool:
+        return self.notebook.select() == str(tab)
+
+    def _refresh_tab(self, tab):
+        """Sichtbaren Tab sofort neu laden, verdeckten nur als veraltet markieren."""
+        if self._tab_visible(tab):
+            self._dirty_tabs.discard(str(tab))
+            tab.refresh()
+        else:
+            self._dirty_tabs.add(str(tab))
+
+    def _on_tab_changed(self, _event=None):
+        name = self.notebook.select()
+        if name in self._dirty_tabs:
+            self._dirty_tabs.discard(name)
+            self.nametowidget(name).refresh()
+
+    def refresh_inventory(self, changed_ids=None, removed_ids=None):
+        """
+        Ohne Argumente: Farbregeln + komplette Tabelle neu aufbauen.
+        Mit changed_ids/removed_ids: nur diese Zeilen aktualisieren (nach Dialog-Speichern).
+        Ist der Material-Tab verdeckt, wird er erst beim Anzeigen komplett neu geladen.
+        """
+        if changed_ids is None and removed_ids is None:
+            self.inventory_tab.rebuild_color_tags()
+            self._refresh_tab(self.inventory_tab)
+            return
+        if not self._tab_visible(self.inventory_tab) or str(self.inventory_tab) in self._dirty_tabs:
+            # verdeckt oder ohnehin veraltet -> Einzel-Updates lohnen nicht
+            self._refresh_tab(self.inventory_tab)
+            return
+        changed_ids = list(changed_ids or ())
+        removed_ids = list(removed_ids or ())
+        if len(changed_ids) + len(removed_ids) > INCREMENTAL_REFRESH_LIMIT:
+            self.inventory_tab.refresh()
+            return
+        for id_val in removed_ids:
+            self.inventory_tab.remove_row(id_val)
+        for id_val in changed_ids:
+            self.inventory_tab.upsert_row(id_val)
 
     def refresh_member(self):
-        self.member_tab.refresh()
+        self._refresh_tab(self.member_tab)
 
     def refresh_kleidung(self):
-        self.kleidung_tab.refresh()
+        self._refresh_tab(self.kleidung_tab)
 
     def refresh_all(self):
-        self.refresh_inventory()
-        self.refresh_member()
-        self.refresh_kleidung()
+        """Alle Tabs veraltet (z.B. andere DB geöffnet); geladen wird nur der sichtbare."""
+        self.inventory_tab.rebuild_color_tags()
+        for tab in (self.inventory_tab, self.member_tab, self.kleidung_tab):
+            self._dirty_tabs.add(str(tab))
+        self._on_tab_changed()
+
+def _report_startup(profile: StartupProfile, phase: str):
+    profile.mark(phase)
+    print("Startzeit nach Phasen (--profile-startup):")
+    print(profile.report())
+
 
 if __name__ == "__main__":
     from app.core.utils import create_folder
+    profile = StartupProfile(_START) if "--profile-startup" in sys.argv else None
+    if profile is not None:
+        profile.mark("Imports")
     create_folder("./output")
-    app = App()
+    app = App(profile=profile)
     app.mainloop()
@@ -1,7 +1,7 @@
 import os
 import json
 import configparser
-from .constants import SETTINGS_FILE
+from .constants import SETTINGS_FILE, DB_PRAGMAS_DEFAULT, SLOW_QUERY_MS_DEFAULT, LAG_THRESHOLD_MS_DEFAULT
 
 class AppSettings:
     def __init__(self, path: str = SETTINGS_FILE):
@@ -10,6 +10,15 @@ class AppSettings:
         self.last_db_path: str | None = None
         # list of dicts: {"description": str, "hex": str, "months": int}
         self.color_rules: list[dict] = []
+        # SQLite-PRAGMAs für Database.connect (Abschnitt [database])
+        self.db_pragmas: dict = dict(DB_PRAGMAS_DEFAULT)
+        # Abfrage-Statistik der Database (Abschnitt [diagnostics])
+        self.query_stats_enabled: bool = False
+        self.slow_query_ms: int = SLOW_QUERY_MS_DEFAULT
+        # Hänger der Tk-Ereignisschleife messen, optional mit Stack-Proben
+        self.lag_monitor_enabled: bool = True
+        self.lag_threshold_ms: int = LAG_THRESHOLD_MS_DEFAULT
+        self.lag_stack_sampling: bool = False
         self.load()
 
     def load(self):
@@ -22,6 +31,22 @@ class AppSettings:
                     self.color_rules = json.loads(rules_json)
                 except Exception:
                     self.color_rules = []
+            if self.config.has_section("database"):
+                for key in DB_PRAGMAS_DEFAULT:
+                    value = self.config.get("database", key, fallback="").strip()
+                    if value:
+                        self.db_pragmas[key] = value
+            self.query_stats_enabled = self.config.getboolean("diagnostics", "query_stats", fallback=False)
+            try:
+                self.slow_query_ms = self.config.getint("diagnostics", "slow_query_ms", fallback=SLOW_QUERY_MS_DEFAULT)
+            except ValueError:
+                self.slow_query_ms = SLOW_QUERY_MS_DEFAULT
+            self.lag_monitor_enabled = self.config.getboolean("diagnostics", "lag_monitor", fallback=True)
+            self.lag_stack_sampling = self.config.getboolean("diagnostics", "lag_stack_sampling", fallback=False)
+            try:
+                self.lag_threshold_ms = self.config.getint("diagnostics", "lag_threshold_ms", fallback=LAG_THRESHOLD_MS_DEFAULT)
+            except ValueError:
+                self.lag_threshold_ms = LAG_THRESHOLD_MS_DEFAULT
         if not self.color_rules:
             # sensible defaults
             self.color_rules = [
@@ -37,6 +62,17 @@ class AppSettings:
             self.config.add_section("app")
         if not self.config.has_section("colors"):
             self.config.add_section("colors")
+        if not self.config.has_section("database"):
+            self.config.add_section("database")
+        for key, value in self.db_pragmas.items():
+            self.config.set("database", key, str(value))
+        if not self.config.has_section("diagnostics"):
+            self.config.add_section("diagnostics")
+        self.config.set("diagnostics", "query_stats", "1" if self.query_stats_enabled else "0")
+        self.config.set("diagnostics", "slow_query_ms", str(self.slow_query_ms))
+        self.config.set("diagnostics", "lag_monitor", "1" if self.lag_monitor_enabled else "0")
+        self.config.set("diagnostics", "lag_threshold_ms", str(self.lag_threshold_ms))
+        self.config.set("diagnostics", "lag_stack_sampling", "1" if self.lag_stack_sampling else "0")
         if self.last_db_path:
             self.config.set("app", "last_db_path", self.last_db_path)
         self.config.set("colors", "rules", json.dumps(self.color_rules, ensure_ascii=False))
@@ -7,6 +7,22 @@ APP_VERSION = "Version 0.0.2"  # +psa/kleidung
 SETTINGS_FILE = "settings.cfg"
 ID_LIST_FILE = "./output/id_list.csv"
 
+# SQLite-Verbindungsprofil, überschreibbar in settings.cfg, Abschnitt [database]
+DB_PRAGMAS_DEFAULT = {
+    "journal_mode": "WAL",      # Leser (Exporte) blockieren keine Schreibzugriffe
+    "synchronous": "NORMAL",    # in WAL sicher, spart fsync je Commit
+    "cache_size": "-16000",     # negativ = KiB (16 MB)
+    "mmap_size": "67108864",    # 64 MB
+    "temp_store": "MEMORY",
+    "busy_timeout": "5000",     # ms
+}
+
+# Abfrage-Statistik (Einstellung → Abfrage-Statistik), Abschnitt [diagnostics]
+SLOW_QUERY_MS_DEFAULT = 100  # langsamer Aufruf -> Slow-Log mit EXPLAIN QUERY PLAN
+# Hänger-Überwachung der Oberfläche (app.core.lag_monitor), ebenfalls [diagnostics]
+LAG_THRESHOLD_MS_DEFAULT = 250
+LAG_LOG_FILE = "./output/ui_lag.log"
+
 # -----------------------------
 # Database column definitions
 # -----------------------------
@@ -27,6 +43,12 @@ INVENTORY_COLUMNS = [
     ("psa_check", "INTEGER")       # 0/1
 ]
 
+# inventory: abgeleitete Spalten, werden beim Schreiben vom Database-Layer berechnet
+INVENTORY_DERIVED_COLUMNS = [
+    ("expiry_date", "TEXT"),       # manufactury_date + life_time, YYYY-MM-DD
+    ("next_check_due", "TEXT"),    # check_date + 12 Monate, YYYY-MM-DD
+]
+
 # member
 MEMBER_COLUMNS = [
     ("ID", "TEXT PRIMARY KEY"),
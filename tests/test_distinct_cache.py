@@ -0,0 +1,38 @@
+from app.db.database import Database
+
+
+def _open(path) -> Database:
+    db = Database()
+    db.connect(str(path))
+    return db
+
+
+def _close(db: Database):
+    db.worker.stop()
+    db.conn.close()
+
+
+def test_distinct_values_follow_table_version(tmp_path):
+    db = _open(tmp_path / "distinct.db")
+    try:
+        db.insert_inventory({"ID": "A01", "product_type": "Helm"})
+        db.insert_member({"ID": "NR01", "first_name": "Anna"})
+        types = db.get_distinct_values("inventory", "product_type")
+        names = db.get_distinct_values("member", "first_name")
+        assert types == ["Helm"]
+
+        # an Database vorbei: Tabellenversion unverändert, der Cache bleibt
+        db.conn.execute("INSERT INTO inventory (ID, product_type) VALUES ('A02', 'Seil')")
+        assert db.get_distinct_values("inventory", "product_type") is types
+
+        version = db.table_version("inventory")
+        db.insert_inventory({"ID": "A03", "product_type": "Gurt"})
+        assert db.table_version("inventory") == version + 1
+        assert db.get_distinct_values("inventory", "product_type") == ["Gurt", "Helm", "Seil"]
+        # andere Tabellen behalten ihren Cache
+        assert db.get_distinct_values("member", "first_name") is names
+
+        db.update_member("NR01", {"first_name": "Berta"})
+        assert db.get_distinct_values("member", "first_name") == ["Berta"]
+    finally:
+        _close(db)
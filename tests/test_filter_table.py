@@ -0,0 +1,58 @@
+import pytest
+
+from tests.tk_fakes import filter_table
+
+ROWS = [
+    ("1", ["Karabiner", "Depot"], ()),
+    ("2", ["Karte", "HLF"], ()),
+    ("3", ["Seil", "Depot"], ()),
+    ("4", ["KARABINER", "HLF"], ()),
+]
+
+
+def _loaded(filters: dict):
+    """Tabelle wie nach einem Neuladen mit `filters`."""
+    table = filter_table(["type", "location"])
+    rows = [
+        row for row in ROWS
+        if all(needle.lower() in str(row[1][table.columns.index(col)]).lower() for col, needle in filters.items())
+    ]
+    table.set_rows(rows, applied_filters=filters)
+    return table
+
+
+def _iids(table) -> list[str]:
+    return [iid for iid, _values, _tags in table._rows]
+
+
+def test_nothing_loaded_needs_refresh():
+    table = filter_table(["type", "location"])
+    table.set_rows(ROWS)  # ohne applied_filters: Stand der Filter unbekannt
+    assert not table._narrow_rows({"type": "kara"})
+
+
+@pytest.mark.parametrize("new_filters, expected", [
+    ({"type": "Karab"}, ["1", "4"]),                 # längerer Text
+    ({"type": "xkarx"}, []),                         # enthält den alten Text
+    ({"type": "KAR"}, ["1", "2", "4"]),               # gleicher Filter, andere Schreibweise
+    ({"type": "kar", "location": "hlf"}, ["2", "4"]),  # zusätzliche Spalte
+])
+def test_narrows_when_new_filter_extends_old(new_filters, expected):
+    table = _loaded({"type": "kar"})
+    assert table._narrow_rows(new_filters)
+    assert _iids(table) == expected
+    assert sorted(table.tree.items) == expected
+    assert table._applied_filters == new_filters
+
+
+@pytest.mark.parametrize("new_filters", [
+    {"type": "ka"},                        # kürzer
+    {"type": "arte"},                      # anderer Text
+    {},                                    # Filter gelöscht
+    {"location": "hlf"},                   # Filter in anderer Spalte ersetzt
+])
+def test_reload_when_new_filter_is_not_an_extension(new_filters):
+    table = _loaded({"type": "kar"})
+    assert not table._narrow_rows(new_filters)
+    assert _iids(table) == ["1", "2", "4"]
+    assert table._applied_filters == {"type": "kar"}
@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+from app.core.id_allocator import ITEM_ID_DIGITS, IdAllocator
+from app.core.utils import generate_next_valid_id_item, generate_next_valid_id_member
+from benchmarks.id_allocator import legacy_next_item_id, legacy_next_member_id
+
+
+def _item_ids(indexes) -> list[str]:
+    encoder = IdAllocator.for_items([])
+    return [encoder.encode(i) for i in indexes]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_next_item_id_matches_legacy_generator(seed):
+    rnd = random.Random(seed)
+    used = _item_ids(i for i in range(1, 400) if rnd.random() < 0.95)
+    # längere IDs zählen über ihre ersten drei Zeichen, fremde Zeichen belegen nichts
+    used += [f"{used[0]}-2", "0O1", "abc", ""]
+    rnd.shuffle(used)
+    assert generate_next_valid_id_item(used) == legacy_next_item_id(used)
+
+
+def test_next_member_id_matches_legacy_generator():
+    used = ["NR01", "NR02", "NR03-A", "NR05", "XY04", "NR4"]
+    assert generate_next_valid_id_member(used) == legacy_next_member_id(used) == "NR04"
+
+
+def test_exhausted_id_space_returns_minus_one():
+    members = [f"NR{i:02d}" for i in range(1, 100)]
+    assert generate_next_valid_id_member(members) == legacy_next_member_id(members) == -1
+    items = _item_ids(range(1, len(ITEM_ID_DIGITS) ** 3))
+    assert generate_next_valid_id_item(items) == -1
+    with pytest.raises(ValueError):
+        IdAllocator.for_items(items[1:]).allocate(2)
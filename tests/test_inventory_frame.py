@@ -0,0 +1,136 @@
+import random
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.core.inventory_frame import TAG_DEPOT, TAG_EXPIRY
+from app.core.utils import expiry_from_mfg, months_until_expiry, parse_date
+from app.db.database import Database
+
+COLOR_RULES = [{"months": 3, "hex": "#FFA500"}, {"months": 1, "hex": "#FF0000"}, {"months": 6, "hex": "#FFFF00"}]
+
+
+def _open(path) -> Database:
+    db = Database()
+    db.connect(str(path))
+    return db
+
+
+def _close(db: Database):
+    db.worker.stop()
+    db.conn.close()
+
+
+def _format_value(db: Database):
+    """Wie InventoryTab.format_value."""
+    def format_value(col, v):
+        if col in ("psa_check",):
+            return "Ja" if str(v) == "1" else "Nein"
+        if col == "location" and v not in (None, ""):
+            location = str(v).strip()
+            member_name = db.member_names.name_for_location(location)
+            if member_name:
+                return f"{location} ({member_name})"
+        return v if v is not None else ""
+    return format_value
+
+
+def _legacy_tag(row) -> str | None:
+    """Die frühere Zeile-für-Zeile-Auswahl aus InventoryTab.refresh (vor InventoryFrame)."""
+    expiry = expiry_from_mfg(row)
+    if expiry and expiry <= date.today():
+        return "expiry_violation"
+    if "depot" in str(row["location"] or "").lower():
+        return "depot"
+    check_date = parse_date(row["check_date"]) if row["check_date"] else None
+    if check_date:
+        months_to_check = months_until_expiry(check_date)
+        for idx, rule in enumerate(sorted(COLOR_RULES, key=lambda r: int(r.get("months", 0)))):
+            if months_to_check <= int(rule.get("months", 0)):
+                return f"rule_{idx}"
+    return None
+
+
+def _tag_name(code: int) -> str | None:
+    if code == TAG_EXPIRY:
+        return "expiry_violation"
+    if code == TAG_DEPOT:
+        return "depot"
+    return f"rule_{code}" if code < len(COLOR_RULES) else None
+
+
+def _random_date(rnd: random.Random, days: int):
+    value = rnd.random()
+    if value < 0.1:
+        return None
+    if value < 0.15:
+        return "kaputt"
+    return (date.today() + timedelta(days=rnd.randint(-days, days // 4))).isoformat()
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = _open(tmp_path / "frame.db")
+    rnd = random.Random(3)
+    db.insert_member({"ID": "NR01", "first_name": "Anna", "last_name": "Berg"})
+    db.insert_inventory_many([
+        {
+            "ID": f"{i:04d}",
+            "product_type": rnd.choice(["Helm", "Gurt", "Seil", None]),
+            "producer": rnd.choice(["Petzl", "Edelrid", ""]),
+            "location": rnd.choice(["Depot", "HLF/G1", "/NR01", "/NR02", None]),
+            "manufactury_date": _random_date(rnd, 15 * 365),
+            "check_date": _random_date(rnd, 2 * 365),
+            "life_time": rnd.choice([None, 1, 5, 10]),
+            "psa_check": rnd.choice([0, 1, None]),
+        }
+        for i in range(500)
+    ])
+    yield db
+    _close(db)
+
+
+def test_row_tags_match_legacy_logic(db):
+    frame = db.inventory_frame
+    codes = frame.row_tag_codes(COLOR_RULES)
+    rows = {r["ID"]: r for r in db.fetch_all("inventory")}
+    assert len(frame) == len(rows)
+    for id_val, code in zip(frame.ids, codes.tolist()):
+        assert _tag_name(code) == _legacy_tag(rows[id_val]), id_val
+    positions = [7, 3, 42]
+    assert frame.row_tag_codes(COLOR_RULES, positions=positions).tolist() == codes[positions].tolist()
+
+
+@pytest.mark.parametrize("filters", [
+    {"product_type": "hel"},
+    {"location": "anna"},
+    {"location": "nr0", "producer": "pet"},
+    {"psa_check": "ja"},
+    {"psa_check": "n"},
+    {"psa_check": "a"},
+    {"check_date": str(date.today().year)},
+    {"life_time": "1"},
+    {"product_type": "xyz"},
+])
+def test_filter_mask_matches_row_by_row(db, filters):
+    format_value = _format_value(db)
+    frame = db.inventory_frame
+    expected = [
+        r["ID"] for r in db.fetch_all("inventory")
+        if all(needle.lower() in str(format_value(col, r[col])).lower() for col, needle in filters.items())
+    ]
+    found = [frame.ids[pos] for pos in np.flatnonzero(frame.filter_mask(filters, format_value))]
+    assert sorted(found) == sorted(expected)
+
+
+def test_frame_follows_database_writes(db):
+    frame = db.inventory_frame
+    assert len(frame) == 500
+    db.update_inventory("0001", {"product_type": "Leiter", "location": "Depot"})
+    db.delete_inventory("0002")
+    db.insert_inventory({"ID": "X001", "product_type": "Leiter"})
+    mask = frame.filter_mask({"product_type": "leiter"}, _format_value(db))
+    assert sorted(frame.ids[pos] for pos in np.flatnonzero(mask)) == ["0001", "X001"]
+    assert frame.position_of("0002") is None
+    assert frame.row_tag_codes(COLOR_RULES, positions=[frame.position_of("0001")]).tolist() == [TAG_DEPOT]
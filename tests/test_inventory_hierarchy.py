@@ -0,0 +1,62 @@
+import itertools
+import random
+
+from app.db.database import Database
+
+
+def _open(path) -> Database:
+    db = Database()
+    db.connect(str(path))
+    return db
+
+
+def _close(db: Database):
+    db.worker.stop()
+    db.conn.close()
+
+
+def _sql_values(db: Database, column, location=None, product_type=None, property_1=None) -> list[str]:
+    """Die frühere Abfrage von get_inventory_distinct_by_filters (vor InventoryHierarchy)."""
+    query = [
+        f"SELECT DISTINCT {column} FROM inventory",
+        f"WHERE {column} IS NOT NULL AND TRIM({column}) <> ''",
+    ]
+    params = []
+    for col, value in (("location", location), ("product_type", product_type), ("property_1", property_1)):
+        if value:
+            query.append(f"AND {col} = ?")
+            params.append(value)
+    query.append(f"ORDER BY {column}")
+    return [row[0] for row in db.conn.execute(" ".join(query), params)]
+
+
+def test_hierarchy_matches_sql(tmp_path):
+    db = _open(tmp_path / "hierarchy.db")
+    try:
+        rnd = random.Random(7)
+        choices = {
+            "location": ["Depot", "HLF/G1", "/NR01", None, ""],
+            "product_type": ["Helm", "Gurt", "Seil", None, " "],
+            "property_1": ["rot", "blau", "L", None, ""],
+            "property_2": ["a", "b", None, "  "],
+        }
+        db.insert_inventory_many([
+            {"ID": f"{i:04d}", **{col: rnd.choice(values) for col, values in choices.items()}}
+            for i in range(400)
+        ])
+        for column in choices:
+            for location, product_type, property_1 in itertools.product(
+                choices["location"], choices["product_type"], choices["property_1"]
+            ):
+                assert db.get_inventory_distinct_by_filters(column, location, product_type, property_1) == \
+                    _sql_values(db, column, location, product_type, property_1)
+        assert db.inventory_hierarchy.count() == 400
+        assert db.inventory_hierarchy.count(location="Depot", product_type="Helm") == db.conn.execute(
+            "SELECT COUNT(*) FROM inventory WHERE location = 'Depot' AND product_type = 'Helm'"
+        ).fetchone()[0]
+
+        # Schreibzugriff über Database => Baum wird neu geladen
+        db.insert_inventory({"ID": "X001", "location": "RW", "product_type": "Leiter"})
+        assert db.get_inventory_distinct_by_filters("product_type", "RW") == ["Leiter"]
+    finally:
+        _close(db)
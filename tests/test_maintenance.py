@@ -0,0 +1,90 @@
+import sqlite3
+
+from app.db.database import Database
+
+
+def _open(path) -> Database:
+    db = Database()
+    db.connect(str(path))
+    return db
+
+
+def _close(db: Database):
+    db.worker.stop()
+    db.conn.close()
+
+
+def test_connect_backfills_rows_written_outside_database(tmp_path):
+    path = tmp_path / "derived.db"
+    _close(_open(path))
+    # wie migrate_db.py oder die sqlite-CLI: ohne expiry_date/next_check_due
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "INSERT INTO inventory (ID, manufactury_date, life_time, check_date) "
+        "VALUES ('A01', '2010-01-01', 10, '2024-05-01'), ('A02', 'kaputt', 10, NULL)"
+    )
+    conn.commit()
+    conn.close()
+
+    db = _open(path)
+    rows = {r["ID"]: (r["expiry_date"], r["next_check_due"]) for r in db.conn.execute("SELECT * FROM inventory")}
+    _close(db)
+    assert rows["A01"] == ("2020-01-01", "2025-05-01")
+    assert rows["A02"] == (None, None)
+
+
+def test_reset_catches_rows_imported_after_this_years_reset(tmp_path):
+    from datetime import date
+
+    path = tmp_path / "psa.db"
+    _close(_open(path))  # Reset für dieses Jahr ist gelaufen
+    last_year = f"{date.today().year - 1:04d}-06-01"
+    this_year = f"{date.today().year:04d}-01-15"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "INSERT INTO inventory (ID, check_date, psa_check) VALUES ('B01', ?, 1), ('B02', ?, 1)",
+        (last_year, this_year),
+    )
+    conn.commit()
+    conn.close()
+
+    db = _open(path)
+    plan = db.explain_query_plan(
+        "SELECT ID FROM inventory WHERE psa_check = 1 AND check_date < ?", (this_year,)
+    )
+    flags = {r["ID"]: r["psa_check"] for r in db.conn.execute("SELECT ID, psa_check FROM inventory")}
+    _close(db)
+    assert flags == {"B01": 0, "B02": 1}
+    assert any("idx_inventory_psa_check_date" in line for line in plan)
+
+
+def test_connect_without_expired_checks_does_not_write(tmp_path):
+    path = tmp_path / "locked.db"
+    _close(_open(path))
+    other = sqlite3.connect(path, timeout=0)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        db = Database()
+        db.connect(str(path), pragmas={"busy_timeout": "0"})
+        _close(db)
+    finally:
+        other.rollback()
+        other.close()
+
+
+def test_unparseable_dates_are_not_reparsed_on_every_connect(tmp_path, monkeypatch):
+    path = tmp_path / "bad_dates.db"
+    _close(_open(path))
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO inventory (ID, check_date) VALUES ('C01', 'irgendwann')")
+    conn.commit()
+    conn.close()
+
+    calls = []
+    original = Database.backfill_inventory_derived
+    monkeypatch.setattr(
+        Database, "backfill_inventory_derived", lambda self, where=None: calls.append(where) or original(self, where)
+    )
+    _close(_open(path))
+    _close(_open(path))
+    assert len(calls) == 1
@@ -0,0 +1,55 @@
+from app.db.database import Database
+
+
+def _open(path) -> Database:
+    db = Database()
+    db.connect(str(path))
+    return db
+
+
+def _close(db: Database):
+    db.worker.stop()
+    db.conn.close()
+
+
+def test_lookup_refreshes_after_member_writes(tmp_path):
+    db = _open(tmp_path / "names.db")
+    try:
+        lookup = db.member_names
+        db.insert_member({"ID": "NR01", "first_name": " Anna ", "last_name": "Berg"})
+        db.insert_member({"ID": "NR02"})  # ohne Namen: kein Eintrag
+        assert lookup.name_for_location("/NR01") == "Anna Berg"
+        assert lookup.name_by_id() == {"NR01": "Anna Berg", "/NR01": "Anna Berg"}
+        assert lookup.format_location(" /NR01 ") == "/NR01 (Anna Berg)"
+        assert lookup.format_location("Depot") == "Depot"
+
+        # an Database vorbei geschrieben: gecachter Stand bleibt bis zur Invalidierung
+        db.conn.execute("UPDATE member SET first_name = 'Extern' WHERE ID = 'NR01'")
+        assert lookup.name_for_location("/NR01") == "Anna Berg"
+
+        db.update_member("NR02", {"first_name": "Ben", "last_name": "All"})
+        assert lookup.name_for_location("/NR01") == "Extern Berg"
+        assert lookup.name_for_location("/NR02") == "Ben All"
+        assert [m["ID"] for m in lookup.members()] == ["NR02", "NR01"]
+
+        db.delete_member("NR01")
+        assert lookup.name_for_location("/NR01") is None
+    finally:
+        _close(db)
+
+
+def test_inventory_display_follows_member_names(tmp_path):
+    db = _open(tmp_path / "names.db")
+    try:
+        db.insert_member({"ID": "NR01", "first_name": "Anna", "last_name": "Berg"})
+        db.insert_inventory({"ID": "A01", "location": "/NR01"})
+        frame = db.inventory_frame
+
+        def format_value(col, value):
+            return db.member_names.format_location(value) if col == "location" else value
+
+        assert frame.display_values("location", format_value) == ["/NR01 (Anna Berg)"]
+        db.update_member("NR01", {"first_name": "Anna", "last_name": "Klein"})
+        assert frame.display_values("location", format_value) == ["/NR01 (Anna Klein)"]
+    finally:
+        _close(db)
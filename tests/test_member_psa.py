@@ -0,0 +1,49 @@
+from app.core.member_psa import compute_member_psa
+from app.db.database import Database
+
+
+def _open(path) -> Database:
+    db = Database()
+    db.connect(str(path))
+    return db
+
+
+def _close(db: Database):
+    db.worker.stop()
+    db.conn.close()
+
+
+def test_member_psa_lines(tmp_path):
+    db = _open(tmp_path / "member_psa.db")
+    try:
+        db.insert_member({"ID": "NR01", "first_name": "Anna", "last_name": "Berg", "ET_SO": 1, "LR": 1})
+        db.insert_member({"ID": "NR02", "first_name": "Ben", "last_name": "All"})  # ohne Rollen und Material
+        db.insert_psa({"count": 1, "type": "Helm", "property_1": "", "ET_SO": 1})
+        db.insert_psa({"count": 2, "type": "Helm", "property_1": None, "LR": 1})  # MAX über die Rollen
+        db.insert_psa({"count": 1, "type": "Jacke", "property_1": "XL", "ET_SO": 1})
+        db.insert_psa({"count": 1, "type": "Handschuh", "EL": 1})  # keine Rolle von NR01
+        with db.conn:
+            db.conn.executemany(
+                "INSERT INTO inventory (ID, product_type, property_1, location) VALUES (?, ?, ?, ?)",
+                [
+                    ("A01", "Helm", "rot", "/NR01"),  # leeres property_1 in psa passt auf jeden Wert
+                    ("A02", "Helm", "blau", "/NR01"),
+                    ("A03", "Jacke", "L", "/NR01"),
+                    ("A04", "Helm", "rot", "/NR03"),
+                ],
+            )
+        lines = [
+            (r["member_id"], r["product_type"], r["property_1"], r["property_2"], r["soll"], r["ist"])
+            for r in db.fetch_member_psa_lines()
+        ]
+        assert lines == [
+            ("NR01", "Helm", "", "", 2, 2),
+            ("NR01", "Jacke", "L", "", 0, 1),
+            ("NR01", "Jacke", "XL", "", 1, 0),
+        ]
+        (member,) = compute_member_psa(db)
+        assert member["name"] == "Anna Berg"
+        assert member["roles"] == ["ET_SO", "LR"]
+        assert (member["soll_total"], member["ist_total"], member["missing_total"], member["surplus_total"]) == (3, 3, 1, 1)
+    finally:
+        _close(db)
@@ -0,0 +1,79 @@
+import pytest
+
+from app.db.database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database()
+    db.connect(str(tmp_path / "plans.db"))
+    db.insert_inventory_many([
+        {"ID": f"{i:05d}", "product_type": f"Typ{i % 7}", "property_1": f"P{i % 5}", "property_2": f"Q{i % 3}",
+         "product_name": "Modell", "serial_number": f"SN{i}", "location": f"/NR{i % 20:02d}" if i % 2 else "Depot",
+         "check_date": "2025-03-01", "psa_check": 0}
+        for i in range(500)
+    ])
+    for i in range(50):
+        db.insert_kleidung({"type": f"Jacke{i % 4}", "gender": "m", "size": str(40 + i % 6), "location": "Depot"})
+    db.conn.commit()
+    yield db
+    db.worker.stop()
+    db.conn.close()
+
+
+def _traced_statements(db, call) -> list[str]:
+    """SQL-Anweisungen, die `call()` auf der Verbindung ausführt (Parameter eingesetzt)."""
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        db.conn.set_trace_callback(None)
+    return [s for s in statements if s.lstrip().upper().startswith(("SELECT", "WITH"))]
+
+
+def _assert_indexed(db, call, table: str):
+    statements = _traced_statements(db, call)
+    assert statements, "keine SELECT-Anweisung ausgeführt"
+    for sql in statements:
+        plan = db.explain_query_plan(sql)
+        on_table = [line for line in plan if f" {table}" in f" {line}"]
+        assert on_table, (sql, plan)
+        # reiner Tabellen-Scan wäre "SCAN <table>" ohne Index
+        assert f"SCAN {table}" not in plan, (sql, plan)
+        assert all("SEARCH" in line or "INDEX" in line for line in on_table), (sql, plan)
+
+
+def test_fetch_inventory_for_psa_check_uses_index(db):
+    _assert_indexed(db, lambda: db.fetch_inventory_for_psa_check("Depot"), "inventory")
+    _assert_indexed(db, lambda: db.fetch_inventory_for_psa_check("Depot", "Typ1", "P1", "Q1"), "inventory")
+
+
+def test_get_inventory_for_member_uses_index(db):
+    _assert_indexed(db, lambda: db.get_inventory_for_member("/NR01", ["ID", "product_type"]), "inventory")
+
+
+def test_inventory_cascades_use_index(db):
+    _assert_indexed(db, lambda: db.get_inventory_distinct_by_filters("product_type", location="Depot"), "inventory")
+    db.inventory_hierarchy.reset()
+    _assert_indexed(db, lambda: db.get_inventory_property1_for_type("Typ1"), "inventory")
+    db.inventory_hierarchy.reset()
+    _assert_indexed(db, lambda: db.get_inventory_property2_for_type_and_property1("Typ1", "P1"), "inventory")
+    _assert_indexed(db, db.get_inventory_product_types, "inventory")
+
+
+def test_find_inventory_by_code_uses_index(db):
+    _assert_indexed(db, lambda: db.find_inventory_by_code("SN42"), "inventory")
+    _assert_indexed(db, lambda: db.find_inventory_by_code("sn42"), "inventory")
+
+
+def test_find_inventory_by_code_ignores_case(db):
+    db.conn.execute("UPDATE inventory SET serial_number = 'Ab-12x' WHERE ID = '00007'")
+    assert [r["ID"] for r in db.find_inventory_by_code(" aB-12X ")] == ["00007"]
+    assert [r["ID"] for r in db.find_inventory_by_code("sn42")] == ["00042"]
+
+
+def test_kleidung_lookups_use_index(db):
+    _assert_indexed(db, db.fetch_all_kleidung, "kleidung")
+    _assert_indexed(db, lambda: db.fetch_kleidung_by_rowid(1), "kleidung")
+    _assert_indexed(db, lambda: db.query_kleidung({"type": "Jacke1"}), "kleidung")
@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+import main
+from app.db.database import Database
+from app.ui.tabs.inventory_tab import InventoryTab
+from settings.constants import INVENTORY_COLUMNS
+from tests.tk_fakes import filter_table
+
+
+def _open(path) -> Database:
+    db = Database()
+    db.connect(str(path))
+    return db
+
+
+def _close(db: Database):
+    db.worker.stop()
+    db.conn.close()
+
+
+def _inventory_tab(db: Database) -> InventoryTab:
+    """InventoryTab ohne Widgets, die Tabelle aus tk_fakes."""
+    tab = InventoryTab.__new__(InventoryTab)
+    tab.db = db
+    tab.settings = SimpleNamespace(color_rules=[])
+    tab.columns = [c for c, _ in INVENTORY_COLUMNS]
+    tab.table = filter_table(tab.columns)
+    return tab
+
+
+def test_upsert_row_follows_filters(tmp_path):
+    db = _open(tmp_path / "rows.db")
+    try:
+        db.insert_inventory({"ID": "A01", "product_type": "Helm", "location": "Depot"})
+        tab = _inventory_tab(db)
+        tab.upsert_row("A01")  # Komplett-Laden steht noch aus und bringt die Zeile mit
+        assert tab.table.row_count == 0
+        db.inventory_frame.sync()
+        tab.table.filter_vars["product_type"].set("helm")
+        tab.upsert_row("A01")
+        assert tab.table.get_row("A01")[1][tab.columns.index("location")] == "Depot"
+        assert tab.table.get_row("A01")[2] == ("depot",)
+
+        # passt nicht mehr zum Filter -> raus
+        db.update_inventory("A01", {"product_type": "Seil", "location": "Depot"})
+        tab.upsert_row("A01")
+        assert tab.table.get_row("A01") is None
+
+        db.update_inventory("A01", {"product_type": "Helm", "location": "HLF"})
+        tab.upsert_row("A01")
+        assert tab.table.get_row("A01")[2] == ()
+
+        db.delete_inventory("A01")
+        tab.upsert_row("A01")
+        assert tab.table.row_count == 0
+    finally:
+        _close(db)
+
+
+class _RecordingTab:
+    def __init__(self):
+        self.calls = []
+
+    def __str__(self):
+        return ".inventory"
+
+    def refresh(self):
+        self.calls.append("refresh")
+
+    def remove_row(self, id_val):
+        self.calls.append(("remove", id_val))
+
+    def upsert_row(self, id_val):
+        self.calls.append(("upsert", id_val))
+
+
+def _app(selected: str = ".inventory"):
+    app = main.App.__new__(main.App)
+    app.inventory_tab = _RecordingTab()
+    app.notebook = SimpleNamespace(select=lambda: selected)
+    app._dirty_tabs = set()
+    return app
+
+
+def test_refresh_inventory_updates_single_rows():
+    app = _app()
+    app.refresh_inventory(changed_ids=["A01", "A02"], removed_ids=["A03"])
+    assert app.inventory_tab.calls == [("remove", "A03"), ("upsert", "A01"), ("upsert", "A02")]
+
+
+def test_refresh_inventory_falls_back_to_full_refresh():
+    app = _app()
+    ids = [f"{i:04d}" for i in range(main.INCREMENTAL_REFRESH_LIMIT)]
+    app.refresh_inventory(changed_ids=ids)
+    assert app.inventory_tab.calls == [("upsert", id_val) for id_val in ids]
+
+    app = _app()
+    app.refresh_inventory(changed_ids=ids, removed_ids=["X001"])
+    assert app.inventory_tab.calls == ["refresh"]
+
+
+def test_refresh_inventory_hidden_tab_is_marked_dirty():
+    app = _app(selected=".member")
+    app.refresh_inventory(changed_ids=["A01"])
+    assert app.inventory_tab.calls == []
+    assert app._dirty_tabs == {".inventory"}
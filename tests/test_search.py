@@ -0,0 +1,112 @@
+import sqlite3
+
+import pytest
+
+from app.db import search
+from app.db.database import Database
+
+
+def _open(path) -> Database:
+    db = Database()
+    db.connect(str(path))
+    return db
+
+
+def _close(db: Database):
+    db.worker.stop()
+    db.conn.close()
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = _open(tmp_path / "search.db")
+    if not db.search_index.available:
+        _close(db)
+        pytest.skip("SQLite ohne FTS5/trigram")
+    with db.conn:
+        db.conn.executemany(
+            "INSERT INTO inventory (ID, product_type, producer, product_name, location) VALUES (?, ?, ?, ?, ?)",
+            [(f"{i:04X}", "Seil", "Edelrid", f"Modell {i}", "Depot") for i in range(2000)]
+            + [("SEIL", "Gurt", "Petzl", "Corax", "Depot")],
+        )
+    yield db
+    _close(db)
+
+
+def test_ranks_all_matches_before_limiting(db):
+    # der Schlüsseltreffer ist die zuletzt eingefügte Zeile; ohne Ranking vor dem LIMIT fiele er heraus
+    hits = db.search("seil", limit=5)
+    assert hits[0]["ref"] == "SEIL"
+    assert len(hits) == 5
+
+
+def test_short_words_only_filter(db):
+    assert db.search("mo") == []
+    hits = db.search("modell 12", limit=100)
+    assert hits and all("12" in hit["key"] + " " + hit["text"] for hit in hits)
+
+
+def test_connect_restores_missing_triggers(tmp_path):
+    path = str(tmp_path / "replace.db")
+    db = _open(path)
+    available = db.search_index.available
+    _close(db)
+    if not available:
+        pytest.skip("SQLite ohne FTS5/trigram")
+    # wie migrate_db.py --replace: Tabelle neu angelegt, Such-Trigger sind mit der alten weg
+    conn = sqlite3.connect(path)
+    sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'inventory'").fetchone()[0]
+    conn.execute("DROP TABLE inventory")
+    conn.execute(sql)
+    conn.execute("INSERT INTO inventory (ID, product_name) VALUES ('B01', 'Abseilachter')")
+    conn.commit()
+    conn.close()
+
+    db = _open(path)
+    try:
+        assert [hit["ref"] for hit in db.search("abseilachter")] == ["B01"]
+        db.conn.execute("UPDATE inventory SET product_name = 'Grigri' WHERE ID = 'B01'")
+        assert [hit["ref"] for hit in db.search("grigri")] == ["B01"]
+    finally:
+        _close(db)
+
+
+def test_kleidung_refs_survive_vacuum(db):
+    for size in ("48", "50", "52"):
+        db.insert_kleidung({"type": "Jacke", "gender": "m", "size": size, "location": "Spind"})
+    db.conn.commit()
+    first = db.fetch_all_kleidung()[0]
+    db.delete_kleidung(first["rowid"])
+    db.conn.execute("VACUUM")
+    for hit in db.search("jacke"):
+        assert hit["kind"] == "kleidung"
+        assert db.fetch_kleidung_by_rowid(int(hit["ref"]))["size"] in hit["text"]
+
+
+def test_legacy_kleidung_keeps_rowids_as_id(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE kleidung (type TEXT, gender TEXT, size TEXT, location TEXT)")
+    conn.executemany(
+        "INSERT INTO kleidung (rowid, type, gender, size, location) VALUES (?, ?, ?, ?, ?)",
+        [(3, "Jacke", "m", "50", "Spind"), (7, "Hose", "w", "38", "Depot")],
+    )
+    conn.commit()
+    conn.close()
+
+    db = _open(path)
+    try:
+        assert [(row["rowid"], row["type"]) for row in db.fetch_all_kleidung()] == [(7, "Hose"), (3, "Jacke")]
+        if db.search_index.available:
+            assert [hit["ref"] for hit in db.search("hose")] == ["7"]
+    finally:
+        _close(db)
+
+
+def test_broad_search_ranks_only_first_hits(db, monkeypatch):
+    monkeypatch.setattr(search, "SEARCH_RANK_LIMIT", 100)
+    hits = db.search("seil", limit=5)
+    assert db.search_index.last_broad
+    assert len(hits) == 5
+    assert [hit["ref"] for hit in db.search("corax")] == ["SEIL"]
+    assert not db.search_index.last_broad
@@ -0,0 +1,84 @@
+import sqlite3
+from collections import Counter
+
+from app.core.vehicle_soll_ist import compute_vehicle_soll_ist
+from app.db.database import Database
+
+
+def _open(path) -> Database:
+    db = Database()
+    db.connect(str(path))
+    return db
+
+
+def _close(db: Database):
+    db.worker.stop()
+    db.conn.close()
+
+
+def _lines(rows) -> list[tuple]:
+    return [
+        (r["inventory_location"], r["product_type"], r["property_1"], r["property_2"], r["soll"], r["ist"])
+        for r in rows
+    ]
+
+
+def test_soll_ist_lists_missing_and_surplus(tmp_path):
+    db = _open(tmp_path / "soll_ist.db")
+    try:
+        db.upsert_location("HLF", "G1", "set_vehicle_hlf")
+        db.upsert_location("Depot", None, None)  # ohne Soll-Liste: kein Fahrzeug
+        db.insert_vehicle_set_row("set_vehicle_hlf", "Helm", "rot", "", 2)
+        db.insert_vehicle_set_row("set_vehicle_hlf", "Gurt", None, None, 1)
+        with db.conn:
+            db.conn.executemany(
+                "INSERT INTO inventory (ID, product_type, property_1, property_2, location) VALUES (?, ?, ?, ?, ?)",
+                [
+                    ("A01", "Helm", "rot", None, "HLF/G1"),
+                    ("A02", "Seil", "", "", "HLF/G1"),
+                    ("A03", "Helm", "rot", None, "Depot"),
+                ],
+            )
+        assert _lines(db.fetch_vehicle_soll_ist_lines()) == [
+            ("HLF/G1", "Gurt", "", "", 1, 0),
+            ("HLF/G1", "Helm", "rot", "", 2, 1),
+            ("HLF/G1", "Seil", "", "", 0, 1),
+        ]
+        (vehicle,) = compute_vehicle_soll_ist(db)
+        assert (vehicle["missing_total"], vehicle["surplus_total"]) == (2, 1)
+    finally:
+        _close(db)
+
+
+def test_connect_migrates_legacy_set_tables(tmp_path):
+    path = tmp_path / "legacy.db"
+    _close(_open(path))
+    # Schema vor vehicle_set/vehicle_set_item: eine Tabelle je Set
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE set_vehicle_hlf (product_type TEXT, property_1 TEXT, property_2 TEXT, count INTEGER)")
+    conn.execute("CREATE TABLE set_vehicle_rw (product_type TEXT, property_1 TEXT, property_2 TEXT, count INTEGER)")
+    conn.executemany(
+        "INSERT INTO set_vehicle_hlf VALUES (?, ?, ?, ?)",
+        [("Helm", "rot", "", 2), ("Gurt", None, None, 1), ("Helm", "rot", "", 1)],
+    )
+    conn.execute("INSERT INTO location (location, set_name, database_soll) VALUES ('HLF', NULL, 'set_vehicle_hlf')")
+    conn.commit()
+    conn.close()
+
+    db = _open(path)
+    try:
+        assert db.list_tables_with_prefix("set_vehicle_") == []
+        assert db.list_location_set_tables() == ["set_vehicle_hlf", "set_vehicle_rw"]
+        rows = db.fetch_vehicle_set_rows("set_vehicle_hlf")
+        assert Counter((r["product_type"], r["property_1"], r["property_2"], r["count"]) for r in rows) == Counter([
+            ("Gurt", None, None, 1),
+            ("Helm", "rot", "", 2),
+            ("Helm", "rot", "", 1),
+        ])
+        assert db.fetch_vehicle_set_rows("set_vehicle_rw") == []
+        assert _lines(db.fetch_vehicle_soll_ist_lines()) == [
+            ("HLF", "Gurt", "", "", 1, 0),
+            ("HLF", "Helm", "rot", "", 3, 0),
+        ]
+    finally:
+        _close(db)
@@ -0,0 +1,62 @@
+import time
+
+from app.db.database import Database, DbReader
+
+
+class _Loop:
+    """Ersatz für das Tk-Widget: `after()` sammelt Callbacks, `run()` führt sie aus."""
+
+    def __init__(self):
+        self.calls = []
+
+    def after(self, _ms, fn):
+        self.calls.append(fn)
+
+    def report_callback_exception(self, exc_type, exc, tb):
+        raise exc
+
+    def run(self, until, timeout: float = 5.0):
+        end = time.perf_counter() + timeout
+        while not until() and time.perf_counter() < end:
+            calls, self.calls = self.calls, []
+            for fn in calls:
+                fn()
+            time.sleep(0.005)
+
+
+def test_jobs_run_on_query_only_reader_with_version_snapshot(tmp_path):
+    loop = _Loop()
+    db = Database()
+    db.worker.attach(loop)
+    db.connect(str(tmp_path / "worker.db"))
+    db.insert_inventory_many([{"ID": "A01", "location": "Depot"}])
+    db.conn.commit()
+    results = []
+    db.worker.submit(
+        lambda reader: (type(reader), reader.table_version("inventory"), reader.fetch_inventory_for_psa_check("Depot")),
+        on_done=results.append,
+    )
+    loop.run(lambda: results)
+    db.worker.stop()
+    db.conn.close()
+    reader_type, version, rows = results[0]
+    assert reader_type is DbReader
+    assert not any(hasattr(DbReader, name) for name in ("insert_inventory", "delete_inventory", "search"))
+    assert version == db.table_version("inventory") > 0
+    assert [r["ID"] for r in rows] == ["A01"]
+
+
+def test_connection_failure_answers_every_job(tmp_path):
+    loop = _Loop()
+    db = Database()
+    db.worker.attach(loop)
+    db.connect(str(tmp_path / "worker.db"))
+    db.worker.start(str(tmp_path / "fehlt" / "worker.db"))
+    errors = []
+    for _ in range(3):
+        db.worker.submit(lambda reader: reader.conn, on_done=errors.append, on_error=errors.append)
+    loop.run(lambda: len(errors) == 3)
+    assert db.worker.available
+    db.worker.stop()
+    db.conn.close()
+    assert len(errors) == 3 and all(isinstance(e, Exception) for e in errors)
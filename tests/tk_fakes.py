@@ -0,0 +1,53 @@
+"""Ersatz für die Tk-Teile von FilterTable, damit die Zeilenlogik ohne Display testbar ist."""
+from app.ui.components.filter_table import FilterTable
+
+
+class FakeVar:
+    def __init__(self, value: str = ""):
+        self.value = value
+
+    def get(self) -> str:
+        return self.value
+
+    def set(self, value: str):
+        self.value = value
+
+
+class FakeTree:
+    """Die Treeview-Aufrufe, die FilterTable im nicht-virtuellen Modus nutzt."""
+
+    def __init__(self):
+        self.items: dict[str, tuple[list, tuple]] = {}
+
+    def exists(self, iid) -> bool:
+        return iid in self.items
+
+    def get_children(self, *_args) -> tuple:
+        return tuple(self.items)
+
+    def insert(self, _parent, _index, iid=None, values=(), tags=()):
+        self.items[iid] = (list(values), tuple(tags))
+        return iid
+
+    def item(self, iid, values=None, tags=None):
+        old_values, old_tags = self.items[iid]
+        self.items[iid] = (list(values) if values is not None else old_values, tuple(tags) if tags is not None else old_tags)
+
+    def delete(self, *iids):
+        for iid in iids:
+            del self.items[iid]
+
+
+def filter_table(columns: list[str]) -> FilterTable:
+    """FilterTable ohne Widgets (nicht virtuell); Filter über `table.filter_vars[col].set(...)`."""
+    table = FilterTable.__new__(FilterTable)
+    table.columns = columns
+    table.virtual = False
+    table._rows = []
+    table._row_index = {}
+    table._selection = set()
+    table._focus_iid = ""
+    table._applied_filters = None
+    table.filter_vars = {col: FakeVar() for col in columns}
+    table.tree = FakeTree()
+    return table